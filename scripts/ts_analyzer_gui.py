@@ -12,31 +12,65 @@ import os
 import sys
 import time
 import importlib.util
-import tkinter as tk
-from tkinter import filedialog
 
 # Core 및 Scanner 모듈 import
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 from ts_parser_core import TSParser
-from ts_scanner import TSScanner
+from ts_scan_process import create_scanner
+from ts_packet_index import TSPacketIndex
+from ts_pes_progress import PESProgressCache
+from ts_search import FilterSearch, build_filter_spec
+from ts_prefetch import PacketPrefetcher
+from ts_filter_expr import compile_filter, filters_to_expr, FilterSyntaxError
 from ts_ui_manager import UIManager
+from ts_text_cache import text_size, get_atlas, HEX_CELLS
+from ts_profiler import RenderProfiler
+from ts_frame_scheduler import FrameScheduler, next_speed
+from ts_timeline import TSTimeline
+from ts_jitter_view import JitterView
+from ts_goto import parse_goto, resolve_goto, GotoSyntaxError
 
 # --- GUI 설정 ---
 FONT_BTN = 0.6
 FONT_HEX = 0.45 # 0.40 -> 0.45 (폰트 더 확대)
+HEX_CHAR_W = 9      # Hex View 고정폭 문자 칸 (FONT_HEX 기준, 0~F 최대 폭 9px)
+ASCII_CHAR_W = 12   # ASCII 열 문자 칸 (W, M, @ 최대 폭 11px)
+HEX_OFFSETS = [f"{i:02X}:" for i in range(0, 188, 16)]
+HEX_ASCII_LUT = np.array([c if 32 <= c < 127 else ord('.') for c in range(256)], dtype=np.uint16)
 FONT_TREE = 0.4
 COLOR_BG = (30, 30, 30)
+TOOLBAR_H = 60
+TIMELINE_H = 40     # 툴바 아래 타임라인 스트립 높이 (패널은 기존 좌표계로 그리고 이 높이만큼 아래에 합성)
+WINDOW_W, WINDOW_H = 1400, 900 + TIMELINE_H
+USE_SCAN_PROCESS = True # BScan을 별도 프로세스에서 실행 (False: 기존 스레드 방식)
+# BScan 진행 패널의 단계별 계측 막대 색상 (ts_scan_profile.STAGES 순서, BGR)
+SCAN_STAGE_COLORS = [(200, 160, 60), (220, 200, 90), (80, 200, 220), (90, 140, 240), (120, 220, 120),
+                     (60, 80, 230), (200, 120, 200), (40, 160, 255), (170, 170, 170), (140, 100, 80)]
 
 class AnalyzerGUI:
     def __init__(self, file_path):
         self.parser = TSParser(file_path)
-        self.scanner = TSScanner(self.parser)
+        self.scanner = create_scanner(self.parser, USE_SCAN_PROCESS)
+        self.snap = self.scanner.get_snapshot()    # 스캐너가 게시한 읽기 전용 통계 스냅샷 (매 프레임 갱신)
+        self._layers = {}                           # { 패널 이름: (입력 상태 key, 이미지, ui_regions) } - 패널 렌더 결과 재사용
+        self._frame = None                          # 프레임 버퍼 (매 프레임 할당하지 않고 레이어를 합성)
+        self._shown_overlay = None                  # 마지막으로 화면에 표시한 오버레이 상태 (변경 시 다시 표시)
+        self._layer_hits = 0                        # 레이어 재사용 / 다시 그린 횟수 (프로파일러 적중률)
+        self._layer_misses = 0
+        self.profiler = RenderProfiler()            # 패널별 Draw 시간 / FPS 오버레이('i' 키), 프레임별 CSV 기록('r' 키)
+        self.pkt_index = None                       # PID별 PUSI 위치 인덱스 (PES Start 탐색용, 백그라운드 구축)
+        self.pes_progress = None                    # (PID, 패킷 인덱스)별 PES 진행 정보 캐시 (렌더 루프 파일 I/O 제거)
+        self.searcher = None                        # Smart Search 검색기 (벡터화, 워커 스레드)
+        self.filter_search_mode = False             # Smart Search 진행 중 여부
+        self.prefetch = None                        # 재생 커서 주변 패킷 선읽기 버퍼 (재생 중 파일 I/O 제거)
+        self.timeline = None                        # 파일 전체 PID 밀도 / 에러 / Keyframe 타임라인 (툴바 아래 스트립)
         self.window_name = "MPEG2-TS Advanced Analyzer"
         
         # Playback State
         self.current_pkt_idx = 0
         self.playing = False
-        self.speed = 1.0
+        self.speed = 1.0            # 재생 배속 (x1 = FrameScheduler.base_pps 패킷/초, 음수: 역방향)
+        self.scheduler = FrameScheduler()   # 재생 커서(벽시계 기준)와 화면 갱신(목표 FPS) 분리
         
         self.selected_program = None
         self.selected_pid = None
@@ -49,6 +83,7 @@ class AnalyzerGUI:
         
         # Jitter Analysis State
         self.show_jitter = False
+        self.jitter_view = None     # PCR Jitter 창 (ts_jitter_view.JitterView, 분석은 워커 스레드)
         
         # Interactive Highlight State
         self.ui_regions = []        # 매 프레임 UI 영역 정보 저장 [{'rect':(x1,y1,x2,y2), 'range':(start, end), 'color':(b,g,r), 'name':str}]
@@ -65,6 +100,9 @@ class AnalyzerGUI:
             'PTS': False,
             'DTS': False
         }
+        self._timeline_hover = False    # 마우스가 타임라인 스트립 위에 있는지
+        self.filter_expr = None     # 필터 표현식 (ts_filter_expr.FilterExpr, 'f' 키로 입력) - 설정 시 토글 필터 대신 사용
+        self._goto_text = ""        # 마지막 Go To 입력 ('g' 키 대화상자 초기값)
         
         # UI Manager 초기화
         self.ui = UIManager(self)
@@ -76,7 +114,7 @@ class AnalyzerGUI:
         cv2.setMouseCallback(self.window_name, self._mouse_cb)
         
         # Initializing Screen
-        img = np.zeros((900, 1400, 3), dtype=np.uint8)
+        img = np.zeros((WINDOW_H, WINDOW_W, 3), dtype=np.uint8)
         img[:] = COLOR_BG
         
         # [수정] 파일 로드 여부에 따른 메시지 표시
@@ -112,12 +150,16 @@ class AnalyzerGUI:
             
             self.current_pkt_idx = 0
             self.playing = False
+            self.snap = self.scanner.get_snapshot()
+            self._start_packet_index()
             self.update_packet_view()
         else:
             print("[UI] Started without file.")
 
+        prof = self.profiler
         while True:
             # print(f"[Loop] Idx: {self.current_pkt_idx}, Playing: {self.playing}") # 디버그용
+            prof.begin_frame()
             
             # OpenCV Window X 버튼(닫기) 감지
             try:
@@ -125,13 +167,19 @@ class AnalyzerGUI:
                     break
             except: pass
 
-            img = np.zeros((900, 1400, 3), dtype=np.uint8)
-            img[:] = COLOR_BG
+            # 프레임 버퍼 재사용: 모든 영역을 패널 레이어가 덮어쓰므로 매 프레임 초기화 불필요
+            if self._frame is None:
+                self._frame = np.zeros((WINDOW_H, WINDOW_W, 3), dtype=np.uint8)
+                self._frame[:] = COLOR_BG
+            img = self._frame
             
             # UI 영역 초기화
             self.ui_regions = []
             
-            self.draw_layout(img)
+            # 최신 통계 스냅샷 (스캐너가 최대 10Hz로 게시, 프레임 내에서는 변하지 않음)
+            self.snap = self.scanner.get_snapshot()
+            
+            dirty = self.draw_layout(img)
             
             # BScan 상태 관리
             if self.scanner.running:
@@ -144,48 +192,278 @@ class AnalyzerGUI:
                 self.parser.last_log = "Report Generated."
 
             if self.show_report:
-                self._draw_report_overlay(img)
+                with prof.timed('report'):
+                    self._draw_report_overlay(img)
+
+            # 프로파일러 오버레이 (매 프레임 값이 바뀌므로 항상 갱신)
+            if prof.enabled:
+                with prof.timed('overlay'):
+                    prof.draw(img, 1040, TOOLBAR_H + TIMELINE_H + 6)
+                dirty = True
             
+            # 바뀐 레이어가 없고 오버레이 상태도 같으면 화면 갱신 생략 (유휴 시 CPU 절약)
+            overlay = (self.show_report, self.ui.menu_open, prof.enabled)
             self.canvas = img
-            cv2.imshow(self.window_name, img)
+            if dirty or overlay != self._shown_overlay or self.show_report:
+                with prof.timed('imshow'):
+                    cv2.imshow(self.window_name, img)
+                self._shown_overlay = overlay
             
-            key = self._handle_playback()
+            with prof.timed('wait'):
+                key = self._handle_playback()
+            if prof.active:
+                prof.end_frame(self._profile_counters(dirty))
+
             if key == ord('q'): break
             elif key == 32: self._toggle_play()
             elif key == ord('p'): self._launch_player()
             elif key == ord(','): self._handle_btn('prev')
             elif key == ord('.'): self._handle_btn('next')
+            elif key == ord('f'): self._edit_filter_expr()
+            elif key == ord('g'): self._goto_dialog()
+            elif key == ord('i'): prof.enabled = not prof.enabled
+            elif key == ord('r'): self._toggle_profile_csv()
             
             if self.show_report and key != 255:
                 self.show_report = False
 
-        self.scanner.stop()
+            self._update_jitter_view()
+
+        self._close_scanner()
+        if self.jitter_view: self.jitter_view.close()
+        prof.stop_csv()
         cv2.destroyAllWindows()
 
-    def draw_layout(self, img):
+    def _toggle_profile_csv(self):
+        """프레임별 타이밍 CSV 기록 시작/중지 (output/Profile_*.csv)"""
+        if self.profiler.csv_path:
+            path = self.profiler.stop_csv()
+            self.parser.last_log = f"Profile saved: {os.path.basename(path)}"
+        else:
+            path = self.profiler.start_csv()
+            self.parser.last_log = f"Profiling to {os.path.basename(path)}"
+        print(f"[Profile] {self.parser.last_log}")
+
+    def _profile_counters(self, dirty):
+        """프로파일러 프레임 카운터 (스캐너 진행 / 캐시 누적 적중 수)"""
+        counters = {'dirty': dirty, 'cursor': self.current_pkt_idx, 'scan_packets': self.snap.packet_count,
+                    'parser_cache': (self.parser.cache_hits, self.parser.cache_misses),
+                    'layers': (self._layer_hits, self._layer_misses)}
+        if self.prefetch:
+            counters['prefetch'] = (self.prefetch.hits, self.prefetch.misses)
+        info = text_size.cache_info()
+        counters['text'] = (info.hits, info.misses)
+        return counters
+
+    def _close_scanner(self):
+        """스캐너 / 패킷 인덱스 중단 및 자원 정리 (프로세스 스캐너는 공유 메모리 해제)"""
+        if hasattr(self.scanner, 'close'): self.scanner.close()
+        else: self.scanner.stop()
+        if self.pkt_index:
+            self.pkt_index.stop()
+            self.pkt_index = None
+        if self.pes_progress:
+            self.pes_progress.close()
+            self.pes_progress = None
+        self._cancel_search()
+        if self.prefetch:
+            self.prefetch.close()
+            self.prefetch = None
+        if self.timeline:
+            self.timeline.stop()
+            self.timeline = None
+
+    def _update_jitter_view(self):
+        """Jitter 창 갱신: 창이 닫혔으면 토글 해제, 분석 대상(PCR PID)이 바뀌면 백그라운드 재분석"""
+        view = self.jitter_view
+        if view is None: return
+        if not view.visible:
+            view.close()
+            self.jitter_view = None
+            self.show_jitter = False
+            return
+        view.set_source(self.parser.file_path, self._selected_pcr_pid())
+        view.update()
+
+    def _selected_pcr_pid(self):
+        """
+        선택 기준 PCR PID (PSI 트리 선택 기준, Jitter 분석 / Go To 시각 기본값)
+        1. 선택 PID가 어떤 프로그램의 PCR PID이면 그 PID
+        2. 선택 프로그램의 PCR PID
+        3. 첫 프로그램의 PCR PID
+        """
+        progs = {num: p for num, p in self.snap.programs.items() if num != 0}
+        pcr_pids = [p.get('pcr_pid_val', 0x1FFF) for p in progs.values()]
+        if self.selected_pid in pcr_pids and self.selected_pid != 0x1FFF:
+            return self.selected_pid
+        if self.selected_program in progs:
+            pid = progs[self.selected_program].get('pcr_pid_val', 0x1FFF)
+            if pid != 0x1FFF: return pid
+        for pid in pcr_pids:
+            if pid != 0x1FFF: return pid
+        return None
+
+    def _start_packet_index(self):
+        """현재 파일의 PUSI 인덱스 백그라운드 구축 시작 (PES 진행 정보 캐시 / Smart Search 검색기 / 선읽기 버퍼도 새 파일 기준으로 생성)"""
+        self.pkt_index = TSPacketIndex(self.parser.file_path)
+        self.pkt_index.start()
+        if self.pes_progress: self.pes_progress.close()
+        self.pes_progress = PESProgressCache(self.parser, self.pkt_index)
+        self._cancel_search()
+        self.searcher = FilterSearch(self.parser.file_path)
+        if self.prefetch: self.prefetch.close()
+        self.prefetch = PacketPrefetcher(self.parser.file_path)
+        if self.timeline: self.timeline.stop()
+        self.timeline = TSTimeline(self.parser.file_path)
+        self.timeline.start()
+
+    def _cancel_search(self):
+        """진행 중인 Smart Search 취소"""
+        if self.searcher: self.searcher.cancel()
+        self.filter_search_mode = False
+
+    def _draw_layer(self, img, name, rect, key, draw_fn):
+        """
+        패널 레이어 캐시: 입력 상태(key)가 이전 렌더와 같으면 저장된 이미지와 ui_regions(Hover 영역)를 재사용
+        :param rect: 패널이 그리는 영역 (x1, y1, x2, y2)
+        :return: 새로 그렸으면 True
+        """
+        x1, y1, x2, y2 = rect
+        with self.profiler.timed(name):
+            cached = self._layers.get(name)
+            if cached is not None and cached[0] == key:
+                img[y1:y2, x1:x2] = cached[1]
+                self.ui_regions.extend(cached[2])
+                self._layer_hits += 1
+                return False
+            n = len(self.ui_regions)
+            draw_fn()
+            self._layers[name] = (key, img[y1:y2, x1:x2].copy(), self.ui_regions[n:])
+            self._layer_misses += 1
+            return True
+
+    def _layer_keys(self):
+        """패널별 입력 상태 key (값이 같으면 같은 이미지가 그려짐)"""
+        region = lambda r: (r['name'], r['range']) if r else None
+        regions = (region(self.selected_region), region(self.hover_region))
+        mouse_in = lambda x1, y1, x2, y2: (self.mouse_x, self.mouse_y) if x1 <= self.mouse_x <= x2 and y1 <= self.mouse_y <= y2 else None
+        packet = (self.current_pkt_idx, self.current_hex_data)
+
+        ui = self.ui
+        flash = bool(ui.clicked_btn_info and time.time() - ui.clicked_btn_info['time'] < 0.15)
+        toolbar = (ui.hover_btn['name'] if ui.hover_btn else None, flash, self.playing, self.speed,
+                   self.scanner.running, self.scanner.completed, self.show_jitter, tuple(self.active_filters.values()),
+                   self.filter_expr.text if self.filter_expr else None, self.filter_search_mode, self.current_pkt_idx > 0)
+
+        # PES 진행 정보는 백그라운드에서 도착하므로 준비 여부도 key에 포함
+        pes_ready = None
+        if self.pes_progress and self.selected_pid is not None:
+            pes_ready = self.pes_progress.peek(self.selected_pid, self.current_pkt_idx) is not None
+        click = bool(hasattr(self, 'last_click_time') and time.time() - self.last_click_time < 0.2)
+
+        timeline = None
+        if self.timeline:
+            tl = self.timeline
+            hover_x = self.mouse_x if self._timeline_hover else None
+            timeline = (tl.version, self.selected_pid, self.snap.version, tl.x_of(self.current_pkt_idx, WINDOW_W), hover_x)
+
+        return {
+            'toolbar': toolbar,
+            'timeline': timeline,
+            'tree': (self.snap.version, self.selected_pid, self.selected_program, mouse_in(0, 60, 400, 900)),
+            'detail': (packet, regions, self.selected_pid, self.selected_program, self.snap.version),
+            'pes': (packet, regions, self.selected_pid, self.snap.version, mouse_in(400, 340, 1400, 560), pes_ready,
+                    click, getattr(self, 'last_click_target', None)),
+            'hex': (packet, self.playing, region(self.selected_region or self.hover_region)),
+        }
+
+    def draw_layout(self, frame):
+        """
+        패널 레이어 합성 (입력 상태가 바뀐 패널만 다시 그림)
+        - Toolbar / 메뉴: 화면 좌표 그대로
+        - 타임라인 스트립: 툴바 바로 아래 (TIMELINE_H)
+        - 나머지 패널: 기존 좌표계(y 60~900)로 그리고 TIMELINE_H만큼 내린 View(img)에 합성
+        :return: 이번 프레임에 바뀐 영역이 있으면 True
+        """
+        keys = self._layer_keys()
+        dirty = False
+        img = frame[TIMELINE_H:]
+
         # Toolbar
-        cv2.rectangle(img, (0, 0), (1400, 60), (50, 50, 50), -1)
-        self.ui.draw_toolbar(img)
+        def draw_toolbar():
+            cv2.rectangle(frame, (0, 0), (1400, 60), (50, 50, 50), -1)
+            self.ui.draw_toolbar(frame)
+        dirty |= self._draw_layer(frame, 'toolbar', (0, 0, 1400, 60), keys['toolbar'], draw_toolbar)
+
+        # Timeline Strip
+        if keys['timeline'] is not None:
+            dirty |= self._draw_layer(frame, 'timeline', (0, TOOLBAR_H, WINDOW_W, TOOLBAR_H + TIMELINE_H), keys['timeline'],
+                                      lambda: self._draw_timeline(frame, 0, TOOLBAR_H, WINDOW_W, TIMELINE_H))
+        else:
+            frame[TOOLBAR_H:TOOLBAR_H + TIMELINE_H] = COLOR_BG
         
         # Left: PSI (PAT/CAT/NIT...) / PMT (2분할, 높이 420씩)
-        self._draw_psi_view(img, 0, 60, 400, 420)
-        self._draw_pmt_view(img, 0, 480, 400, 420)
+        def draw_tree():
+            self._draw_psi_view(img, 0, 60, 400, 420)
+            self._draw_pmt_view(img, 0, 480, 400, 420)
+        dirty |= self._draw_layer(img, 'tree', (0, 60, 401, 900), keys['tree'], draw_tree)
         
         # Right: Detail / PES / Hex (3분할, 높이 조정)
         # Detail: 60 ~ 340 (280)
         # PES: 340 ~ 560 (220) - 30px 추가 축소
         # Hex: 560 ~ 900 (340) - 30px 추가 확대 및 위로 이동
-        self._draw_detail(img, 400, 60, 1000, 280)
-        self._draw_pes_view(img, 400, 340, 1000, 220)
+        # (그리는 순서대로 합성해야 경계선이 겹치는 부분이 동일하게 나옴)
+        dirty |= self._draw_layer(img, 'detail', (400, 60, 1400, 341), keys['detail'],
+                                  lambda: self._draw_detail(img, 400, 60, 1000, 280))
+        dirty |= self._draw_layer(img, 'pes', (400, 340, 1400, 561), keys['pes'],
+                                  lambda: self._draw_pes_view(img, 400, 340, 1000, 220))
         
         if self.scanner.running:
-            self._draw_scan_status(img, 400, 560, 1000, 340)
+            # 진행률이 계속 바뀌므로 캐시하지 않음
+            with self.profiler.timed('scan'):
+                self._draw_scan_status(img, 400, 560, 1000, 340)
+            self._layers.pop('hex', None)
+            dirty = True
         else:
-            self._draw_hex(img, 400, 560, 1000, 340)
+            dirty |= self._draw_layer(img, 'hex', (400, 560, 1400, 900), keys['hex'],
+                                      lambda: self._draw_hex(img, 400, 560, 1000, 340))
 
         # Draw Menu Overlay (Always on top)
         if self.ui.menu_open:
-            self.ui.draw_menu(img)
+            with self.profiler.timed('menu'):
+                self.ui.draw_menu(frame)
+            dirty = True
+        return dirty
+
+    def _draw_timeline(self, img, x, y, w, h):
+        """타임라인 스트립: 캐시된 밀도/이벤트 이미지 + 현재 위치 커서 + Hover 위치 정보"""
+        tl = self.timeline
+        img[y:y+h, x:x+w] = tl.render(w, h, self.snap.pid_map, self.snap.programs, self.selected_pid, self.snap.version)
+        cx = x + tl.x_of(self.current_pkt_idx, w)
+        cv2.rectangle(img, (cx-1, y), (cx, y+h-1), (255, 255, 255), -1)    # 2px 커서 (스트립 밖으로 번지지 않게)
+        if self._timeline_hover:
+            hx = min(max(self.mouse_x, x), x+w-1)
+            cv2.line(img, (hx, y), (hx, y+h-1), (0, 255, 255), 1)
+            idx = tl.packet_at(hx - x, w)
+            label = f"#{idx:,} ({idx / max(1, tl.total_pkts) * 100:.1f}%)"
+            (tw, th), _ = text_size(label, cv2.FONT_HERSHEY_SIMPLEX, 0.45, 1)
+            lx = hx + 6 if hx + 6 + tw < x + w else hx - 6 - tw
+            cv2.rectangle(img, (lx - 2, y + 2), (lx + tw + 2, y + th + 8), (0, 0, 0), -1)
+            cv2.putText(img, label, (lx, y + th + 5), cv2.FONT_HERSHEY_SIMPLEX, 0.45, (0, 255, 255), 1)
+
+    def _seek_timeline(self, x):
+        """타임라인 클릭 위치로 이동 (선택 PID가 있으면 해당 구간 이후 첫 PES/Section Start로 - 패킷 인덱스 사용)"""
+        tl = self.timeline
+        if not tl or not tl.total_pkts: return
+        idx = tl.packet_at(x, WINDOW_W)
+        if self.selected_pid is not None and self.pkt_index:
+            nxt = self.pkt_index.find_next(self.selected_pid, idx - 1)
+            if 0 <= nxt < idx + tl.bin_size: idx = nxt
+        self.playing = False
+        self._cancel_search()
+        self.current_pkt_idx = idx
+        self.update_packet_view()
+        self.parser.last_log = f"Timeline: jumped to packet {idx:,}"
 
     def _draw_psi_view(self, img, x, y, w, h):
         cv2.rectangle(img, (x, y), (x+w, y+h), (40, 40, 40), -1)
@@ -199,7 +477,7 @@ class AnalyzerGUI:
         
         # Helper to check PID existence
         def check_pid(pid):
-            return pid in self.parser.pid_counts or pid in self.parser.pid_map
+            return pid in self.snap.pid_counts or pid in self.snap.pid_map
             
         # PSI Table List
         psi_tables = [
@@ -220,7 +498,7 @@ class AnalyzerGUI:
             pid = tbl['pid']
             
             # Draw Item
-            (tw, th), _ = cv2.getTextSize(text, cv2.FONT_HERSHEY_SIMPLEX, 0.5, 1)
+            (tw, th), _ = text_size(text, cv2.FONT_HERSHEY_SIMPLEX, 0.5, 1)
             rect_x1, rect_y1 = x + indent, cur_y - th - 5
             rect_x2, rect_y2 = x + indent + tw, cur_y + 5
             
@@ -241,9 +519,9 @@ class AnalyzerGUI:
             # Special Handling for PAT: Draw Programs
             if pid == 0x0000:
                 prog_indent = indent + 20
-                for prog_num, prog in self.parser.programs.items():
+                for prog_num, prog in self.snap.programs.items():
                     p_text = f"- Program {prog_num} (PMT: 0x{prog['pmt_pid']:X})"
-                    (ptw, pth), _ = cv2.getTextSize(p_text, cv2.FONT_HERSHEY_SIMPLEX, 0.45, 1)
+                    (ptw, pth), _ = text_size(p_text, cv2.FONT_HERSHEY_SIMPLEX, 0.45, 1)
                     
                     pr_x1, pr_y1 = x + prog_indent, cur_y - pth - 5
                     pr_x2, pr_y2 = x + prog_indent + ptw, cur_y + 5
@@ -271,8 +549,8 @@ class AnalyzerGUI:
         cv2.putText(img, title, (x+10, y+25), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 0), 1)
         
         cur_y = y + 50
-        if self.selected_program and self.selected_program in self.parser.programs:
-            prog = self.parser.programs[self.selected_program]
+        if self.selected_program and self.selected_program in self.snap.programs:
+            prog = self.snap.programs[self.selected_program]
             
             # PMT PID & PCR PID Display
             pcr_pid = prog.get('pcr_pid_val', 0x1FFF)
@@ -286,10 +564,10 @@ class AnalyzerGUI:
                 
                 text = f"PID 0x{pid:X} : {info['desc']}"
                 if pid == pcr_pid: text += " (PCR)"
-                cnt = self.parser.pid_counts.get(pid, 0)
+                cnt = self.snap.pid_counts.get(pid, 0)
                 text += f" ({cnt})"
                 
-                (tw, th), _ = cv2.getTextSize(text, cv2.FONT_HERSHEY_SIMPLEX, 0.45, 1)
+                (tw, th), _ = text_size(text, cv2.FONT_HERSHEY_SIMPLEX, 0.45, 1)
                 rect_x1, rect_y1 = x + 20, cur_y - th - 5
                 rect_x2, rect_y2 = x + 20 + tw, cur_y + 5
                 
@@ -319,7 +597,7 @@ class AnalyzerGUI:
             return
 
         # PID 및 기본 정보 표시
-        info = self.parser.pid_map.get(self.selected_pid, {})
+        info = self.snap.pid_map.get(self.selected_pid, {})
         pid_text = f"Selected PID: 0x{self.selected_pid:X} ({info.get('desc', 'Unknown')})"
         cv2.putText(img, pid_text, (x+20, cur_y), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (200, 200, 200), 2)
         
@@ -342,7 +620,7 @@ class AnalyzerGUI:
             })
 
         # PES Navigation Buttons (Selected PID 옆으로 이동)
-        (text_w, text_h), _ = cv2.getTextSize(pid_text, cv2.FONT_HERSHEY_SIMPLEX, 0.6, 2)
+        (text_w, text_h), _ = text_size(pid_text, cv2.FONT_HERSHEY_SIMPLEX, 0.6, 2)
         btn_start_x = x + 20 + text_w + 30 
         
         gap = 10
@@ -424,7 +702,7 @@ class AnalyzerGUI:
             is_psi_pid = True
         else:
             # [수정] selected_program과 무관하게, 알려진 모든 PMT PID를 확인
-            for prog in self.parser.programs.values():
+            for prog in self.snap.programs.values():
                 if pid == prog['pmt_pid']:
                     is_psi_pid = True
                     break
@@ -433,7 +711,7 @@ class AnalyzerGUI:
         if pusi and not is_psi_pid:
             # === Case 1: PES Packet Start ===
             pes_title = ">> PES Packet Start <<"
-            (tw, th), _ = cv2.getTextSize(pes_title, cv2.FONT_HERSHEY_SIMPLEX, 0.6, 2)
+            (tw, th), _ = text_size(pes_title, cv2.FONT_HERSHEY_SIMPLEX, 0.6, 2)
             
             # Interactive Region: PES Header (General)
             # PES Header Range: off ~ off + (header length)
@@ -458,7 +736,7 @@ class AnalyzerGUI:
                 elif 0xE0 <= sid <= 0xEF: sid_str += " (Video)"
                 elif sid == 0xBD: sid_str += " (Private)"
                 
-                (tw, th), _ = cv2.getTextSize(sid_str, cv2.FONT_HERSHEY_SIMPLEX, 0.5, 1)
+                (tw, th), _ = text_size(sid_str, cv2.FONT_HERSHEY_SIMPLEX, 0.5, 1)
                 add_region(f"Stream ID (0x{sid:02X})", off+3, 1, (x+20, cur_y-th-5, x+20+tw, cur_y+5))
                 cv2.putText(img, sid_str, (x+20, cur_y), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
                 
@@ -467,7 +745,7 @@ class AnalyzerGUI:
                 len_str = f"Length: {p_len} bytes"
                 if p_len == 0: len_str += " (Unbounded/Video)"
                 
-                (tw, th), _ = cv2.getTextSize(len_str, cv2.FONT_HERSHEY_SIMPLEX, 0.5, 1)
+                (tw, th), _ = text_size(len_str, cv2.FONT_HERSHEY_SIMPLEX, 0.5, 1)
                 add_region(f"PES Length ({p_len})", off+4, 2, (x+250, cur_y-th-5, x+250+tw, cur_y+5))
                 cv2.putText(img, len_str, (x+250, cur_y), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
                 cur_y += 25
@@ -483,7 +761,7 @@ class AnalyzerGUI:
                     pts_sec = pts / 90000.0
                     pts_str = f"PTS: {pts} ({pts_sec:.3f}s)"
                     
-                    (tw, th), _ = cv2.getTextSize(pts_str, cv2.FONT_HERSHEY_SIMPLEX, 0.5, 1)
+                    (tw, th), _ = text_size(pts_str, cv2.FONT_HERSHEY_SIMPLEX, 0.5, 1)
                     add_region("PTS", curr_field_off, 5, (x+20, cur_y-th-5, x+20+tw, cur_y+5))
                     
                     cv2.putText(img, pts_str, (x+20, cur_y), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (100, 255, 100), 1)
@@ -495,10 +773,10 @@ class AnalyzerGUI:
                     
                     offset_x = 200
                     if pts_str:
-                        (w_txt, _), _ = cv2.getTextSize(pts_str, cv2.FONT_HERSHEY_SIMPLEX, 0.5, 1)
+                        (w_txt, _), _ = text_size(pts_str, cv2.FONT_HERSHEY_SIMPLEX, 0.5, 1)
                         offset_x = 20 + w_txt + 30
                         
-                    (tw, th), _ = cv2.getTextSize(dts_str, cv2.FONT_HERSHEY_SIMPLEX, 0.5, 1)
+                    (tw, th), _ = text_size(dts_str, cv2.FONT_HERSHEY_SIMPLEX, 0.5, 1)
                     add_region("DTS", curr_field_off, 5, (x+offset_x, cur_y-th-5, x+offset_x+tw, cur_y+5))
                     
                     cv2.putText(img, dts_str, (x+offset_x, cur_y), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (100, 255, 100), 1)
@@ -535,14 +813,14 @@ class AnalyzerGUI:
                         elif tid == 0x01: tid_desc += " (CAT)"
                         elif tid == 0x02: tid_desc += " (PMT)"
                         
-                        (tw, th), _ = cv2.getTextSize(tid_desc, cv2.FONT_HERSHEY_SIMPLEX, 0.5, 1)
+                        (tw, th), _ = text_size(tid_desc, cv2.FONT_HERSHEY_SIMPLEX, 0.5, 1)
                         add_region(f"Table ID (0x{tid:02X})", base_off, 1, (x+20, cur_y-th-5, x+20+tw, cur_y+5))
                         cv2.putText(img, tid_desc, (x+20, cur_y), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (200, 200, 200), 1)
                         cur_y += 25
                         
                         # 2. Section Length
                         sec_len_str = f"Section Length: {sec_len} bytes"
-                        (tw, th), _ = cv2.getTextSize(sec_len_str, cv2.FONT_HERSHEY_SIMPLEX, 0.5, 1)
+                        (tw, th), _ = text_size(sec_len_str, cv2.FONT_HERSHEY_SIMPLEX, 0.5, 1)
                         add_region(f"Section Length ({sec_len})", base_off+1, 2, (x+20, cur_y-th-5, x+20+tw, cur_y+5))
                         cv2.putText(img, sec_len_str, (x+20, cur_y), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (200, 200, 200), 1)
                         cur_y += 25
@@ -553,7 +831,7 @@ class AnalyzerGUI:
                                 ts_id = (data[3] << 8) | data[4]
                                 ver = (data[5] >> 1) & 0x1F
                                 txt = f"TS ID: 0x{ts_id:04X} | Ver: {ver}"
-                                (tw, th), _ = cv2.getTextSize(txt, cv2.FONT_HERSHEY_SIMPLEX, 0.5, 1)
+                                (tw, th), _ = text_size(txt, cv2.FONT_HERSHEY_SIMPLEX, 0.5, 1)
                                 add_region(f"TS ID (0x{ts_id:04X})", base_off+3, 2, (x+20, cur_y-th-5, x+20+tw, cur_y+5))
                                 cv2.putText(img, txt, (x+20, cur_y), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (150, 255, 150), 1)
                                 cur_y += 25
@@ -566,7 +844,7 @@ class AnalyzerGUI:
                                     pid_val = ((data[idx+2] & 0x1F) << 8) | data[idx+3]
                                     p_type = "NIT" if pn == 0 else "PMT"
                                     txt = f"- Prog {pn}: PID 0x{pid_val:X} ({p_type})"
-                                    (tw, th), _ = cv2.getTextSize(txt, cv2.FONT_HERSHEY_SIMPLEX, 0.5, 1)
+                                    (tw, th), _ = text_size(txt, cv2.FONT_HERSHEY_SIMPLEX, 0.5, 1)
                                     add_region(f"Prog {pn} Entry", base_off+idx, 4, (x+40, cur_y-th-5, x+40+tw, cur_y+5))
                                     cv2.putText(img, txt, (x+40, cur_y), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (200, 200, 200), 1)
                                     cur_y += 25
@@ -579,7 +857,7 @@ class AnalyzerGUI:
                                 if len(data) >= 3 + sec_len:
                                     crc_val = (data[3+sec_len-4]<<24) | (data[3+sec_len-3]<<16) | (data[3+sec_len-2]<<8) | data[3+sec_len-1]
                                     txt = f"CRC32: 0x{crc_val:08X}"
-                                    (tw, th), _ = cv2.getTextSize(txt, cv2.FONT_HERSHEY_SIMPLEX, 0.5, 1)
+                                    (tw, th), _ = text_size(txt, cv2.FONT_HERSHEY_SIMPLEX, 0.5, 1)
                                     add_region("CRC32", base_off+3+sec_len-4, 4, (x+20, cur_y-th-5, x+20+tw, cur_y+5))
                                     cv2.putText(img, txt, (x+20, cur_y), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (100, 200, 255), 1)
                                     cur_y += 25
@@ -589,14 +867,14 @@ class AnalyzerGUI:
                                 pcr_pid_val = ((data[8] & 0x1F) << 8) | data[9]
                                 p_len = ((data[10] & 0x0F) << 8) | data[11]
                                 txt = f"PCR PID: 0x{pcr_pid_val:X}"
-                                (tw, th), _ = cv2.getTextSize(txt, cv2.FONT_HERSHEY_SIMPLEX, 0.5, 1)
+                                (tw, th), _ = text_size(txt, cv2.FONT_HERSHEY_SIMPLEX, 0.5, 1)
                                 add_region(f"PCR PID (0x{pcr_pid_val:X})", base_off+8, 2, (x+20, cur_y-th-5, x+20+tw, cur_y+5))
                                 cv2.putText(img, txt, (x+20, cur_y), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 255), 1)
                                 cur_y += 25
                                 
                                 if p_len > 0:
                                     txt = f"Program Descriptors ({p_len} bytes)"
-                                    (tw, th), _ = cv2.getTextSize(txt, cv2.FONT_HERSHEY_SIMPLEX, 0.5, 1)
+                                    (tw, th), _ = text_size(txt, cv2.FONT_HERSHEY_SIMPLEX, 0.5, 1)
                                     add_region("Program Descriptors", base_off+12, p_len, (x+30, cur_y-th-5, x+30+tw, cur_y+5))
                                     cv2.putText(img, txt, (x+30, cur_y), cv2.FONT_HERSHEY_SIMPLEX, 0.45, (150, 150, 150), 1)
                                     cur_y += 25
@@ -614,7 +892,7 @@ class AnalyzerGUI:
                                     if len(st_desc) > 15: st_desc = st_desc[:15] + "..."
                                     text = f"- Type 0x{stype:02X} ({st_desc}): PID 0x{epid:X}"
                                     entry_len = 5 + es_info_len
-                                    (tw, th), _ = cv2.getTextSize(text, cv2.FONT_HERSHEY_SIMPLEX, 0.45, 1)
+                                    (tw, th), _ = text_size(text, cv2.FONT_HERSHEY_SIMPLEX, 0.45, 1)
                                     add_region(f"ES Entry (PID 0x{epid:X})", base_off+idx, entry_len, (x+40, cur_y-th-5, x+40+tw, cur_y+5))
                                     cv2.putText(img, text, (x+40, cur_y), cv2.FONT_HERSHEY_SIMPLEX, 0.45, (220, 220, 220), 1)
                                     cur_y += 25
@@ -627,7 +905,7 @@ class AnalyzerGUI:
                                 if len(data) >= 3 + sec_len:
                                     crc_val = (data[3+sec_len-4]<<24) | (data[3+sec_len-3]<<16) | (data[3+sec_len-2]<<8) | data[3+sec_len-1]
                                     txt = f"CRC32: 0x{crc_val:08X}"
-                                    (tw, th), _ = cv2.getTextSize(txt, cv2.FONT_HERSHEY_SIMPLEX, 0.5, 1)
+                                    (tw, th), _ = text_size(txt, cv2.FONT_HERSHEY_SIMPLEX, 0.5, 1)
                                     add_region("CRC32", base_off+3+sec_len-4, 4, (x+20, cur_y-th-5, x+20+tw, cur_y+5))
                                     cv2.putText(img, txt, (x+20, cur_y), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (100, 200, 255), 1)
                                     cur_y += 25
@@ -640,97 +918,44 @@ class AnalyzerGUI:
             cv2.putText(img, ">> PES Continuation <<", (x+20, cur_y), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (180, 180, 180), 2)
             cur_y += 30 # 한 줄 띄우기
             
-            # Back-tracking to find PES Start
+            # PES Start / 진행률: PESProgressCache에서 조회 (렌더 루프에서는 파일을 읽지 않음)
+            # 한 칸 이동은 이웃 패킷 결과로 증분 계산, 그 외 위치는 백그라운드 계산 후 다음 프레임부터 표시
             found_start = False
             start_idx = -1
-            acc_payload = 0 
-            
             curr_p_len = len(payload)
-            
-            # Video 스트림이면 탐색 범위를 크게 잡음 (기존 50,000 -> 10,000으로 축소)
-            # 대용량 파일(1.8GB)에서 UI 멈춤 방지를 위해 제한
-            is_video = False
-            pid_info = self.parser.pid_map.get(self.selected_pid, {})
-            if "Video" in pid_info.get('desc', ''): is_video = True
-            
-            search_limit = 10000 if is_video else 2000 
-            dist = 0
-            
-            # 최적화: 파일을 한 번에 읽어서 메모리 탐색 (Batch Read)
+
             # [수정] PSI PID인 경우 Backtracking 생략
             if is_psi_pid:
                 cv2.putText(img, "[Info] PSI/SI Table Section (No PES Header)", (x+20, cur_y), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (150, 255, 255), 1)
                 cur_y += 25
-            else:
-                try:
-                    with open(self.parser.file_path, "rb") as f:
-                        start_search_idx = max(0, self.current_pkt_idx - search_limit)
-                        read_count = self.current_pkt_idx - start_search_idx
-                        
-                        if read_count > 0:
-                            f.seek(start_search_idx * 188)
-                            chunk_data = f.read(read_count * 188)
-                        
-                            # 역방향 탐색 (메모리)
-                            # chunk_data의 끝에서부터 앞으로 이동
-                            for k in range(read_count):
-                                # k=0 -> 바로 전 패킷 (idx - 1)
-                                # offset calculation
-                                # chunk size = read_count * 188
-                                # target packet start = (read_count - 1 - k) * 188
-                                
-                                pkt_offset = (read_count - 1 - k) * 188
-                                t_data = chunk_data[pkt_offset : pkt_offset + 188]
-                                
-                                # PID/PUSI Parsing
-                                import struct
-                                h = struct.unpack('>I', t_data[:4])[0]
-                                t_pid = (h >> 8) & 0x1FFF
-                                
-                                if t_pid == self.selected_pid:
-                                    dist += 1
-                                    
-                                    t_pusi = (h >> 22) & 0x1
-                                    t_adapt = (h >> 4) & 0x3
-                                    
-                                    t_off = 4
-                                    if t_adapt & 0x2: 
-                                        t_off = 5 + t_data[4]
-                                    
-                                    if t_off < 188:
-                                        acc_payload += (188 - t_off)
-                                    
-                                    if t_pusi:
-                                        found_start = True
-                                        start_idx = self.current_pkt_idx - 1 - k
-                                        
-                                        # PES Header Parsing for Start Packet
-                                        t_payload = t_data[t_off:]
-                                        pes_info = self.parser.parse_pes_header(t_payload)
-                                        
-                                        if pes_info:
-                                            total_len = pes_info['pes_length']
-                                            current_seq = dist
-                                            processed_bytes = acc_payload + curr_p_len
-                                            
-                                            prog_info = ""
-                                            # Video (0) Handling
-                                            if total_len == 0:
-                                                seq_str = f"Seq: {current_seq} (Unbounded)"
-                                                prog_info = f" | Acc: {processed_bytes:,} bytes"
-                                            else:
-                                                pct = (processed_bytes / total_len) * 100
-                                                est_total_pkts = int((total_len + 6) / 184.0) + 1
-                                                prog_info = f" | {pct:.1f}% ({processed_bytes:,}/{total_len:,})"
-                                                seq_str = f"Seq: {current_seq} / ~{est_total_pkts}"
-                                                
-                                            # [이동 완료] PES Continuation 바로 아래에 표시
-                                            cv2.putText(img, seq_str + prog_info, (x+20, cur_y), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 200, 100), 1)
-                                            cur_y += 25 # 줄바꿈 반영
-                                        break
-                except Exception as e:
-                     print(f"[Error] Back-tracking failed: {e}")
-            
+            elif self.pes_progress and self.selected_pid is not None:
+                prog = self.pes_progress.get(self.selected_pid, self.current_pkt_idx, self.current_hex_data)
+                if prog is None:
+                    cv2.putText(img, "Locating PES start...", (x+20, cur_y), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (150, 150, 150), 1)
+                    cur_y += 25
+                elif prog['start_idx'] >= 0:
+                    found_start = True
+                    start_idx = prog['start_idx']
+                    total_len = prog['pes_length']
+                    if total_len is not None:
+                        current_seq = prog['seq']
+                        processed_bytes = prog['acc_bytes'] + curr_p_len
+
+                        prog_info = ""
+                        # Video (0) Handling
+                        if total_len == 0:
+                            seq_str = f"Seq: {current_seq} (Unbounded)"
+                            prog_info = f" | Acc: {processed_bytes:,} bytes"
+                        else:
+                            pct = (processed_bytes / total_len) * 100
+                            est_total_pkts = int((total_len + 6) / 184.0) + 1
+                            prog_info = f" | {pct:.1f}% ({processed_bytes:,}/{total_len:,})"
+                            seq_str = f"Seq: {current_seq} / ~{est_total_pkts}"
+
+                        # [이동 완료] PES Continuation 바로 아래에 표시
+                        cv2.putText(img, seq_str + prog_info, (x+20, cur_y), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 200, 100), 1)
+                        cur_y += 25
+
             # PES Navigation Target 업데이트 (좌표는 위에서 계산됨)
         # 버튼이 눌렸을 때 동작하도록 targets 딕셔너리를 갱신해야 함
         if found_start:
@@ -780,7 +1005,7 @@ class AnalyzerGUI:
         # --- Column 1: TS Header Fixed Part (4 Bytes) ---
         # Interactive Region 등록: TS Header (전체)
         header_title = f"[TS Header] Packet Index: {self.current_pkt_idx}"
-        (tw, th), _ = cv2.getTextSize(header_title, cv2.FONT_HERSHEY_SIMPLEX, 0.5, 1)
+        (tw, th), _ = text_size(header_title, cv2.FONT_HERSHEY_SIMPLEX, 0.5, 1)
         
         # Draw Background if Active
         region_key = 'TS Header'
@@ -804,7 +1029,7 @@ class AnalyzerGUI:
         # Helper for field drawing
         def draw_field(text, region_name, byte_range, color=(200, 200, 200), bg_color=(80, 80, 100)):
             nonlocal cur_y
-            (tw, th), _ = cv2.getTextSize(text, cv2.FONT_HERSHEY_SIMPLEX, font_size, 1)
+            (tw, th), _ = text_size(text, cv2.FONT_HERSHEY_SIMPLEX, font_size, 1)
             
             is_active = (self.selected_region and self.selected_region['name'] == region_name) or \
                         (self.hover_region and self.hover_region['name'] == region_name)
@@ -844,8 +1069,8 @@ class AnalyzerGUI:
                 section_check_str = f"PAT Check | CRC: {crc_status} | TID: {'OK' if res['valid_tid'] else 'FAIL'}"
                 is_psi_table = True
         
-        elif self.selected_program and self.selected_program in self.parser.programs:
-            prog = self.parser.programs[self.selected_program]
+        elif self.selected_program and self.selected_program in self.snap.programs:
+            prog = self.snap.programs[self.selected_program]
             if pid == prog['pmt_pid'] and pusi:
                 # PMT Check
                 dummy_node = {'pids': {}} 
@@ -882,7 +1107,7 @@ class AnalyzerGUI:
             
         # PID (Byte 1, 2)
         pid_color = (0, 255, 0) if pid == self.selected_pid else (200, 200, 200)
-        pid_desc = self.parser.pid_map.get(pid, {}).get('desc', 'Unknown')
+        pid_desc = self.snap.pid_map.get(pid, {}).get('desc', 'Unknown')
         draw_field(f"PID: 0x{pid:04X} ({pid}) - {pid_desc}", "PID", (1, 3), color=pid_color)
         
         # Flags & Counters (Byte 3)
@@ -899,7 +1124,7 @@ class AnalyzerGUI:
         if adapt_info['exist']:
             # Adaptation Field Header
             adapt_title = "[Adaptation Field]"
-            (tw, th), _ = cv2.getTextSize(adapt_title, cv2.FONT_HERSHEY_SIMPLEX, 0.5, 1)
+            (tw, th), _ = text_size(adapt_title, cv2.FONT_HERSHEY_SIMPLEX, 0.5, 1)
             
             region_key = 'Adaptation Field'
             is_active = (self.selected_region and self.selected_region['name'] == region_key) or \
@@ -977,61 +1202,45 @@ class AnalyzerGUI:
             hl_color = target['color']
         
         sy = y + 50
-        char_w = 14 # 폰트 0.45일 때 대략적인 글자 너비 (조정 필요)
-        
+        hex_step_x = HEX_CHAR_W * 3     # 바이트당 "XX " (고정폭 Glyph이므로 정확한 값)
+        hex_x, asc_x = x + 60, x + 500
+
         for i in range(0, 188, 16):
-            chunk = self.current_hex_data[i:i+16]
-            hexs = " ".join(f"{b:02X}" for b in chunk)
-            asc = "".join((chr(b) if 32<=b<127 else ".") for b in chunk)
-            
-            # 줄간격 20 -> 24 확대
-            ly = sy + (i//16)*24 
-            
             # Highlight Box Drawing
             if hl_color and hl_end > i and hl_start < i + 16:
-                # 이 행(Row)에 하이라이트가 포함됨
-                row_start = max(i, hl_start)
-                row_end = min(i + 16, hl_end)
-                
-                # Column Index (0~15)
-                c_s = row_start - i
-                c_e = row_end - i
-                
-                # Hex Part Box
-                # Hex Start X: x+60
-                # 각 바이트 "XX " = 3 chars. 
-                # Box Start: x + 60 + c_s * (3 * char_w)
-                # Box End: x + 60 + c_e * (3 * char_w) - space
-                
-                # 정밀한 좌표 계산을 위해 getTextSize 사용 권장하지만, 성능을 위해 고정폭 근사
-                # FONT_HEX 0.45 기준 "00 " 너비 약 36px?
-                # 실제 렌더링: (x+60, ly)에서 시작.
-                
-                # Hex 영역 박스
-                hex_step_x = 33 # 글자간격 튜닝
-                box_x1 = x + 60 + int(c_s * hex_step_x)
-                box_x2 = x + 60 + int(c_e * hex_step_x) - 5
+                # 이 행(Row)에 하이라이트가 포함됨 - Column Index (0~15), 줄간격 24 (GlyphAtlas LINE_PITCH)
+                ly = sy + (i//16)*24
+                c_s = max(i, hl_start) - i
+                c_e = min(i + 16, hl_end) - i
                 box_y1 = ly - 18
                 box_y2 = ly + 6
-                
+
+                # Hex 영역 박스 (마지막 바이트 뒤 공백 제외)
+                box_x1 = hex_x + c_s * hex_step_x - 2
+                box_x2 = hex_x + c_e * hex_step_x - HEX_CHAR_W + 2
                 cv2.rectangle(img, (box_x1, box_y1), (box_x2, box_y2), hl_color, 2)
-                
-                # ASCII 영역 박스 (Optional)
-                # Start X: x+490
-                # Char Step: 12 px?
-                asc_step_x = 14
-                box_ax1 = x + 490 + int(c_s * asc_step_x)
-                box_ax2 = x + 490 + int(c_e * asc_step_x)
-                
-                # ASCII는 겹침 방지를 위해 은은하게
-                overlay = img.copy()
-                cv2.rectangle(overlay, (box_ax1, box_y1), (box_ax2, box_y2), hl_color, -1)
-                cv2.addWeighted(overlay, 0.3, img, 0.7, 0, img)
 
-            cv2.putText(img, f"{i:02X}:", (x+10, ly), cv2.FONT_HERSHEY_SIMPLEX, FONT_HEX, (150, 150, 150), 1)
-            cv2.putText(img, hexs, (x+60, ly), cv2.FONT_HERSHEY_SIMPLEX, FONT_HEX, (200,200,200), 1)
-            # ASCII Text 오른쪽으로 추가 이동 (450 -> 490)
-            cv2.putText(img, asc, (x+490, ly), cv2.FONT_HERSHEY_SIMPLEX, FONT_HEX, (100,255,100), 1)
+                # ASCII 영역 박스 - 겹침 방지를 위해 은은하게 (박스 영역만 Blending)
+                box_ax1 = asc_x + c_s * ASCII_CHAR_W
+                box_ax2 = asc_x + c_e * ASCII_CHAR_W
+                roi = img[box_y1:box_y2 + 1, box_ax1:box_ax2 + 1]
+                overlay = roi.copy()
+                overlay[:] = hl_color
+                cv2.addWeighted(overlay, 0.3, roi, 0.7, 0, roi)
+
+        # 텍스트는 열(Offset/Hex/ASCII)별로 12줄을 한 번에 Glyph Blit (바이트 값 -> 칸 코드, 문자열 포맷 없음)
+        hex_atlas = get_atlas(FONT_HEX, HEX_CHAR_W, cells=HEX_CELLS)
+        asc_atlas = get_atlas(FONT_HEX, ASCII_CHAR_W)
+        data = np.frombuffer(self.current_hex_data[:188], dtype=np.uint8)
+        rows = (len(data) + 15) // 16
+        hex_codes = np.full(rows * 16, hex_atlas.blank, dtype=np.uint16)
+        hex_codes[:len(data)] = data
+        asc_codes = np.full(rows * 16, asc_atlas.blank, dtype=np.uint16)
+        asc_codes[:len(data)] = HEX_ASCII_LUT[data]
+
+        get_atlas(FONT_HEX, HEX_CHAR_W).draw(img, HEX_OFFSETS[:rows], (x+10, sy), (150, 150, 150))
+        hex_atlas.draw_codes(img, hex_codes.reshape(rows, 16), (hex_x, sy), (200, 200, 200))
+        asc_atlas.draw_codes(img, asc_codes.reshape(rows, 16), (asc_x, sy), (100, 255, 100))
 
     def _draw_controls(self, img):
         for btn in self.buttons:
@@ -1069,7 +1278,7 @@ class AnalyzerGUI:
             cv2.rectangle(img, (x1, y1), (x2, y2), color, -1)
             cv2.rectangle(img, (x1, y1), (x2, y2), border_color, thickness)
             
-            ts = cv2.getTextSize(label, cv2.FONT_HERSHEY_SIMPLEX, 0.6, 1)[0]
+            ts = text_size(label, cv2.FONT_HERSHEY_SIMPLEX, 0.6, 1)[0]
             tx = x1 + (x2-x1-ts[0])//2
             ty = y1 + (y2-y1+ts[1])//2
             cv2.putText(img, label, (tx, ty), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255,255,255), 1)
@@ -1109,7 +1318,7 @@ class AnalyzerGUI:
         
         # 진행률 계산
         total_pkts = self.parser.file_size // 188
-        current = self.parser.packet_count
+        current = self.snap.packet_count
         progress = 0.0
         if total_pkts > 0:
             progress = min(1.0, current / total_pkts)
@@ -1132,13 +1341,49 @@ class AnalyzerGUI:
         # 안내 문구
         cv2.putText(img, "The GUI remains responsive. You can continue to analyze packets.", (bar_x, bar_y + 110), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (150, 150, 150), 1)
 
+        # 단계별 계측 (누적 시간 비율 막대 + 범례, 카운터)
+        prof = self.scanner.get_profile()
+        if prof and prof['sampled_chunks']:
+            c = prof['counters']
+            rate = f"{prof['packets_per_s'] / 1e3:,.0f} kpkt/s" if prof['packets_per_s'] else "-"
+            info = f"{rate}  |  PCR {c['pcr']:,}  PES {c['pes']:,}  PSI {c['psi']:,}  CC Err {c['cc_errors']:,}"
+            cv2.putText(img, info, (bar_x, bar_y + 145), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (200, 200, 200), 1)
+
+            sy = bar_y + 160
+            sx = bar_x
+            for i, st in enumerate(prof['stages']):
+                seg = int(round(bar_w * st['pct'] / 100))
+                if seg > 0:
+                    cv2.rectangle(img, (sx, sy), (min(sx + seg, bar_x + bar_w), sy + 16), SCAN_STAGE_COLORS[i], -1)
+                sx += seg
+            cv2.rectangle(img, (bar_x, sy), (bar_x + bar_w, sy + 16), (90, 90, 90), 1)
+
+            col_w = bar_w // 5
+            for i, st in enumerate(prof['stages']):
+                lx = bar_x + (i % 5) * col_w
+                ly = sy + 42 + (i // 5) * 24
+                cv2.rectangle(img, (lx, ly - 10), (lx + 10, ly), SCAN_STAGE_COLORS[i], -1)
+                cv2.putText(img, f"{st['stage']} {st['pct']:.1f}%", (lx + 16, ly), cv2.FONT_HERSHEY_SIMPLEX, 0.45, (200, 200, 200), 1)
+
     def _mouse_cb(self, event, x, y, flags, param):
+        # 타임라인 스트립 (메뉴가 닫혀 있을 때만)
+        ui_y = y    # Toolbar / 메뉴는 화면 좌표 사용
+        self._timeline_hover = not self.ui.menu_open and TOOLBAR_H <= y < TOOLBAR_H + TIMELINE_H
+        if self._timeline_hover:
+            self.mouse_x, self.mouse_y = x, -1     # 패널 Hover 해제
+            self.hover_region = None
+            if event == cv2.EVENT_MOUSEMOVE: self.ui.handle_mouse_move(x, ui_y)
+            elif event == cv2.EVENT_LBUTTONDOWN: self._seek_timeline(x)
+            return
+        # 패널은 기존 좌표계로 그리므로 스트립 아래 영역은 스트립 높이만큼 보정
+        if y >= TOOLBAR_H + TIMELINE_H: y -= TIMELINE_H
+
         # Update mouse coordinates globally
         self.mouse_x = x
         self.mouse_y = y
 
         if event == cv2.EVENT_MOUSEMOVE:
-            self.ui.handle_mouse_move(x, y)
+            self.ui.handle_mouse_move(x, ui_y)
             
             # Handle Field Hover
             self.hover_region = None
@@ -1166,7 +1411,7 @@ class AnalyzerGUI:
                         break
             
             # 1. Menu & Button Click (Delegated to UIManager)
-            if self.ui.handle_click(x, y):
+            if self.ui.handle_click(x, ui_y):
                 return
 
             # 2. PES Navigation Click
@@ -1193,31 +1438,9 @@ class AnalyzerGUI:
                         self.last_click_time = time.time()
                         self.last_click_target = 'pes_prev'
                         
-                        # Start Backward Playback Search
-                        # 1. Use Selected PID from PMT (Priority)
-                        target_pid = self.selected_pid
-                        
-                        # 2. Fallback: Current Packet PID
-                        if target_pid is None:
-                            data = self.parser.read_packet_at(self.current_pkt_idx)
-                            if data:
-                                import struct
-                                target_pid = (struct.unpack('>I', data[:4])[0] >> 8) & 0x1FFF
-                        
-                        if target_pid is not None:
-                            self.search_target_pid = target_pid
-                            self.playing = True
-                            self.speed = -50.0 # 고속 역방향
-                            self.pes_search_mode = True
-                            
-                            # 현재 패킷에서 바로 멈추지 않도록 한 칸 이동
-                            self.current_pkt_idx = max(0, self.current_pkt_idx - 1)
-                            
-                            print(f"[DEBUG] Search Prev PES Start (PID: 0x{target_pid:X})")
-                        else:
-                            print("[Error] No Target PID for Search")
-                        
-                        return # Playback 루프에서 처리됨
+                        # 이전 PES Start로 즉시 이동 (PUSI 인덱스 사용)
+                        self._jump_pes_start(-1)
+                        return
 
                 # 2-4. PES Start Next (>>)
                 if 'pes_next' in self.pes_nav_targets:
@@ -1227,31 +1450,9 @@ class AnalyzerGUI:
                         self.last_click_time = time.time()
                         self.last_click_target = 'pes_next'
                         
-                        # Start Forward Playback Search
-                        # 1. Use Selected PID from PMT (Priority)
-                        target_pid = self.selected_pid
-                        
-                        # 2. Fallback: Current Packet PID
-                        if target_pid is None:
-                            data = self.parser.read_packet_at(self.current_pkt_idx)
-                            if data:
-                                import struct
-                                target_pid = (struct.unpack('>I', data[:4])[0] >> 8) & 0x1FFF
-
-                        if target_pid is not None:
-                            self.search_target_pid = target_pid
-                            self.playing = True
-                            self.speed = 50.0 # 고속 정방향
-                            self.pes_search_mode = True
-                            
-                            # 현재 패킷에서 바로 멈추지 않도록 한 칸 이동
-                            self.current_pkt_idx += 1
-                            
-                            print(f"[DEBUG] Search Next PES Start (PID: 0x{target_pid:X})")
-                        else:
-                            print("[Error] No Target PID for Search")
-
-                        return # Playback 루프에서 처리됨
+                        # 다음 PES Start로 즉시 이동 (PUSI 인덱스 사용)
+                        self._jump_pes_start(1)
+                        return
 
             # 3. Tree View Selection
             # PSI 영역 (y: 60~480)
@@ -1261,7 +1462,7 @@ class AnalyzerGUI:
                 
                 # Helper to check PID existence (Must match draw logic)
                 def check_pid(pid):
-                    return pid in self.parser.pid_counts or pid in self.parser.pid_map
+                    return pid in self.snap.pid_counts or pid in self.snap.pid_map
                 
                 psi_tables = [
                     {'name': 'PAT', 'pid': 0x0000, 'always': True},
@@ -1296,11 +1497,11 @@ class AnalyzerGUI:
                     
                     # PAT Sub-items (Programs)
                     if tbl['pid'] == 0x0000:
-                        for prog_num in self.parser.programs.keys():
+                        for prog_num in self.snap.programs.keys():
                             if cur_y - 20 <= y <= cur_y + 5:
                                 self.selected_program = prog_num
                                 
-                                prog_info = self.parser.programs[prog_num]
+                                prog_info = self.snap.programs[prog_num]
                                 self.selected_pid = prog_info['pmt_pid']
                                 
                                 for k in self.active_filters: self.active_filters[k] = False
@@ -1311,8 +1512,8 @@ class AnalyzerGUI:
             
             # PMT 영역 (y: 480~900)
             elif 0 <= x <= 400 and 480 <= y <= 900:
-                if self.selected_program and self.selected_program in self.parser.programs:
-                    prog = self.parser.programs[self.selected_program]
+                if self.selected_program and self.selected_program in self.snap.programs:
+                    prog = self.snap.programs[self.selected_program]
                     cur_y = 480 + 50
                     
                     # 1. PMT PID Check
@@ -1330,7 +1531,7 @@ class AnalyzerGUI:
                                 self.selected_pid = pid
                                 
                                 # Sync with Filter Buttons
-                                pid_info = self.parser.pid_map.get(pid, {})
+                                pid_info = self.snap.pid_map.get(pid, {})
                                 pid_type = pid_info.get('type', 0)
                                 desc = pid_info.get('desc', '')
                                 
@@ -1350,13 +1551,14 @@ class AnalyzerGUI:
         elif name == 'play': self._toggle_play()
         elif name == 'stop': 
             self.playing = False
+            self._cancel_search()
             self.current_pkt_idx = 0
             self.update_packet_view()
         elif name == 'rev':
-            if self.playing: self.speed = -1.0
+            if self.playing: self.speed = next_speed(self.speed, -1)
             else: self._step_packet(-1)
         elif name == 'ff':
-            if self.playing: self.speed = 2.0
+            if self.playing: self.speed = next_speed(self.speed, 1)
             else: self._step_packet(1)
         elif name == 'ext_play':
             self._launch_player()
@@ -1367,13 +1569,19 @@ class AnalyzerGUI:
                 # 이미 완료된 상태면 리포트 다시 보기 트리거
                 self.bscan_running = True 
             else: 
-                # 초기 상태면 스캔 시작
+                # 초기 상태면 스캔 시작 (필터 표현식이 있으면 리포트에 일치 패킷 수 포함)
+                self.scanner.filter_exprs = {'GUI Filter': self.filter_expr.text} if self.filter_expr else {}
                 self.scanner.start()
         elif name == 'jitter':
             self.show_jitter = not self.show_jitter
             print(f"[UI] Jitter Analysis Window: {self.show_jitter}")
-            # TODO: Open Jitter Window logic here
-            
+            if self.show_jitter:
+                self.jitter_view = JitterView()
+                self.jitter_view.open()
+            elif self.jitter_view:
+                self.jitter_view.close()
+                self.jitter_view = None
+
         elif name == 'prev': self._step_packet(-1)
         elif name == 'next': self._step_packet(1)
         
@@ -1399,12 +1607,12 @@ class AnalyzerGUI:
                     elif f_name == 'PMT':
                         # 현재 선택된 프로그램이 있으면 그 PMT, 없으면 첫 번째 프로그램의 PMT 선택
                         target_prog = self.selected_program
-                        if target_prog is None and self.parser.programs:
-                            target_prog = list(self.parser.programs.keys())[0]
+                        if target_prog is None and self.snap.programs:
+                            target_prog = list(self.snap.programs.keys())[0]
                             self.selected_program = target_prog
                         
-                        if target_prog and target_prog in self.parser.programs:
-                            self.selected_pid = self.parser.programs[target_prog]['pmt_pid']
+                        if target_prog and target_prog in self.snap.programs:
+                            self.selected_pid = self.snap.programs[target_prog]['pmt_pid']
                             # 다른 필터 끄기
                             for k in self.active_filters:
                                 if k != 'PMT': self.active_filters[k] = False
@@ -1417,8 +1625,8 @@ class AnalyzerGUI:
                         # 다른 필터는 끄는게 직관적일 수 있음 (Radio Button 처럼) -> 여기서는 OR 로직이므로 유지하되 선택만 변경
                         
                         # Find first matching PID in current program
-                        if self.selected_program and self.selected_program in self.parser.programs:
-                            prog = self.parser.programs[self.selected_program]
+                        if self.selected_program and self.selected_program in self.snap.programs:
+                            prog = self.snap.programs[self.selected_program]
                             for pid, info in prog['pids'].items():
                                 p_type = info.get('type', 0)
                                 desc = info.get('desc', '')
@@ -1436,7 +1644,7 @@ class AnalyzerGUI:
                     else:
                         # 필터 꺼짐: 현재 선택된 PID가 해당 타입이면 선택 해제
                         if self.selected_pid:
-                            pid_info = self.parser.pid_map.get(self.selected_pid, {})
+                            pid_info = self.snap.pid_map.get(self.selected_pid, {})
                             p_type = pid_info.get('type', 0)
                             desc = pid_info.get('desc', '')
                             
@@ -1457,10 +1665,84 @@ class AnalyzerGUI:
             if idx < len(self.recent_files):
                 self._open_file(self.recent_files[idx])
 
+    def _edit_filter_expr(self):
+        """필터 표현식 입력 (빈 문자열: 해제, 초기값: 현재 표현식 또는 토글 필터와 같은 의미의 식)"""
+        initial = self.filter_expr.text if self.filter_expr else (filters_to_expr(self.active_filters) or "")
+        try:
+            import tkinter as tk    # 대화상자를 열 때만 import (분석 모듈 / 시작 시간에 영향 없음)
+            from tkinter import simpledialog
+            root = tk.Tk()
+            root.withdraw()
+            root.attributes('-topmost', True)
+            text = simpledialog.askstring("Filter Expression",
+                                          "e.g. pid == 0x100 and pusi and random_access / tei or scrambled",
+                                          initialvalue=initial, parent=root)
+            root.destroy()
+            for _ in range(5):
+                cv2.waitKey(1)
+        except Exception as e:
+            print(f"[Error] Filter dialog failed: {e}")
+            return
+
+        if text is None: return     # 취소
+        if not text.strip():
+            self.filter_expr = None
+            self.parser.last_log = "Filter expression cleared."
+            return
+        try:
+            self.filter_expr = compile_filter(text)
+            self.parser.last_log = f"Filter: {self.filter_expr.text}"
+        except FilterSyntaxError as e:
+            self.parser.last_log = f"Filter error: {e}"
+        print(f"[Filter] {self.parser.last_log}")
+
+    def _goto_dialog(self):
+        """Go To: 패킷 번호 / 바이트 오프셋 / PCR·PTS 시각 입력 -> 해당 패킷으로 이동 (시각은 인덱스 이진 탐색)"""
+        try:
+            import tkinter as tk
+            from tkinter import simpledialog
+            root = tk.Tk()
+            root.withdraw()
+            root.attributes('-topmost', True)
+            text = simpledialog.askstring("Go To",
+                                          "e.g. 12345678 / @0x100000 / 00:42:10.5 / pts 1:02.5 pid 0x101",
+                                          initialvalue=self._goto_text, parent=root)
+            root.destroy()
+            for _ in range(5):
+                cv2.waitKey(1)
+        except Exception as e:
+            print(f"[Error] Go To dialog failed: {e}")
+            return
+
+        if not text or not text.strip(): return     # 취소
+        self._goto_text = text.strip()
+        self.goto(text)
+
+    def goto(self, text):
+        """Go To 입력 해석 후 이동 (성공 시 True)"""
+        try:
+            target = parse_goto(text)
+        except GotoSyntaxError as e:
+            self.parser.last_log = f"Go To error: {e}"
+            print(f"[GoTo] {self.parser.last_log}")
+            return False
+        idx, msg = resolve_goto(target, self.pkt_index, self.parser.total_pkts,
+                                pcr_pid=self._selected_pcr_pid(), selected_pid=self.selected_pid)
+        self.parser.last_log = msg
+        print(f"[GoTo] {msg}")
+        if idx < 0: return False
+        self.playing = False
+        self._cancel_search()
+        self.current_pkt_idx = idx
+        self.update_packet_view()
+        return True
+
     def _open_file(self, path=None):
         if not path:
             # [수정] 창을 닫지 않고 유지 (메인 루프 안정성)
             try:
+                import tkinter as tk
+                from tkinter import filedialog
                 root = tk.Tk()
                 root.withdraw()
                 root.attributes('-topmost', True)
@@ -1490,11 +1772,13 @@ class AnalyzerGUI:
         print(f"[System] Opening file: {path}")
         
         # Reset Logic
-        if self.scanner.running: self.scanner.stop()
+        self._close_scanner()
         
         # Re-initialize
         self.parser = TSParser(path)
-        self.scanner = TSScanner(self.parser)
+        self.scanner = create_scanner(self.parser, USE_SCAN_PROCESS)
+        self._layers.clear()
+        self._start_packet_index()
         # [수정] UIManager의 add_recent 사용
         self.ui.add_recent(path)
         
@@ -1509,10 +1793,6 @@ class AnalyzerGUI:
         # Filter Reset
         for k in self.active_filters: self.active_filters[k] = False
         
-        # PES Search State Reset
-        self.pes_search_mode = False
-        self.search_target_pid = None
-        
         # Init Scan
         print("[System] Scanning new file...")
         self.parser.quick_scan(limit=20000)
@@ -1534,80 +1814,22 @@ class AnalyzerGUI:
                 self.selected_program = 0
                 self.selected_pid = self.parser.programs[0]['pmt_pid']
                 
+        self.snap = self.scanner.get_snapshot()
         self.update_packet_view()
 
     def _toggle_play(self):
+        self._cancel_search()
         self.playing = not self.playing
         if self.playing: self.speed = 1.0
 
-    def check_packet_filter(self, packet):
-        """
-        현재 활성화된 필터 조건에 패킷이 부합하는지 확인 (OR 연산)
-        필터가 모두 꺼져 있으면 True 반환 (필터링 없음)
-        """
-        # Check if any filter is active
-        is_any_filter_active = any(self.active_filters.values())
-        if not is_any_filter_active:
-            return True
-            
-        # Parse packet for filtering
-        pid, pusi, adapt, _ = self.parser.parse_header(packet)
-        
-        # 1. Video / Audio Filter
-        if self.active_filters['Video'] or self.active_filters['Audio']:
-            pid_type = self.parser.pid_map.get(pid, {}).get('type', 0)
-            
-            # Video Types: MPEG1(1), MPEG2(2), H.264(0x1B), HEVC(0x24)
-            if self.active_filters['Video'] and pid_type in [0x01, 0x02, 0x1B, 0x24]: return True
-            
-            # Audio Types: MPEG1(3), MPEG2(4), AAC(0x0F), AC3(0x81)
-            if self.active_filters['Audio'] and pid_type in [0x03, 0x04, 0x0F, 0x81]: return True
-            
-        # 2. PCR Filter
-        if self.active_filters['PCR']:
-            if adapt & 0x2: # Adapt Field Exists
-                if len(packet) > 5:
-                    flags = packet[5]
-                    pcr_flag = (flags >> 4) & 0x1
-                    if pcr_flag: return True
-                    
-        # 3. PTS / DTS Filter
-        if self.active_filters['PTS'] or self.active_filters['DTS']:
-            if pusi:
-                # Check PES Header
-                off = 4
-                if adapt & 0x2: off = 5 + packet[4]
-                
-                if off < 188:
-                    payload = packet[off:]
-                    if len(payload) >= 9:
-                        start_code = (payload[0]<<16) | (payload[1]<<8) | payload[2]
-                        if start_code == 1:
-                            flags_2 = payload[7]
-                            pts_dts_flag = (flags_2 >> 6) & 0x3
-                            
-                            if self.active_filters['PTS'] and (pts_dts_flag & 0x2): return True
-                            if self.active_filters['DTS'] and (pts_dts_flag & 0x1): return True
-
-        # 5. PAT / PMT Filter
-        if self.active_filters.get('PAT', False):
-            if pid == 0: return True
-            
-        if self.active_filters.get('PMT', False):
-            # Check against known PMT PIDs
-            for prog in self.parser.programs.values():
-                if pid == prog['pmt_pid']: return True
-
-        return False
-
     def _step_packet(self, step):
         """
         패킷 이동 (탐색)
-        - 조건(PID 선택 or 필터 활성)이 있으면: 'Smart Search' 모드로 재생 (고속 탐색)
+        - 조건(PID 선택 or 필터 활성)이 있으면: 'Smart Search' (ts_search 워커에서 Chunk 단위 고속 탐색)
         - 조건이 없으면: 단순 1칸 이동
         """
-        # 1. 활성 조건 확인
-        is_filter_active = any(self.active_filters.values())
+        # 1. 활성 조건 확인 (필터 표현식도 필터로 취급)
+        is_filter_active = any(self.active_filters.values()) or self.filter_expr is not None
         has_condition = (self.selected_pid is not None) or is_filter_active
         
         # 2. 조건이 없으면 단순 이동
@@ -1617,110 +1839,61 @@ class AnalyzerGUI:
             self.update_packet_view()
             return
 
-        # 3. 조건이 있으면 'Filter Search Mode'로 재생 시작
-        # (무한루프 방지 및 UI 반응성 확보를 위해 Play Loop 이용)
-        self.playing = True
-        self.speed = 50.0 if step > 0 else -50.0  # 탐색 속도 (x50)
-        
-        self.filter_search_mode = True  # 필터 탐색 모드 활성화
-        self.pes_search_mode = False    # PES 탐색 모드는 해제
-        
-        # 현재 위치에서는 이미 멈춰있을 수 있으므로, 일단 한 칸 이동 후 탐색 시작
-        self.current_pkt_idx += (1 if step > 0 else -1)
-        if self.current_pkt_idx < 0: self.current_pkt_idx = 0
-        
-        print(f"[Search] Searching with speed {self.speed}... (Filter: {is_filter_active}, PID: {self.selected_pid})")
+        # 3. 조건이 있으면 'Smart Search': 워커 스레드에서 Chunk 단위로 검색 (결과는 _handle_playback에서 반영)
+        spec = build_filter_spec(self.active_filters, self.snap.pid_map, self.snap.programs, self.selected_pid,
+                                 expr=self.filter_expr)
+        if not self.searcher or spec is None: return
+        self.playing = False
+        self.filter_search_mode = True
+        self.searcher.start(spec, self.current_pkt_idx + (1 if step > 0 else -1), step)
 
-    def _search_pes_start_backward(self):
-        """현재 위치에서 뒤로 가며 PES Start(PUSI=1)를 찾음 (Deep Search)"""
-        print("[DEBUG] Start Backward Search")
-        
-        # Searching 표시
-        if hasattr(self, 'canvas'):
-            temp_img = self.canvas.copy()
-            cv2.rectangle(temp_img, (500, 400), (1100, 500), (0, 0, 0), -1)
-            cv2.rectangle(temp_img, (500, 400), (1100, 500), (0, 255, 255), 2)
-            cv2.putText(temp_img, "Searching Previous PES Start...", (520, 460), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 255, 255), 2)
-            cv2.imshow("MPEG2-TS Analyzer", temp_img)
-            cv2.waitKey(1)
+        print(f"[Search] Searching {'forward' if step > 0 else 'backward'}... (Filter: {is_filter_active}, PID: {self.selected_pid})")
 
-        # 현재 패킷의 PID를 타겟으로 설정
-        import struct
+    def _pes_target_pid(self):
+        """PES 탐색 대상 PID: PMT에서 선택한 PID 우선, 없으면 현재 패킷의 PID"""
+        if self.selected_pid is not None:
+            return self.selected_pid
         data = self.parser.read_packet_at(self.current_pkt_idx)
-        if not data: 
-            print("[DEBUG] No data at current index")
-            return -1
-            
-        header = struct.unpack('>I', data[:4])[0]
-        target_pid = (header >> 8) & 0x1FFF
-        print(f"[DEBUG] Target PID: 0x{target_pid:X}")
-        
-        # 최대 500,000 패킷 (약 90MB) 검색
-        max_search = 500000
-        curr = self.current_pkt_idx
-        
-        for k in range(1, max_search):
-            idx = curr - k
-            if idx < 0: break
-            
-            data = self.parser.read_packet_at(idx)
-            if not data: break
-            
-            # PID 및 PUSI 직접 파싱 (속도 최적화)
-            h = struct.unpack('>I', data[:4])[0]
-            pid = (h >> 8) & 0x1FFF
-            pusi = (h >> 22) & 0x1
-            
-            if pid == target_pid:
-                if pusi:
-                    print(f"[DEBUG] Found PES Start at #{idx}")
-                    return idx
-        
-        print("[DEBUG] PES Start not found in backward search")
-        return -1
-
-    def _search_pes_start_forward(self):
-        """현재 위치에서 앞으로 가며 다음 PES Start(PUSI=1)를 찾음"""
-        print("[DEBUG] Start Forward Search")
-        
-        # Searching 표시
-        if hasattr(self, 'canvas'):
-            temp_img = self.canvas.copy()
-            cv2.rectangle(temp_img, (500, 400), (1100, 500), (0, 0, 0), -1)
-            cv2.rectangle(temp_img, (500, 400), (1100, 500), (0, 255, 255), 2)
-            cv2.putText(temp_img, "Searching Next PES Start...", (540, 460), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 255, 255), 2)
-            cv2.imshow("MPEG2-TS Analyzer", temp_img)
-            cv2.waitKey(1)
+        if not data: return None
+        return self.parser.parse_header(data)[0]
+
+    def _search_pes_start_backward(self, target_pid=None):
+        """현재 위치 이전의 PES Start(PUSI=1) 패킷 인덱스 (-1: 없음)"""
+        if target_pid is None: target_pid = self._pes_target_pid()
+        if target_pid is None or not self.pkt_index: return -1
+        return self.pkt_index.find_prev(target_pid, self.current_pkt_idx)
+
+    def _search_pes_start_forward(self, target_pid=None):
+        """현재 위치 이후의 PES Start(PUSI=1) 패킷 인덱스 (-1: 없음)"""
+        if target_pid is None: target_pid = self._pes_target_pid()
+        if target_pid is None or not self.pkt_index: return -1
+        return self.pkt_index.find_next(target_pid, self.current_pkt_idx)
+
+    def _jump_pes_start(self, direction):
+        """이전(-1) / 다음(+1) PES Start로 이동"""
+        target_pid = self._pes_target_pid()
+        if target_pid is None:
+            print("[Error] No Target PID for Search")
+            return
+        if direction < 0:
+            idx = self._search_pes_start_backward(target_pid)
+        else:
+            idx = self._search_pes_start_forward(target_pid)
 
-        import struct
-        data = self.parser.read_packet_at(self.current_pkt_idx)
-        if not data: return -1
-        header = struct.unpack('>I', data[:4])[0]
-        target_pid = (header >> 8) & 0x1FFF
-        print(f"[DEBUG] Target PID: 0x{target_pid:X}")
-        
-        max_search = 500000
-        curr = self.current_pkt_idx
-        
-        for k in range(1, max_search):
-            idx = curr + k
-            data = self.parser.read_packet_at(idx)
-            if not data: break # EOF
-            
-            h = struct.unpack('>I', data[:4])[0]
-            pid = (h >> 8) & 0x1FFF
-            pusi = (h >> 22) & 0x1
-            
-            if pid == target_pid:
-                if pusi:
-                    print(f"[DEBUG] Found PES Start at #{idx}")
-                    return idx
-        
-        print("[DEBUG] PES Start not found in forward search")
-        return -1
+        if idx >= 0:
+            self.playing = False
+            self.filter_search_mode = False
+            self.speed = 1.0
+            self.current_pkt_idx = idx
+            self.update_packet_view()
+        else:
+            self.parser.last_log = f"PES Start not found (PID 0x{target_pid:X})"
 
     def update_packet_view(self):
-        data = self.parser.read_packet_at(self.current_pkt_idx)
+        # 재생 중 선읽기된 패킷이 있으면 메모리에서 사용 (없으면 직접 읽기)
+        data = self.prefetch.get(self.current_pkt_idx) if self.prefetch else None
+        if data is None:
+            data = self.parser.read_packet_at(self.current_pkt_idx)
         if data: 
             self.current_hex_data = data
         else:
@@ -1733,124 +1906,41 @@ class AnalyzerGUI:
 
     def _handle_playback(self):
         wait = 10
-        if self.playing:
-            # === 1. 일반 재생 모드 (조건 없음) ===
-            if (not hasattr(self, 'pes_search_mode') or not self.pes_search_mode) and \
-               (not hasattr(self, 'filter_search_mode') or not self.filter_search_mode):
-                self.current_pkt_idx += int(self.speed)
-                if self.current_pkt_idx < 0: self.current_pkt_idx = 0
-                self.update_packet_view()
-                if self.speed == 1.0: wait = 10
-                else: wait = 1
-            
-            # === 2. PES 탐색 모드 (정밀 검사) ===
-            elif hasattr(self, 'pes_search_mode') and self.pes_search_mode:
-                # 고속 이동하되, 건너뛰지 않고 모든 패킷 검사
-                step = 1 if self.speed > 0 else -1
-                steps_to_check = abs(int(self.speed)) # 예: 50개씩 검사
-                
-                found = False
-                for _ in range(steps_to_check):
-                    self.current_pkt_idx += step
-                    if self.current_pkt_idx < 0: 
-                        self.current_pkt_idx = 0
-                        self.playing = False
-                        self.pes_search_mode = False
-                        break
-                        
-                    data = self.parser.read_packet_at(self.current_pkt_idx)
-                    if not data: 
-                        self.playing = False # EOF
-                        self.pes_search_mode = False
-                        break
-                    
-                    import struct
-                    h = struct.unpack('>I', data[:4])[0]
-                    pid = (h >> 8) & 0x1FFF
-                    pusi = (h >> 22) & 0x1
-                    
-                    if pid == self.search_target_pid and pusi:
-                        print(f"[DEBUG] Found PES Start at {self.current_pkt_idx}")
-                        found = True
-                        break # 찾음! 루프 탈출
-                
-                if found:
-                    self.playing = False # 정지
-                    self.pes_search_mode = False
-                    self.speed = 1.0
-
-                self.update_packet_view()
-                wait = 1 # 빠른 갱신
-
-            # === 3. Filter/PID 탐색 모드 (Smart Search) ===
-            elif hasattr(self, 'filter_search_mode') and self.filter_search_mode:
-                step = 1 if self.speed > 0 else -1
-                steps_to_check = abs(int(self.speed))
-                
-                is_filter_active = any(self.active_filters.values())
-                found = False
-                
-                # 파일 I/O 최적화를 위해 한 번 Open
-                try:
-                    with open(self.parser.file_path, "rb") as f:
-                        for _ in range(steps_to_check):
-                            # 경계 체크
-                            if self.current_pkt_idx < 0:
-                                self.current_pkt_idx = 0
-                                found = True
-                                break
-                            
-                            # Read Packet directly
-                            f.seek(self.current_pkt_idx * 188)
-                            data = f.read(188)
-                            
-                            if len(data) != 188: # EOF
-                                self.playing = False
-                                self.filter_search_mode = False
-                                break
-                                
-                            # --- 조건 검사 ---
-                            match = True
-                            
-                            # 필터가 켜져 있으면: PID 선택 무시하고 필터 조건만 검사 (Global Search)
-                            if is_filter_active:
-                                if not self.check_packet_filter(data):
-                                    match = False
-                            # 필터가 꺼져 있으면: 선택된 PID만 검사
-                            elif self.selected_pid is not None:
-                                import struct
-                                h = struct.unpack('>I', data[:4])[0]
-                                pid = (h >> 8) & 0x1FFF
-                                if pid != self.selected_pid:
-                                    match = False
-                            
-                            if match:
-                                found = True
-                                # 필터 탐색으로 찾았는데 PID가 다르면, 선택 PID를 자동 변경
-                                if is_filter_active and self.selected_pid is not None:
-                                    import struct
-                                    h = struct.unpack('>I', data[:4])[0]
-                                    pid = (h >> 8) & 0x1FFF
-                                    if pid != self.selected_pid:
-                                        self.selected_pid = pid
-                                break
-                            
-                            # 다음 패킷으로
-                            self.current_pkt_idx += step
-                            
-                except Exception as e:
-                    print(f"[Error] Search IO failed: {e}")
-                    self.playing = False
-                    self.filter_search_mode = False
-                
-                if found:
-                    self.playing = False
-                    self.filter_search_mode = False
-                    self.speed = 1.0
-                    print(f"[Search] Found match at {self.current_pkt_idx}")
-                
-                self.update_packet_view()
-                wait = 1
+        # === Filter/PID 탐색 모드 (Smart Search): 워커 결과 확인 ===
+        if self.filter_search_mode:
+            still_running = self.searcher is not None and self.searcher.running   # poll() 전에 확인해야 결과 유실 없음
+            res = self.searcher.poll() if self.searcher else None
+            if res is not None:
+                self.filter_search_mode = False
+                if res['idx'] >= 0:
+                    self.current_pkt_idx = res['idx']
+                    # 필터 탐색으로 찾았는데 PID가 다르면, 선택 PID를 자동 변경
+                    is_filter_active = any(self.active_filters.values()) or self.filter_expr is not None
+                    if is_filter_active and self.selected_pid is not None and res['pid'] != self.selected_pid:
+                        self.selected_pid = res['pid']
+                    self.update_packet_view()
+                    print(f"[Search] Found match at {res['idx']} ({res['scanned']:,} pkts, {res['elapsed']*1000:.0f} ms)")
+                else:
+                    self.parser.last_log = "Search: no matching packet"
+            elif not still_running:
+                self.filter_search_mode = False
+            wait = 1
+
+        # === 일반 재생 모드 ===
+        # 커서는 벽시계 기준 목표 패킷/초로 진행하고, 화면은 목표 FPS 시점에만 갱신 (사이의 패킷은 그리지 않음)
+        elif self.playing:
+            sched = self.scheduler
+            idx, at_edge = sched.advance(self.current_pkt_idx, self.speed, self.parser.total_pkts)
+            self.current_pkt_idx = idx
+            if self.prefetch: self.prefetch.set_cursor(idx, sched.packets_per_frame(self.speed))
+            self.update_packet_view()
+            if at_edge:
+                # 파일 끝/처음 도달: 일시정지
+                self.playing = False
+                self.parser.last_log = "Playback reached end of file." if self.speed > 0 else "Playback reached start of file."
+            wait = sched.wait_ms()
+        else:
+            self.scheduler.reset()
 
         return cv2.waitKey(wait) & 0xFF
 
@@ -0,0 +1,250 @@
+"""
+[파일 개요]
+MPEG2-TS 비동기(asyncio) 스트리밍 분석 API (AsyncTSAnalyzer)
+
+[목적 및 필요성]
+TSParser/TSScanner는 스레드 + sleep 기반이며 결과를 속성에 저장하고 GUI가 이를 폴링합니다.
+모니터링 서비스처럼 하나의 이벤트 루프에서 수십 개의 입력을 감시해야 하는 환경에서는
+입력마다 스레드를 띄우는 방식이 부담이 되므로, 기존 파싱 코드(TSParser, TSETR290Analyzer) 위에
+asyncio 네이티브 인터페이스를 제공합니다.
+
+[사용법]
+    analyzer = AsyncTSAnalyzer("a.ts")
+    sub = analyzer.subscribe()              # 이벤트 구독 (stats / psi / etr290 / completed)
+    task = asyncio.create_task(analyzer.run())
+    async for event in sub: ...
+    task.cancel()                           # 분석 중단 (파일/구독 자동 정리)
+
+    async for cols in AsyncTSAnalyzer("a.ts").batches():   # 디코딩된 패킷 묶음만 필요할 때
+        ...
+"""
+import asyncio
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from ts_parser_core import TSParser
+from ts_columns import TS_PACKET_SIZE, NUM_PIDS, DEFAULT_CHUNK_PACKETS, decode_columns
+
+try:
+    from ts_etr290_analyzer import TSETR290Analyzer
+except ImportError:
+    TSETR290Analyzer = None
+
+
+class _Subscription:
+    """AsyncTSAnalyzer 이벤트 구독 핸들 (async iterator)"""
+    def __init__(self, owner, maxsize):
+        self._owner = owner
+        self.queue = asyncio.Queue(maxsize)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        event = await self.queue.get()
+        if event is None:
+            self.close()
+            raise StopAsyncIteration
+        return event
+
+    def close(self):
+        """구독 해제"""
+        if self in self._owner._subscribers:
+            self._owner._subscribers.remove(self)
+
+
+class AsyncTSAnalyzer:
+    """
+    하나의 TS 입력을 asyncio로 분석하는 클래스.
+    파일 읽기와 Chunk 분석은 이벤트 루프의 기본 Executor에서 수행되므로 루프는 블로킹되지 않으며,
+    입력별 전용 스레드를 만들지 않습니다.
+    """
+    def __init__(self, file_path, chunk_packets=DEFAULT_CHUNK_PACKETS, stats_interval=0.5):
+        self.file_path = file_path
+        self.chunk_packets = chunk_packets
+        self.stats_interval = stats_interval    # stats 이벤트 최소 간격 (초)
+
+        self.parser = TSParser(file_path)       # PSI 파싱 로직 및 결과 저장소 재사용
+        self.etr290 = TSETR290Analyzer() if TSETR290Analyzer else None
+
+        self.packet_count = 0
+        self.pid_counts = np.zeros(NUM_PIDS, dtype=np.int64)
+        self.completed = False
+        self._first_pcr = None
+        self._last_pcr = None
+        self._subscribers = []
+
+    # --- Public API ---
+    def subscribe(self, maxsize=256):
+        """
+        이벤트 구독 (run() 호출 전에 등록해야 모든 이벤트를 수신)
+        이벤트: {'type': 'stats' | 'psi' | 'etr290' | 'completed', ...}
+        소비가 느려 큐가 가득 차면 오래된 이벤트부터 버립니다.
+        """
+        sub = _Subscription(self, maxsize)
+        self._subscribers.append(sub)
+        return sub
+
+    async def batches(self, start_index=0):
+        """디코딩된 패킷 묶음(컬럼 dict)을 순차 반환하는 async iterator"""
+        async for cols, _ in self._read_batches(start_index):
+            yield cols
+
+    async def run(self):
+        """
+        파일 전체를 분석하며 이벤트를 발행합니다. Task 취소(cancel) 시 즉시 중단됩니다.
+        :return: 마지막 'completed' 이벤트 dict
+        """
+        loop = asyncio.get_running_loop()
+        last_stats = 0.0
+        try:
+            async for cols, buf in self._read_batches(0):
+                prev_errors = dict(self.etr290.errors) if self.etr290 else {}
+                prev_progs = len(self.parser.programs), len(self.parser.pid_map)
+
+                await loop.run_in_executor(None, self._analyze_chunk, cols, buf)
+
+                if (len(self.parser.programs), len(self.parser.pid_map)) != prev_progs:
+                    self._publish({'type': 'psi', 'programs': self._programs_copy()})
+
+                if self.etr290:
+                    for key, cnt in self.etr290.errors.items():
+                        delta = cnt - prev_errors.get(key, 0)
+                        if delta > 0:
+                            self._publish({'type': 'etr290', 'error': key, 'count': cnt,
+                                           'delta': delta, 'offset': int(cols['offset'][0])})
+
+                now = time.monotonic()
+                if now - last_stats >= self.stats_interval:
+                    last_stats = now
+                    self._publish(self._stats_event())
+
+            event = self._finish()
+            self._publish(event)
+            return event
+        finally:
+            # 정상 종료 / 취소 / 예외 모두 구독자에게 종료 신호 전달
+            self._close_subscribers()
+
+    # --- Internal ---
+    async def _read_batches(self, start_index):
+        loop = asyncio.get_running_loop()
+        size = self.chunk_packets * TS_PACKET_SIZE
+        f = await loop.run_in_executor(None, open, self.file_path, "rb")
+        try:
+            await loop.run_in_executor(None, f.seek, start_index * TS_PACKET_SIZE)
+            idx = start_index
+            while True:
+                # 읽기와 디코딩을 함께 Executor에서 수행 (decode_columns도 Chunk당 수 ms라 루프에서 돌리면 블로킹)
+                item = await loop.run_in_executor(None, self._read_decode, f, size, idx)
+                if item is None: break
+                yield item
+                idx += len(item[0]['pid'])
+        finally:
+            f.close()
+
+    @staticmethod
+    def _read_decode(f, size, idx):
+        """Chunk 1개 읽기 + 디코딩 (Executor에서 실행, 파일 끝이면 None)"""
+        buf = f.read(size)
+        n = len(buf) // TS_PACKET_SIZE
+        if n == 0: return None
+        buf = buf[:n * TS_PACKET_SIZE]
+        return decode_columns(buf, idx), buf
+
+    def _analyze_chunk(self, cols, buf):
+        """Chunk 1개 분석 (Executor에서 실행)"""
+        n = len(cols['pid'])
+        self.packet_count += n
+        self.pid_counts += np.bincount(cols['pid'], minlength=NUM_PIDS)
+
+        pcr = cols['pcr'][cols['pcr'] >= 0]
+        if len(pcr):
+            if self._first_pcr is None: self._first_pcr = pcr[0] / 27_000_000.0
+            self._last_pcr = pcr[-1] / 27_000_000.0
+
+        # PSI (PAT/PMT) 파싱: PUSI 패킷 중 PID 0 또는 PMT PID만 기존 파서로 처리
+        for i in np.nonzero(cols['pusi'])[0]:
+            pid = int(cols['pid'][i])
+            packet = buf[i * TS_PACKET_SIZE:(i + 1) * TS_PACKET_SIZE]
+            adapt = int(cols['adapt'][i])
+            if pid == 0:
+                self.parser._parse_pat(packet, adapt)
+            for prog in list(self.parser.programs.values()):
+                if pid == prog['pmt_pid']:
+                    self.parser._parse_pmt(packet, adapt, prog)
+
+        # ETR-290 (묶음 단위 검사)
+        if self.etr290:
+            for prog in self.parser.programs.values():
+                self.etr290.register_pmt_pid(prog['pmt_pid'])
+            self.etr290.process_columns(cols)
+
+    def _stats_event(self):
+        total = self.parser.total_pkts
+        nz = np.nonzero(self.pid_counts)[0]
+        return {
+            'type': 'stats',
+            'packet_count': self.packet_count,
+            'total_pkts': total,
+            'progress': (self.packet_count / total) if total else 0.0,
+            'pid_counts': dict(zip(nz.tolist(), self.pid_counts[nz].tolist())),
+        }
+
+    def _programs_copy(self):
+        return {num: {'pmt_pid': p['pmt_pid'], 'pcr_pid_val': p.get('pcr_pid_val', 0x1FFF), 'pids': dict(p['pids'])}
+                for num, p in self.parser.programs.items()}
+
+    def _finish(self):
+        duration = 0.0
+        if self._first_pcr is not None and self._last_pcr is not None:
+            duration = self._last_pcr - self._first_pcr
+        if self.etr290 and duration > 0:
+            self.etr290.finalize_analysis(duration, self.parser.file_size)
+        self.completed = True
+        event = self._stats_event()
+        event.update({
+            'type': 'completed',
+            'duration': duration,
+            'programs': self._programs_copy(),
+            'etr290': dict(self.etr290.errors) if self.etr290 else {},
+        })
+        return event
+
+    def _publish(self, event):
+        for sub in list(self._subscribers):
+            if sub.queue.full():
+                sub.queue.get_nowait()   # 느린 구독자: 가장 오래된 이벤트 버림
+            sub.queue.put_nowait(event)
+
+    def _close_subscribers(self):
+        self._publish(None)
+
+
+async def _demo(paths):
+    """여러 입력을 하나의 이벤트 루프에서 동시에 분석하는 예제"""
+    async def watch(path):
+        analyzer = AsyncTSAnalyzer(path)
+        sub = analyzer.subscribe()
+        task = asyncio.create_task(analyzer.run())
+        async for ev in sub:
+            if ev['type'] == 'stats':
+                print(f"[{os.path.basename(path)}] {ev['progress'] * 100:5.1f}% ({ev['packet_count']:,} pkts)")
+            elif ev['type'] == 'etr290':
+                print(f"[{os.path.basename(path)}] ETR-290 {ev['error']}: {ev['count']} (@{ev['offset']:,})")
+            elif ev['type'] == 'completed':
+                print(f"[{os.path.basename(path)}] Completed: {ev['packet_count']:,} pkts, {ev['duration']:.2f} sec")
+        await task
+
+    await asyncio.gather(*(watch(p) for p in paths))
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python ts_async.py <file.ts> [file2.ts ...]")
+        sys.exit(1)
+    asyncio.run(_demo(sys.argv[1:]))
@@ -0,0 +1,268 @@
+"""
+[파일 개요]
+헤드리스 배치 분석 CLI (ts_batch) - 여러 TS 파일을 프로세스 풀에서 BScan / ETR-290 / Jitter 분석
+
+[목적 및 필요성]
+분석은 OpenCV GUI에서 BScan 버튼을 눌러야만 실행되고 리포트도 그때만 저장되어,
+매일 밤 수천 개의 녹화 파일을 분석하는 용도로는 쓸 수 없었습니다.
+이 모듈은 GUI와 같은 TSScanner(BScan 리포트: PSI 구조 / PID 통계 / PCR Jitter / PTS / ETR-290)를
+파일마다 별도 프로세스에서 실행합니다.
+    - cv2 / tkinter를 import하지 않음 (디스플레이 없는 서버에서 실행)
+    - 동시 실행 프로세스 수 제한 (-j), 파일별 제한 시간 (--timeout, 초과 시 프로세스 강제 종료)
+    - 파일별 리포트: <output>/<파일 이름>.md / .json (ts_report), 전체 요약: 화면 표 + <output>/batch_summary.csv (처리 시간 / MB/s / 에러 수)
+    - 실패(TS 패킷 0개 / 0x47 Sync 없음 포함) / 시간 초과 파일이 있으면 종료 코드 1
+
+[사용법]
+    python scripts/ts_batch.py /recordings -r -j 8 --timeout 600
+    python scripts/ts_batch.py a.ts b.ts -o out --filter "Scrambled=scram != 0"
+"""
+import argparse
+import csv
+import datetime
+import multiprocessing as mp
+import os
+import sys
+import time
+from multiprocessing.connection import wait
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+TS_EXTENSIONS = ('.ts', '.tp', '.m2ts', '.mts', '.trp')
+DEFAULT_TIMEOUT = 1800              # 파일별 제한 시간 (초)
+POLL_INTERVAL = 0.2                 # 결과 Pipe / 제한 시간 확인 주기 (초)
+
+SUMMARY_FIELDS = ['file', 'status', 'size_mb', 'packets', 'seconds', 'mb_per_s', 'kpkt_per_s',
+                  'cc_errors', 'etr_p1', 'etr_p2', 'report', 'error']
+
+
+def collect_inputs(paths, recursive=False):
+    """파일 / 디렉터리 인자 -> TS 파일 목록 (디렉터리는 확장자로 선별, 중복 제거, 입력 순서 유지)"""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            if recursive:
+                found = [os.path.join(d, f) for d, _, names in os.walk(path) for f in names]
+            else:
+                found = [os.path.join(path, f) for f in os.listdir(path)]
+            files.extend(sorted(f for f in found if os.path.isfile(f) and f.lower().endswith(TS_EXTENSIONS)))
+        else:
+            files.append(path)
+    seen = set()
+    return [f for f in files if not (os.path.abspath(f) in seen or seen.add(os.path.abspath(f)))]
+
+
+def report_names(files):
+    """파일별 리포트 이름 (확장자 제외: <이름>, 같은 이름이 여러 개면 _2, _3 ...)"""
+    used = {}
+    names = []
+    for f in files:
+        stem = os.path.splitext(os.path.basename(f))[0]
+        n = used.get(stem, 0) + 1
+        used[stem] = n
+        names.append(stem if n == 1 else f"{stem}_{n}")
+    return names
+
+
+def analyze_file(path, report_base=None, filter_exprs=None):
+    """
+    파일 1개 분석 (TSScanner를 양보 없이 실행) 후 요약 dict 반환
+    :param report_base: 리포트 저장 경로 (확장자 제외, <report_base>.md / .json - None이면 저장 안 함)
+    """
+    from ts_parser_core import TSParser
+    from ts_scanner import TSScanner
+    from ts_report import save_report
+
+    t0 = time.perf_counter()
+    if not os.path.isfile(path):
+        raise FileNotFoundError(path)
+    parser = TSParser(path)
+    scanner = TSScanner(parser)
+    scanner.filter_exprs = dict(filter_exprs or {})
+    scanner.yield_cpu = False
+    scanner.save_report = False
+    scanner.running = True
+    scanner._scan_loop()
+
+    # TS가 아닌 입력(빈 파일 / 188 bytes 미만 / 0x47 Sync가 하나도 없는 파일)은 실패로 처리
+    etr = scanner.report_model.get('etr290') or {}
+    if parser.packet_count == 0:
+        raise ValueError("no TS packets (file shorter than 188 bytes)")
+    if etr.get('priority1', {}).get('Sync_byte_error', 0) >= parser.packet_count:
+        raise ValueError("no 0x47 sync byte found (not an MPEG2-TS file)")
+
+    report_path = save_report(scanner.report_model, report_base)[0] if report_base else ''
+
+    elapsed = time.perf_counter() - t0
+    return {
+        'packets': parser.packet_count,
+        'bytes': parser.file_size,
+        'seconds': elapsed,
+        'cc_errors': sum(r['cc_errors'] for r in scanner.report_model.get('pids', [])),
+        'etr_p1': sum(etr.get('priority1', {}).values()),
+        'etr_p2': sum(etr.get('priority2', {}).values()),
+        'report': report_path,
+    }
+
+
+def _worker(path, report_base, filter_exprs, conn):
+    """
+    자식 프로세스 진입점: 결과 또는 예외 메시지를 자기 전용 Pipe로 전달
+    (프로세스마다 Pipe를 따로 쓰므로 시간 초과로 terminate해도 다른 작업의 결과 전달에 영향 없음)
+    """
+    try:
+        conn.send(('ok', analyze_file(path, report_base, filter_exprs)))
+    except BaseException as e:
+        conn.send(('failed', {'error': f"{type(e).__name__}: {e}"}))
+    finally:
+        conn.close()
+
+
+def run_batch(files, output_dir, jobs=None, timeout=DEFAULT_TIMEOUT, filter_exprs=None, on_result=None):
+    """
+    파일 목록을 최대 jobs개 프로세스로 동시 분석
+    :param timeout: 파일별 제한 시간 (초, None/0이면 무제한) - 초과 시 프로세스 terminate
+    :param on_result: callback(row) - 파일 1개가 끝날 때마다 호출 (진행 표시용)
+    :return: 입력 순서의 요약 행 목록 (SUMMARY_FIELDS)
+    """
+    jobs = max(1, jobs or os.cpu_count() or 1)
+    os.makedirs(output_dir, exist_ok=True)
+    names = report_names(files)
+    rows = [None] * len(files)
+    running = {}                    # { slot: (Process, 시작 시각, 결과 수신 Connection) }
+    pending = list(range(len(files)))
+    pending.reverse()
+
+    def finish(slot, status, res, started):
+        path = files[slot]
+        size = os.path.getsize(path) if os.path.isfile(path) else 0
+        seconds = res.get('seconds', time.perf_counter() - started)
+        row = {
+            'file': path, 'status': status, 'size_mb': size / 1e6,
+            'packets': res.get('packets', ''), 'seconds': seconds,
+            'mb_per_s': (size / 1e6 / seconds) if status == 'ok' and seconds > 0 else '',
+            'kpkt_per_s': (res['packets'] / 1e3 / seconds) if status == 'ok' and seconds > 0 else '',
+            'cc_errors': res.get('cc_errors', ''), 'etr_p1': res.get('etr_p1', ''), 'etr_p2': res.get('etr_p2', ''),
+            'report': res.get('report', ''), 'error': res.get('error', ''),
+        }
+        rows[slot] = row
+        if on_result: on_result(row)
+
+    try:
+        while pending or running:
+            while pending and len(running) < jobs:
+                slot = pending.pop()
+                recv_conn, send_conn = mp.Pipe(duplex=False)
+                proc = mp.Process(target=_worker, args=(files[slot], os.path.join(output_dir, names[slot]),
+                                                        filter_exprs, send_conn))
+                proc.daemon = True
+                proc.start()
+                send_conn.close()       # 자식만 쓰기 끝을 가지므로, 결과 없이 종료(Crash)하면 recv()가 EOFError
+                running[slot] = (proc, time.perf_counter(), recv_conn)
+
+            # 결과 수신 (결과 또는 종료로 읽기 가능해진 Pipe만, 가장 가까운 제한 시각까지만 대기)
+            by_conn = {conn: slot for slot, (_, _, conn) in running.items()}
+            wait_s = POLL_INTERVAL
+            if timeout:
+                now = time.perf_counter()
+                wait_s = max(0.0, min([wait_s] + [started + timeout - now for _, started, _ in running.values()]))
+            for conn in wait(list(by_conn), timeout=wait_s):
+                slot = by_conn[conn]
+                proc, started, _ = running[slot]
+                if timeout and time.perf_counter() - started > timeout:
+                    continue            # 제한 시각 이후 도착한 결과는 받지 않음 (아래에서 timeout 처리)
+                del running[slot]
+                try:
+                    status, res = conn.recv()
+                except EOFError:
+                    proc.join()
+                    status, res = 'failed', {'error': f"worker exited with code {proc.exitcode}"}
+                conn.close()
+                proc.join()
+                finish(slot, status, res, started)
+
+            # 제한 시간 초과 프로세스 정리 (해당 Pipe는 닫아 버리므로 늦게 도착한 결과는 무시됨)
+            now = time.perf_counter()
+            for slot, (proc, started, conn) in list(running.items()):
+                if timeout and now - started > timeout:
+                    del running[slot]
+                    proc.terminate()
+                    proc.join()
+                    conn.close()
+                    finish(slot, 'timeout', {'seconds': now - started, 'error': f"exceeded {timeout:g}s"}, started)
+    finally:
+        for proc, _, conn in running.values():
+            proc.terminate()
+            proc.join()
+            conn.close()
+    return rows
+
+
+def write_summary_csv(rows, path):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        w = csv.DictWriter(f, fieldnames=SUMMARY_FIELDS)
+        w.writeheader()
+        for row in rows:
+            if row is None: continue
+            w.writerow({k: (f"{v:.3f}" if isinstance(v, float) else v) for k, v in row.items()})
+
+
+def format_row(row):
+    rate = f"{row['mb_per_s']:8.1f} MB/s" if row['mb_per_s'] != '' else " " * 13
+    errs = f"CC {row['cc_errors']}  P1 {row['etr_p1']}  P2 {row['etr_p2']}" if row['status'] == 'ok' else row['error']
+    return f"{row['status']:>7}  {row['seconds']:8.2f}s  {row['size_mb']:9.1f} MB  {rate}  {os.path.basename(row['file'])}  {errs}"
+
+
+def _main(argv=None):
+    ap = argparse.ArgumentParser(description="Headless batch BScan / ETR-290 / PCR jitter analysis of MPEG2-TS files")
+    ap.add_argument("inputs", nargs="+", help="TS files or directories")
+    ap.add_argument("-r", "--recursive", action="store_true", help="search directories recursively")
+    ap.add_argument("-j", "--jobs", type=int, default=None, help="number of worker processes (default: CPU count)")
+    ap.add_argument("-t", "--timeout", type=float, default=DEFAULT_TIMEOUT, help="per-file timeout in seconds (0: none)")
+    ap.add_argument("-o", "--output", help="report directory (default: output/Batch_YYYYmmdd_HHMMSS)")
+    ap.add_argument("--filter", action="append", default=[], metavar="NAME=EXPR",
+                    help="filter expression to count in every report (repeatable)")
+    args = ap.parse_args(argv)
+
+    filter_exprs = {}
+    if args.filter:
+        from ts_filter_expr import parse_named_filters, FilterSyntaxError
+        try:
+            filter_exprs = parse_named_filters(args.filter)
+        except FilterSyntaxError as e:
+            print(f"[Error] {e}")
+            return 2
+
+    files = collect_inputs(args.inputs, args.recursive)
+    if not files:
+        print("[Error] No input files.")
+        return 2
+    output_dir = args.output
+    if not output_dir:
+        root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+        output_dir = os.path.join(root_dir, "output", f"Batch_{timestamp}")
+
+    jobs = max(1, args.jobs or os.cpu_count() or 1)
+    print(f"[Batch] {len(files)} files, {jobs} workers, timeout {args.timeout:g}s -> {output_dir}")
+    t0 = time.perf_counter()
+    done = [0]
+
+    def on_result(row):
+        done[0] += 1
+        print(f"[{done[0]:>{len(str(len(files)))}}/{len(files)}] {format_row(row)}")
+
+    rows = run_batch(files, output_dir, jobs, args.timeout, filter_exprs, on_result)
+    wall = time.perf_counter() - t0
+
+    summary_path = os.path.join(output_dir, "batch_summary.csv")
+    write_summary_csv(rows, summary_path)
+    ok = [r for r in rows if r and r['status'] == 'ok']
+    total_mb = sum(r['size_mb'] for r in ok)
+    print(f"[Batch] {len(ok)}/{len(files)} ok, {len(files) - len(ok)} failed/timeout, "
+          f"{total_mb:,.1f} MB in {wall:.1f}s ({total_mb / wall if wall > 0 else 0:,.1f} MB/s aggregate)")
+    print(f"[Batch] Summary: {summary_path}")
+    return 0 if len(ok) == len(files) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(_main())
@@ -0,0 +1,460 @@
+"""
+[파일 개요]
+성능 벤치마크 (ts_benchmark) - 디코딩 / quick_scan / 전체 스캔 / ETR-290 / Jitter / 리포트 / GUI 프레임 렌더링
+
+[목적 및 필요성]
+TSScanner._scan_loop()나 TSETR290Analyzer를 고쳐도 빨라졌는지 확인할 방법이 없었습니다.
+이 모듈은 ts_stream_generator로 만든 크기 / PID 구성별 고정 Fixture에 대해 단계별로
+    - 소요 시간 (repeat회 중 최소), packets/sec, MB/s
+    - 최대 메모리 (벤치마크마다 새 프로세스(spawn)에서 실행하여 ru_maxrss 측정, 시작 시점 대비 증가분 포함)
+를 측정하여 JSON으로 저장하고, 이전 결과(Baseline)와 단계별로 비교합니다. (느려진 항목이 있으면 종료 코드 1)
+자식 프로세스가 결과 없이 죽거나(Segfault / OOM Kill) --timeout을 넘기면 해당 벤치마크를 ERROR 행으로 기록하고 종료 코드 1
+
+[벤치마크]
+    decode       : read_chunks + decode_columns (파싱 처리량 기준선)
+    quick_scan   : TSParser.quick_scan() (앞 20,000 패킷)
+    scan         : TSScanner._scan_loop() (리포트 생성 제외) 후 같은 프로세스에서
+                   finalize_analysis (ETR-290 간격 검사) / analyze_full (PCR PID별 Jitter 합계) / report (build_report + Markdown + JSON)
+    etr290       : TSETR290Analyzer.process_columns()만 누적 (자체 CC 검사 포함)
+    gui_frame    : AnalyzerGUI.draw_layout() 오프스크린 렌더링 (매 프레임 다음 패킷, 창 없음 - cv2 필요)
+    imports      : 분석 모듈(HEADLESS_MODULES)을 새 인터프리터에서 import하는 시간 (Fixture 무관, 1회)
+                   cv2 / tkinter 등 GUI 모듈을 끌어오면 실패로 표시하고 종료 코드 1 (시작 시간 / 헤드리스 실행 보호)
+
+[사용법]
+    python scripts/ts_benchmark.py run                                  # 기본 Fixture, output/Benchmark_*.json
+    python scripts/ts_benchmark.py run --fixtures small,large --bench scan,etr290 --repeat 5 --baseline old.json
+    python scripts/ts_benchmark.py compare old.json new.json [--threshold 0.1]
+"""
+import argparse
+import copy
+import datetime
+import io
+import json
+import multiprocessing as mp
+import os
+import platform
+import queue
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+try:
+    import resource
+except ImportError:     # Windows
+    resource = None
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from ts_columns import TS_PACKET_SIZE, DEFAULT_CHUNK_PACKETS, decode_columns, read_chunks
+
+BENCH_VERSION = 1
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_THRESHOLD = 0.10            # 비교 시 느려짐으로 판정할 비율 (10%)
+GUI_FRAMES = 200
+GUI_WARMUP_FRAMES = 10
+GUI_INDEX_WAIT = 30.0               # GUI 벤치마크 전 백그라운드 인덱스 / 타임라인 완료 대기 (초)
+DEFAULT_BENCH_TIMEOUT = 3600.0      # 벤치마크 1회(자식 프로세스 1개) 제한 시간 (초)
+CHILD_POLL_INTERVAL = 1.0           # 결과 Queue 대기 중 자식 생존 확인 주기 (초)
+
+# 이름: 크기(MB) + ts_stream_generator 설정 (programs는 default_programs 개수)
+FIXTURES = {
+    'small': {'size_mb': 32, 'programs': 1},
+    'multi': {'size_mb': 128, 'programs': 6, 'vbr': 0.2, 'pcr_jitter_ns': 200},
+    'many_pids': {'size_mb': 64, 'programs': 40, 'sdt_interval': 0},
+    'errors': {'size_mb': 64, 'programs': 2, 'cc_error_rate': 1e-4, 'tei_rate': 1e-4,
+               'sync_loss_rate': 1e-5, 'scrambled_pids': [0x111]},
+    'large': {'size_mb': 1024, 'programs': 4},
+}
+DEFAULT_FIXTURES = ('small', 'multi', 'many_pids', 'errors')
+BENCHES = ('decode', 'quick_scan', 'scan', 'etr290', 'gui_frame', 'imports')
+NO_FIXTURE_BENCHES = ('imports',)   # Fixture 없이 1회만 실행 (결과 행 fixture = '-')
+
+# 헤드리스(배치 / 서버) 분석 경로: stdlib / NumPy만 import해야 하는 모듈
+HEADLESS_MODULES = ('ts_parser_core', 'ts_columns', 'ts_scanner', 'ts_scan_process', 'ts_etr290_analyzer',
+                    'zitter_measurement', 'ts_report', 'ts_batch', 'ts_column_store', 'ts_stream_generator',
+                    'ts_timeline', 'ts_profiler')
+GUI_MODULES = ('cv2', 'tkinter', 'matplotlib', 'PIL')
+
+
+# --- Fixtures ---
+def ensure_fixture(name, fixture_dir):
+    """Fixture TS 파일 경로 (설정이 같은 파일이 있으면 재사용, 없거나 바뀌었으면 생성)"""
+    from ts_stream_generator import TSStreamGenerator, default_programs
+
+    spec = FIXTURES[name]
+    path = os.path.join(fixture_dir, f"bench_{name}.ts")
+    spec_path = path + ".json"
+    packets = spec['size_mb'] * (1 << 20) // TS_PACKET_SIZE
+    if os.path.isfile(path) and os.path.getsize(path) == packets * TS_PACKET_SIZE and os.path.isfile(spec_path):
+        with open(spec_path, encoding="utf-8") as f:
+            if json.load(f).get('spec') == spec:
+                return path
+
+    os.makedirs(fixture_dir, exist_ok=True)
+    config = {k: v for k, v in spec.items() if k not in ('size_mb', 'programs')}
+    config['programs'] = default_programs(spec['programs'])
+    t0 = time.perf_counter()
+    stats = TSStreamGenerator(config).write(path, packets)
+    print(f"[Fixture] {name}: {spec['size_mb']} MB generated in {time.perf_counter() - t0:.1f}s -> {path}")
+    with open(spec_path, "w", encoding="utf-8") as f:
+        json.dump({'spec': spec, 'truth': dict(stats, pid_counts=len(stats['pid_counts']))}, f, indent=1)
+    return path
+
+
+# --- Benchmarks (자식 프로세스에서 실행, 결과 행 목록 반환) ---
+def _row(bench, seconds, packets=None, nbytes=None, **extra):
+    return {'bench': bench, 'seconds': seconds, 'packets': packets, 'bytes': nbytes,
+            'pkt_per_s': packets / seconds if packets and seconds > 0 else None,
+            'mb_per_s': nbytes / 1e6 / seconds if nbytes and seconds > 0 else None,
+            'extra': extra}
+
+
+def bench_decode(path):
+    t0 = time.perf_counter()
+    n = 0
+    for start_idx, buf in read_chunks(path, 0, DEFAULT_CHUNK_PACKETS):
+        n += len(decode_columns(buf, start_idx)['pid'])
+    return [_row('decode', time.perf_counter() - t0, n, n * TS_PACKET_SIZE)]
+
+
+def bench_quick_scan(path):
+    from ts_parser_core import TSParser
+    parser = TSParser(path)
+    limit = 20000
+    t0 = time.perf_counter()
+    parser.quick_scan(limit=limit)
+    n = min(limit, parser.total_pkts)
+    return [_row('quick_scan', time.perf_counter() - t0, n, n * TS_PACKET_SIZE, programs=len(parser.programs))]
+
+
+def bench_scan(path):
+    from ts_parser_core import TSParser
+    from ts_scanner import TSScanner
+    from ts_report import build_report, render_markdown, write_json
+    from zitter_measurement import TSJitterAnalyzer
+
+    parser = TSParser(path)
+    scanner = TSScanner(parser)
+    scanner.save_report = False
+    scanner.yield_cpu = False
+    scanner._generate_report = lambda: []       # 리포트는 아래에서 따로 측정
+    scanner.running = True
+    t0 = time.perf_counter()
+    scanner._scan_loop()
+    t_scan = time.perf_counter() - t0
+    n, size = parser.packet_count, parser.file_size
+    rows = [_row('scan', t_scan, n, size, pids=len(parser.pid_counts))]
+
+    # finalize_analysis (리포트가 다시 호출하므로 복사본으로 측정)
+    stats = scanner.stats
+    pcr_ends = [(st['pcr_list'][0][1], st['pcr_list'][-1][1])
+                for st in (stats.get(pid) for pid in stats.pcr_pids()) if st['pcr_list']]
+    duration = (max(e for _, e in pcr_ends) - min(s for s, _ in pcr_ends)) if pcr_ends else 0.0
+    etr = copy.deepcopy(scanner.etr290)
+    t0 = time.perf_counter()
+    if etr and duration > 0:
+        etr.finalize_analysis(duration, size)
+    rows.append(_row('finalize_analysis', time.perf_counter() - t0))
+
+    # analyze_full (PCR PID별 합계)
+    t_jitter, samples = 0.0, 0
+    for pid in stats.pcr_pids():
+        pcr_list = stats.get(pid)['pcr_list']
+        if len(pcr_list) < 2: continue
+        an = TSJitterAnalyzer()
+        an.raw_pcr_data = pcr_list
+        t0 = time.perf_counter()
+        an.analyze_full()
+        t_jitter += time.perf_counter() - t0
+        samples += len(pcr_list)
+    rows.append(_row('analyze_full', t_jitter, pcr_samples=samples))
+
+    # 리포트 (모델 + Markdown + JSON 직렬화)
+    t0 = time.perf_counter()
+    model = build_report(scanner)
+    render_markdown(model)
+    write_json(model, io.StringIO())
+    rows.append(_row('report', time.perf_counter() - t0))
+    return rows
+
+
+def bench_etr290(path):
+    from ts_etr290_analyzer import TSETR290Analyzer
+    etr = TSETR290Analyzer()
+    t = 0.0
+    n = 0
+    for start_idx, buf in read_chunks(path, 0, DEFAULT_CHUNK_PACKETS):
+        cols = decode_columns(buf, start_idx)
+        t0 = time.perf_counter()
+        etr.process_columns(cols)
+        t += time.perf_counter() - t0
+        n += len(cols['pid'])
+    return [_row('etr290', t, n, n * TS_PACKET_SIZE, cc_errors=etr.errors['Continuity_count_error'])]
+
+
+def bench_gui_frame(path, frames=GUI_FRAMES):
+    import ts_analyzer_gui as gui_mod
+
+    # recent_files.json이 작업 디렉터리에 기록되므로 임시 디렉터리에서 생성
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory(prefix="ts_bench_") as tmp:
+        os.chdir(tmp)
+        try:
+            gui = gui_mod.AnalyzerGUI(path)
+        finally:
+            os.chdir(cwd)
+    gui.parser.quick_scan(limit=20000)
+    progs = sorted(p for p in gui.parser.programs if p != 0)
+    if progs:
+        gui.selected_program = progs[0]
+        gui.selected_pid = gui.parser.programs[progs[0]]['pmt_pid']
+        gui.active_filters['PMT'] = True
+    gui._start_packet_index()
+    deadline = time.perf_counter() + GUI_INDEX_WAIT
+    while time.perf_counter() < deadline and not (gui.pkt_index.complete and gui.timeline.complete):
+        time.sleep(0.05)
+
+    img = np.zeros((gui_mod.WINDOW_H, gui_mod.WINDOW_W, 3), dtype=np.uint8)
+    times = []
+    try:
+        for i in range(GUI_WARMUP_FRAMES + frames):
+            t0 = time.perf_counter()
+            gui.current_pkt_idx = i
+            gui.update_packet_view()
+            gui.ui_regions = []
+            gui.snap = gui.scanner.get_snapshot()
+            gui.draw_layout(img)
+            times.append(time.perf_counter() - t0)
+    finally:
+        gui._close_scanner()
+    times = np.array(times[GUI_WARMUP_FRAMES:])
+    return [_row('gui_frame', float(times.mean()), frames=frames,
+                 fps=float(1.0 / times.mean()), p95_ms=float(np.percentile(times, 95) * 1000))]
+
+
+def bench_imports(path=None):
+    """모듈별로 새 인터프리터를 띄워 import 시간 / 함께 로드된 GUI 모듈 측정 (path 무시)"""
+    code = ("import sys, time, json; sys.path.insert(0, sys.argv[1]); t = time.perf_counter(); "
+            "__import__(sys.argv[2]); dt = time.perf_counter() - t; "
+            "print(json.dumps([dt, [m for m in sys.argv[3:] if m in sys.modules]]))")
+    scripts_dir = os.path.dirname(os.path.abspath(__file__))
+    rows = []
+    for mod in HEADLESS_MODULES:
+        out = subprocess.run([sys.executable, "-c", code, scripts_dir, mod, *GUI_MODULES],
+                             capture_output=True, text=True, timeout=60)
+        if out.returncode != 0:
+            raise RuntimeError(f"import {mod} failed: {out.stderr.strip().splitlines()[-1:]}")
+        seconds, gui = json.loads(out.stdout.strip().splitlines()[-1])
+        row = _row(f"import_{mod}", seconds, gui_modules=",".join(gui) or "-")
+        row['peak_rss_mb'] = row['rss_growth_mb'] = None
+        rows.append(row)
+    return rows
+
+
+def headless_violations(results):
+    """imports 결과 중 GUI 모듈을 끌어온 행 -> 메시지 목록"""
+    return [f"{r['bench'][len('import_'):]} imports {r['extra']['gui_modules']}" for r in results
+            if r['bench'].startswith('import_') and not r.get('error') and r['extra'].get('gui_modules', '-') != '-']
+
+
+def _peak_rss_mb():
+    if resource is None: return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / (1 << 20) if sys.platform == 'darwin' else rss / 1024      # macOS: bytes, Linux: KB
+
+
+def _child(bench, path, result_queue):
+    """자식 프로세스 진입점: 벤치마크 1개 실행 후 (결과 행 목록, 에러) 전달"""
+    try:
+        base = _peak_rss_mb()
+        rows = globals()['bench_' + bench](path)
+        peak = _peak_rss_mb()
+        for row in rows:
+            if 'peak_rss_mb' in row: continue       # 다른 프로세스에서 측정한 행 (imports)
+            row['peak_rss_mb'] = peak
+            row['rss_growth_mb'] = (peak - base) if peak is not None else None
+        result_queue.put((rows, None))
+    except BaseException as e:
+        result_queue.put((None, f"{type(e).__name__}: {e}"))
+
+
+def _wait_child(proc, q, timeout):
+    """
+    자식의 (결과 행 목록, 에러)를 기다림
+    자식이 결과 없이 죽거나(Segfault / OOM Kill) timeout을 넘기면 무한 대기하지 않고 에러로 반환
+    """
+    deadline = time.perf_counter() + timeout if timeout else None
+    while True:
+        try:
+            return q.get(timeout=CHILD_POLL_INTERVAL)
+        except queue.Empty:
+            pass
+        if not proc.is_alive():
+            try:
+                return q.get(timeout=CHILD_POLL_INTERVAL)   # 결과를 넣고 바로 종료한 경우
+            except queue.Empty:
+                proc.join()
+                return None, f"benchmark process exited with code {proc.exitcode}"
+        if deadline is not None and time.perf_counter() > deadline:
+            proc.terminate()
+            proc.join()
+            return None, f"benchmark process exceeded {timeout:g}s"
+
+
+def run_bench(bench, path, repeat=1, timeout=DEFAULT_BENCH_TIMEOUT):
+    """
+    새 프로세스에서 repeat회 실행, 단계별 최소 시간 행 반환 (실패 시 에러 행)
+    :param timeout: 1회 제한 시간 (초, None/0이면 무제한)
+    """
+    ctx = mp.get_context('spawn')
+    best = {}
+    for _ in range(repeat):
+        q = ctx.Queue()
+        proc = ctx.Process(target=_child, args=(bench, path, q))
+        proc.start()
+        rows, error = _wait_child(proc, q, timeout)
+        proc.join()
+        if error:
+            return [{'bench': bench, 'error': error}]
+        for row in rows:
+            if row['bench'] not in best or row['seconds'] < best[row['bench']]['seconds']:
+                best[row['bench']] = row
+    return list(best.values())
+
+
+def _environment():
+    try:
+        rev = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT_DIR, capture_output=True,
+                             text=True, timeout=5).stdout.strip() or None
+    except Exception:
+        rev = None
+    return {'python': platform.python_version(), 'numpy': np.__version__, 'platform': platform.platform(),
+            'cpu_count': os.cpu_count(), 'git': rev}
+
+
+# --- Report / Compare ---
+def format_rows(rows):
+    lines = [f"{'fixture':<10} {'bench':<26} {'seconds':>9} {'Mpkt/s':>8} {'MB/s':>9} {'peak MB':>8}  extra"]
+    for r in rows:
+        if r.get('error'):
+            lines.append(f"{r['fixture']:<10} {r['bench']:<26} {'ERROR':>9}  {r['error']}")
+            continue
+        kpps = f"{r['pkt_per_s'] / 1e6:8.2f}" if r['pkt_per_s'] else f"{'-':>8}"
+        mbps = f"{r['mb_per_s']:9.1f}" if r['mb_per_s'] else f"{'-':>9}"
+        peak = f"{r['peak_rss_mb']:8.0f}" if r.get('peak_rss_mb') is not None else f"{'-':>8}"
+        extra = ", ".join(f"{k}={v:.1f}" if isinstance(v, float) else f"{k}={v}" for k, v in r['extra'].items())
+        lines.append(f"{r['fixture']:<10} {r['bench']:<26} {r['seconds']:9.4f} {kpps} {mbps} {peak}  {extra}")
+    return lines
+
+
+def compare(old, new, threshold=DEFAULT_THRESHOLD):
+    """
+    (fixture, bench)별 시간 비교
+    :return: (출력 줄 목록, 느려진 항목 수)
+    """
+    old_rows = {(r['fixture'], r['bench']): r for r in old['results'] if not r.get('error')}
+    lines = [f"{'fixture':<10} {'bench':<26} {'old s':>9} {'new s':>9} {'speedup':>8} {'old MB':>7} {'new MB':>7}"]
+    regressions = 0
+    for r in new['results']:
+        o = old_rows.get((r['fixture'], r['bench']))
+        if o is None or r.get('error'):
+            continue
+        speedup = o['seconds'] / r['seconds'] if r['seconds'] > 0 else float('inf')
+        mark = ""
+        if r['seconds'] > o['seconds'] * (1 + threshold):
+            mark = "  << slower"
+            regressions += 1
+        elif o['seconds'] > r['seconds'] * (1 + threshold):
+            mark = "  faster"
+        mem = lambda x: f"{x['peak_rss_mb']:7.0f}" if x.get('peak_rss_mb') is not None else f"{'-':>7}"
+        lines.append(f"{r['fixture']:<10} {r['bench']:<26} {o['seconds']:9.4f} {r['seconds']:9.4f} "
+                     f"{speedup:7.2f}x {mem(o)} {mem(r)}{mark}")
+    lines.append(f"[Compare] {old.get('environment', {}).get('git')} -> {new.get('environment', {}).get('git')}: "
+                 f"{regressions} slower than {threshold * 100:.0f}% threshold")
+    violations = headless_violations(new['results'])
+    lines.extend(f"[Imports] {v}" for v in violations)
+    return lines, regressions + len(violations)
+
+
+def _main(argv=None):
+    ap = argparse.ArgumentParser(description="Benchmark MPEG2-TS parsing / scanning / ETR-290 / jitter / GUI rendering")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    p = sub.add_parser("run", help="run benchmarks and save JSON")
+    p.add_argument("--fixtures", default=",".join(DEFAULT_FIXTURES), help=f"comma list of {', '.join(FIXTURES)}")
+    p.add_argument("--bench", default=",".join(BENCHES), help=f"comma list of {', '.join(BENCHES)}")
+    p.add_argument("--repeat", type=int, default=3, help="runs per benchmark (best time is kept)")
+    p.add_argument("--timeout", type=float, default=DEFAULT_BENCH_TIMEOUT, help="per-run timeout in seconds (0: none)")
+    p.add_argument("--fixture-dir", default=os.path.join(ROOT_DIR, "output", "bench_fixtures"))
+    p.add_argument("-o", "--output", help="result JSON (default: output/Benchmark_YYYYmmdd_HHMMSS.json)")
+    p.add_argument("--baseline", help="previous result JSON to compare against")
+    p.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    p = sub.add_parser("compare", help="compare two result JSON files")
+    p.add_argument("old")
+    p.add_argument("new")
+    p.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    args = ap.parse_args(argv)
+
+    if args.cmd == "compare":
+        with open(args.old, encoding="utf-8") as f: old = json.load(f)
+        with open(args.new, encoding="utf-8") as f: new = json.load(f)
+        lines, regressions = compare(old, new, args.threshold)
+        print("\n".join(lines))
+        return 1 if regressions else 0
+
+    fixtures = [s.strip() for s in args.fixtures.split(",") if s.strip()]
+    benches = [s.strip() for s in args.bench.split(",") if s.strip()]
+    unknown = [f for f in fixtures if f not in FIXTURES] + [b for b in benches if b not in BENCHES]
+    if unknown:
+        ap.error(f"unknown fixture/bench: {', '.join(unknown)}")
+
+    results = []
+    for name in fixtures if any(b not in NO_FIXTURE_BENCHES for b in benches) else []:
+        path = ensure_fixture(name, args.fixture_dir)
+        for bench in benches:
+            if bench in NO_FIXTURE_BENCHES: continue
+            rows = run_bench(bench, path, args.repeat, args.timeout)
+            for row in rows:
+                row['fixture'] = name
+                print(format_rows([row])[1])
+            results.extend(rows)
+    for bench in benches:
+        if bench not in NO_FIXTURE_BENCHES: continue
+        rows = run_bench(bench, None, args.repeat, args.timeout)
+        for row in rows:
+            row['fixture'] = '-'
+            print(format_rows([row])[1])
+        results.extend(rows)
+
+    out = {
+        'version': BENCH_VERSION,
+        'date': datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        'environment': _environment(),
+        'repeat': args.repeat,
+        'fixtures': {name: FIXTURES[name] for name in fixtures},
+        'results': results,
+    }
+    path = args.output
+    if not path:
+        timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+        path = os.path.join(ROOT_DIR, "output", f"Benchmark_{timestamp}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(out, f, indent=1)
+    print(f"[Benchmark] Results: {path}")
+    failed = [r for r in results if r.get('error')]
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            lines, regressions = compare(json.load(f), out, args.threshold)
+        print("\n".join(lines))
+        return 1 if regressions or failed else 0
+    violations = headless_violations(results)
+    for v in violations:
+        print(f"[Imports] {v}")
+    return 1 if violations or failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(_main())
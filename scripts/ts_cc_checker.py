@@ -0,0 +1,93 @@
+"""
+[파일 개요]
+Continuity Counter 검사기 (ContinuityChecker)
+
+[목적 및 필요성]
+CC 검사가 TSScanner와 TSETR290Analyzer에 각각 순수 Python으로 (조금씩 다른 규칙으로) 구현되어
+패킷마다 두 번 수행되고 있었습니다. 이 모듈은 하나의 규칙을 decode_columns() 묶음 단위로 벡터화하여 검사하고,
+PID별 상태(마지막 CC, 연속 중복 횟수)를 Chunk 사이에 이어 받습니다. 스캐너 통계와 ETR-290이 같은 결과를 공유합니다.
+
+[검사 규칙] (ISO/IEC 13818-1 2.4.3.3, ETR 290 1.4)
+    - Null 패킷(0x1FFF)과 Sync Byte가 깨진 패킷은 검사하지 않음
+    - Payload가 있는 패킷만 CC가 증가 (Adaptation Field Only 패킷은 무시)
+    - 같은 CC의 반복(Duplicate)은 1회까지 허용, 2회 이상 연속 반복은 에러
+    - discontinuity_indicator=1 패킷은 에러로 보지 않고 해당 패킷부터 새로 시작
+"""
+import numpy as np
+
+from ts_columns import NUM_PIDS, NULL_PID
+
+NO_CC = -1
+MAX_ERROR_EVENTS = 100000       # 보관할 에러 위치(offset) 최대 개수
+
+
+class ContinuityChecker:
+    """PID별 CC 상태를 유지하며 Chunk 단위로 CC 에러를 검출하는 클래스"""
+    def __init__(self, max_events=MAX_ERROR_EVENTS):
+        self.last_cc = np.full(NUM_PIDS, NO_CC, dtype=np.int16)    # 마지막 Payload 패킷의 CC (-1: 기준 없음)
+        self.dup_run = np.zeros(NUM_PIDS, dtype=np.int32)           # 현재 연속 중복 횟수
+        self.errors = np.zeros(NUM_PIDS, dtype=np.int64)            # PID별 에러 수
+        self.max_events = max_events
+        self.events = []                                            # [(offset, pid), ...] (최대 max_events개)
+
+    @property
+    def total_errors(self):
+        return int(self.errors.sum())
+
+    def check(self, cols):
+        """
+        패킷 묶음 1개를 검사합니다.
+        :param cols: ts_columns.decode_columns() 결과
+        :return: (err_pid, err_offset) - 에러 패킷의 PID / 바이트 오프셋 배열 (파일 순서)
+        """
+        pid = cols['pid'].astype(np.int64)
+        payload = (cols['adapt'] & 0x1) != 0
+        disc = cols['discontinuity']
+        sel = np.nonzero(cols['sync'] & (pid != NULL_PID) & (payload | disc))[0]
+        if len(sel) == 0:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+
+        # PID별로 묶되 같은 PID 안에서는 파일 순서 유지
+        order = sel[np.argsort(pid[sel], kind='stable')]
+        p = pid[order]
+        cc = cols['cc'][order].astype(np.int16)
+        has_pl = payload[order]
+        is_disc = disc[order]
+
+        first = np.ones(len(p), dtype=bool)
+        first[1:] = p[1:] != p[:-1]
+        tail = np.ones(len(p), dtype=bool)
+        tail[:-1] = first[1:]
+
+        # 각 패킷 처리 후의 기준 CC: Payload 있으면 자신의 CC, Adaptation Only(Discontinuity)면 기준 초기화
+        state = np.where(has_pl, cc, NO_CC).astype(np.int16)
+        prev = np.empty_like(state)
+        prev[1:] = state[:-1]
+        prev[first] = self.last_cc[p[first]]
+
+        checked = has_pl & ~is_disc & (prev != NO_CC)
+        dup = checked & (cc == prev)
+        jump = checked & ~dup & (cc != ((prev + 1) & 0xF))
+
+        # 연속 중복 횟수: 중복이 아닌 패킷에서 0으로 초기화, PID 첫 패킷은 이전 Chunk의 값을 이어받음
+        idx = np.arange(len(p))
+        seg_start = ~dup | first
+        starts = np.nonzero(seg_start)[0]
+        seg_id = np.cumsum(seg_start) - 1
+        start_run = np.where(dup[starts], self.dup_run[p[starts]] + 1, 0)
+        run = idx - starts[seg_id] + start_run[seg_id]
+
+        err = jump | (dup & (run >= 2))
+
+        self.last_cc[p[tail]] = state[tail]
+        self.dup_run[p[tail]] = run[tail]
+
+        err_idx = np.sort(order[err])
+        err_pid = pid[err_idx]
+        err_off = cols['offset'][err_idx]
+        if len(err_idx):
+            self.errors += np.bincount(err_pid, minlength=NUM_PIDS)
+            room = self.max_events - len(self.events)
+            if room > 0:
+                self.events.extend(zip(err_off[:room].tolist(), err_pid[:room].tolist()))
+        return err_pid, err_off
@@ -0,0 +1,307 @@
+"""
+[파일 개요]
+패킷 컬럼 저장소 (ts_column_store) - decode_columns() 결과를 NumPy 컬럼 파일(.npy 디렉터리 / .npz)로 내보내기 / 읽기
+
+[목적 및 필요성]
+같은 녹화 파일을 여러 번 조사할 때마다 TS 전체를 다시 읽고 디코딩해야 했습니다.
+이 모듈은 패킷별 필드(offset, PID, 플래그, CC, Adaptation 길이, PCR, PTS, DTS, stream_id 등)를
+한 번의 순차 읽기로 미리 크기를 잡은 .npy 파일(open_memmap)에 Chunk 단위로 바로 기록하고,
+읽을 때는 memmap으로 열어 decode_columns()와 같은 형태의 컬럼 묶음을 돌려줍니다.
+    - 스캐너(TSScanner.column_store)가 컬럼 묶음 + 저장된 PSI 패킷으로 BScan 리포트 / ETR-290 / PCR Jitter를 그대로 재실행
+    - pcr(pid)로 Jitter 분석용 PCR 목록을 TS 재디코딩 없이 추출
+    - Pandas / Jupyter 등에서 np.load(..., mmap_mode='r')로 직접 사용 가능
+
+[저장 형식] (STORE_VERSION = 1)
+    <출력>/                 디렉터리: 필드별 <이름>.npy (memmap 가능) + meta.json
+    <출력>.npz              같은 파일들을 압축 없이 묶은 보관 / 전송용 (읽을 때 전체를 메모리로 로드)
+    flags                   sync, tei, pusi, prio, discontinuity, random_access, pcr_flag, pes_start (FLAG_BITS 순서의 비트)
+    psi_index / psi_packets PES가 아닌 PUSI 패킷(PAT / PMT 등)의 패킷 인덱스와 원본 188바이트 (PSI 재파싱용)
+
+[사용법]
+    python scripts/ts_column_store.py export in.ts -o in.cols          # 또는 -o in.npz
+    python scripts/ts_column_store.py info in.cols
+    python scripts/ts_column_store.py report in.cols -o report         # report.md / report.json
+    python scripts/ts_column_store.py jitter in.cols [--pid 0x100]
+
+    store = ColumnStore("in.cols")
+    cols = store.columns(0, 100000)                 # decode_columns()와 같은 키
+    offs, secs = store.pcr(0x100)
+"""
+import argparse
+import json
+import os
+import shutil
+import sys
+import time
+import zipfile
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from ts_columns import TS_PACKET_SIZE, packets_view, decode_columns, read_chunks
+
+STORE_VERSION = 1
+EXPORT_CHUNK_PACKETS = 65536        # 내보내기 Chunk (약 12MB 읽기 단위)
+PCR_SCAN_PACKETS = 1 << 20          # pcr() 검색 단위 (memmap을 나눠 읽어 메모리 사용 제한)
+META_NAME = "meta.json"
+
+FLAG_BITS = ('sync', 'tei', 'pusi', 'prio', 'discontinuity', 'random_access', 'pcr_flag', 'pes_start')
+COLUMN_FIELDS = {                   # 필드: dtype (flags 외에는 decode_columns() 값 그대로)
+    'offset': np.int64,
+    'pid': np.uint16,
+    'scram': np.uint8,
+    'adapt': np.uint8,
+    'cc': np.uint8,
+    'af_len': np.uint8,
+    'payload_off': np.int16,
+    'pcr': np.int64,
+    'pts': np.int64,
+    'dts': np.int64,
+    'stream_id': np.uint8,
+    'pes_len': np.uint16,
+    'pes_flags': np.uint8,
+}
+
+
+def pack_flags(cols):
+    """decode_columns()의 bool 컬럼 -> uint8 비트 필드 (FLAG_BITS 순서)"""
+    flags = np.zeros(len(cols['pid']), dtype=np.uint8)
+    for bit, name in enumerate(FLAG_BITS):
+        flags |= cols[name].view(np.uint8) << np.uint8(bit)
+    return flags
+
+
+def export_columns(ts_path, out_path, chunk_packets=EXPORT_CHUNK_PACKETS, progress=None, stop_flag=None):
+    """
+    TS 파일을 한 번 순차로 읽어 컬럼 파일로 저장
+    :param out_path: 디렉터리 경로 또는 '.npz' 파일 경로
+    :param progress: callback(처리 패킷 수, 전체 패킷 수)
+    :return: meta dict (중단되면 meta['complete'] = False, 그때까지의 패킷만 유효)
+    """
+    is_npz = out_path.lower().endswith('.npz')
+    col_dir = out_path + ".tmp" if is_npz else out_path
+    os.makedirs(col_dir, exist_ok=True)
+
+    file_size = os.path.getsize(ts_path)
+    total = file_size // TS_PACKET_SIZE
+    shape = (total,)
+    arrays = {'flags': np.lib.format.open_memmap(os.path.join(col_dir, "flags.npy"), mode='w+', dtype=np.uint8, shape=shape)}
+    for name, dtype in COLUMN_FIELDS.items():
+        arrays[name] = np.lib.format.open_memmap(os.path.join(col_dir, name + ".npy"), mode='w+', dtype=dtype, shape=shape)
+
+    psi_index, psi_packets = [], []
+    count = 0
+    t0 = time.perf_counter()
+    for start_idx, buf in read_chunks(ts_path, 0, chunk_packets, stop_flag):
+        n = min(len(buf) // TS_PACKET_SIZE, total - start_idx)   # 읽는 중 파일이 커진 경우 시작 시점 크기까지만
+        if n <= 0: break
+        cols = decode_columns(buf[:n * TS_PACKET_SIZE], start_idx)
+        sl = slice(start_idx, start_idx + n)
+        arrays['flags'][sl] = pack_flags(cols)
+        for name in COLUMN_FIELDS:
+            arrays[name][sl] = cols[name]
+
+        rows = np.nonzero(cols['pusi'] & cols['sync'] & ~cols['pes_start'])[0]
+        if len(rows):
+            psi_index.append(rows + start_idx)
+            psi_packets.append(packets_view(buf)[rows])
+        count = start_idx + n
+        if progress: progress(count, total)
+
+    for arr in arrays.values():
+        arr.flush()
+    del arrays
+    np.save(os.path.join(col_dir, "psi_index.npy"),
+            np.concatenate(psi_index) if psi_index else np.zeros(0, dtype=np.int64))
+    np.save(os.path.join(col_dir, "psi_packets.npy"),
+            np.concatenate(psi_packets) if psi_packets else np.zeros((0, TS_PACKET_SIZE), dtype=np.uint8))
+
+    meta = {
+        'version': STORE_VERSION,
+        'source': os.path.abspath(ts_path),
+        'file_size': file_size,
+        'packets': count,
+        'complete': count == total,
+        'fields': ['flags'] + list(COLUMN_FIELDS),
+        'flag_bits': list(FLAG_BITS),
+        'export_seconds': time.perf_counter() - t0,
+    }
+    with open(os.path.join(col_dir, META_NAME), "w", encoding="utf-8") as f:
+        json.dump(meta, f, indent=1)
+
+    if is_npz:
+        # .npy 파일을 그대로 묶기 (ZIP_STORED: np.load로 읽을 수 있는 비압축 npz)
+        with zipfile.ZipFile(out_path, "w", zipfile.ZIP_STORED, allowZip64=True) as zf:
+            for name in sorted(os.listdir(col_dir)):
+                zf.write(os.path.join(col_dir, name), name)
+        shutil.rmtree(col_dir)
+    return meta
+
+
+class ColumnStore:
+    """
+    export_columns() 결과 읽기 (디렉터리는 memmap, .npz는 전체 로드)
+    """
+    def __init__(self, path):
+        self.path = path
+        if os.path.isdir(path):
+            with open(os.path.join(path, META_NAME), encoding="utf-8") as f:
+                self.meta = json.load(f)
+            load = lambda name: np.load(os.path.join(path, name + ".npy"), mmap_mode='r')
+        else:
+            npz = np.load(path)
+            self.meta = json.loads(npz[META_NAME])
+            load = lambda name: npz[name]
+        if self.meta.get('version') != STORE_VERSION:
+            raise ValueError(f"unsupported column store version: {self.meta.get('version')}")
+
+        self.packets = self.meta['packets']
+        self.arrays = {name: load(name)[:self.packets] for name in self.meta['fields']}
+        self.psi_index = load('psi_index')
+        self.psi_packets = load('psi_packets')
+
+    @property
+    def source(self):
+        return self.meta['source']
+
+    @property
+    def file_size(self):
+        return self.meta['file_size']
+
+    def columns(self, start=0, stop=None):
+        """[start, stop) 패킷의 컬럼 묶음 (decode_columns()와 같은 키, 읽기 전용 배열)"""
+        stop = self.packets if stop is None else min(stop, self.packets)
+        a = self.arrays
+        flags = np.asarray(a['flags'][start:stop])
+        cols = {name: (flags & np.uint8(1 << bit)) != 0 for bit, name in enumerate(FLAG_BITS)}
+        for name in COLUMN_FIELDS:
+            cols[name] = np.asarray(a[name][start:stop])
+        cols['index'] = cols['offset'] // TS_PACKET_SIZE
+        return cols
+
+    def psi(self, start, stop):
+        """[start, stop) 구간의 PSI 후보 [(start 기준 행, 188바이트 패킷)]"""
+        lo, hi = np.searchsorted(self.psi_index, [start, stop])
+        return [(int(i) - start, self.psi_packets[k].tobytes()) for k, i in zip(range(lo, hi), self.psi_index[lo:hi])]
+
+    def iter_chunks(self, chunk_packets=EXPORT_CHUNK_PACKETS, stop_flag=None):
+        """(컬럼 묶음, PSI 후보) 순차 반환 - TSScanner.column_store용"""
+        for start in range(0, self.packets, chunk_packets):
+            if stop_flag and stop_flag(): break
+            stop = min(start + chunk_packets, self.packets)
+            yield self.columns(start, stop), self.psi(start, stop)
+
+    def pcr_pids(self):
+        """PCR이 있는 PID 목록"""
+        found = set()
+        for start in range(0, self.packets, PCR_SCAN_PACKETS):
+            sl = slice(start, start + PCR_SCAN_PACKETS)
+            has = np.asarray(self.arrays['pcr'][sl]) >= 0
+            found.update(np.unique(np.asarray(self.arrays['pid'][sl])[has]).tolist())
+        return sorted(found)
+
+    def pcr(self, pid):
+        """
+        PID의 PCR 목록 (ts_jitter_view.collect_pcr()와 같은 형식)
+        :return: (byte offset 배열, PCR 초 배열)
+        """
+        offs, secs = [], []
+        for start in range(0, self.packets, PCR_SCAN_PACKETS):
+            sl = slice(start, start + PCR_SCAN_PACKETS)
+            pcr = np.asarray(self.arrays['pcr'][sl])
+            sel = np.nonzero((np.asarray(self.arrays['pid'][sl]) == pid) & (pcr >= 0))[0]
+            if len(sel):
+                offs.append(np.asarray(self.arrays['offset'][sl])[sel].astype(np.float64))
+                secs.append(pcr[sel] / 27_000_000.0)
+        if not offs:
+            return np.zeros(0), np.zeros(0)
+        return np.concatenate(offs), np.concatenate(secs)
+
+
+def scan_store(store, filter_exprs=None):
+    """
+    컬럼 저장소로 BScan 전체(PID 통계 / PSI / ETR-290 / PCR Jitter) 실행 - TS 파일이 없어도 동작
+    :return: 완료된 TSScanner (report_model / report 사용)
+    """
+    from ts_parser_core import TSParser
+    from ts_scanner import TSScanner
+
+    parser = TSParser(store.source)
+    parser.file_size = store.file_size
+    parser.total_pkts = store.packets
+    scanner = TSScanner(parser)
+    scanner.column_store = store
+    scanner.chunk_packets = EXPORT_CHUNK_PACKETS
+    scanner.filter_exprs = dict(filter_exprs or {})
+    scanner.yield_cpu = False
+    scanner.save_report = False
+    scanner.running = True
+    scanner._scan_loop()
+    return scanner
+
+
+def _main(argv=None):
+    ap = argparse.ArgumentParser(description="Export MPEG2-TS packets to NumPy column files and analyze them offline")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    p = sub.add_parser("export", help="decode a TS file into column files")
+    p.add_argument("input")
+    p.add_argument("-o", "--output", help="output directory or .npz (default: <input>.cols)")
+    p = sub.add_parser("info", help="show column store metadata")
+    p.add_argument("store")
+    p = sub.add_parser("report", help="BScan report (Markdown + JSON) from column files")
+    p.add_argument("store")
+    p.add_argument("-o", "--output", help="report path without extension (default: print Markdown only)")
+    p.add_argument("--filter", action="append", default=[], metavar="NAME=EXPR", help="filter expression to count")
+    p = sub.add_parser("jitter", help="PCR jitter from column files")
+    p.add_argument("store")
+    p.add_argument("--pid", type=lambda s: int(s, 0), help="PCR PID (default: all PCR PIDs)")
+    args = ap.parse_args(argv)
+
+    if args.cmd == "export":
+        out = args.output or os.path.splitext(args.input)[0] + ".cols"
+        mb = os.path.getsize(args.input) / 1e6
+        meta = export_columns(args.input, out)
+        sec = meta['export_seconds']
+        print(f"[Export] {meta['packets']:,} packets, {mb:,.1f} MB in {sec:.2f}s "
+              f"({mb / sec if sec > 0 else 0:,.1f} MB/s) -> {out}")
+        return 0
+
+    store = ColumnStore(args.store)
+    if args.cmd == "info":
+        for k, v in store.meta.items():
+            print(f"{k:>15}: {v}")
+        print(f"{'psi_packets':>15}: {len(store.psi_index):,}")
+        return 0
+
+    if args.cmd == "report":
+        from ts_filter_expr import parse_named_filters, FilterSyntaxError
+        try:
+            filter_exprs = parse_named_filters(args.filter)
+        except FilterSyntaxError as e:
+            print(f"[Error] {e}")
+            return 2
+        scanner = scan_store(store, filter_exprs)
+        if args.output:
+            from ts_report import save_report
+            for path in save_report(scanner.report_model, args.output):
+                print(f"[Report] {path}")
+        else:
+            print("\n".join(scanner.report))
+        return 0
+
+    from zitter_measurement import TSJitterAnalyzer
+    for pid in ([args.pid] if args.pid is not None else store.pcr_pids()):
+        offs, secs = store.pcr(pid)
+        if len(offs) < 2:
+            print(f"PID 0x{pid:04X}: {len(offs)} PCR (not enough samples)")
+            continue
+        an = TSJitterAnalyzer()
+        an.raw_pcr_data = np.column_stack((offs, secs))
+        an.analyze_full()
+        print(f"PID 0x{pid:04X}: {len(offs):,} PCR, bitrate {an.bitrate / 1e6:.3f} Mbps, "
+              f"timing {an.min_jitter:.0f}..{an.max_jitter:.0f} ns, alignment max {an.max_align_jitter:.0f} ns")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(_main())
@@ -0,0 +1,177 @@
+"""
+[파일 개요]
+MPEG2-TS 일괄(Bulk) 패킷 디코더
+
+[목적 및 필요성]
+TSParser.parse_header()는 패킷 1개씩 struct.unpack으로 처리하므로 대용량 파일 전체를 다루기에는 느립니다.
+이 모듈은 연속된 188바이트 패킷 묶음(Chunk)을 NumPy 배열로 한 번에 디코딩하여
+필드별 컬럼(dict of arrays) 형태로 반환합니다. 스캐너, 검색, 비동기 API 등이 공통으로 사용합니다.
+"""
+import numpy as np
+
+TS_PACKET_SIZE = 188
+NUM_PIDS = 8192
+NULL_PID = 0x1FFF
+NO_VALUE = -1           # PCR/PTS/DTS가 없는 패킷의 값
+
+# 기본 Chunk 크기 (패킷 수): 4096 * 188 = 약 770KB
+DEFAULT_CHUNK_PACKETS = 4096
+
+
+def packets_view(buf):
+    """bytes/bytearray/ndarray를 (N, 188) uint8 배열로 변환 (복사 없음, 끝의 불완전 패킷은 버림)"""
+    arr = np.frombuffer(buf, dtype=np.uint8) if not isinstance(buf, np.ndarray) else buf.reshape(-1)
+    n = len(arr) // TS_PACKET_SIZE
+    return arr[:n * TS_PACKET_SIZE].reshape(n, TS_PACKET_SIZE)
+
+
+def decode_headers(buf):
+    """
+    PID / PUSI만 빠르게 추출 (인덱스 구축 등 헤더만 필요한 경우용)
+    :return: (pid uint16 array, pusi bool array)
+    """
+    pk = packets_view(buf)
+    b1 = pk[:, 1].astype(np.uint16)
+    pid = ((b1 & 0x1F) << 8) | pk[:, 2]
+    pusi = (pk[:, 1] & 0x40) != 0
+    return pid, pusi
+
+
+def _gather(pk, rows, pos):
+    """각 행(row)에서 pos 위치의 바이트를 가져옴 (범위 밖은 0)"""
+    valid = (pos >= 0) & (pos < TS_PACKET_SIZE)
+    vals = pk[rows, np.clip(pos, 0, TS_PACKET_SIZE - 1)].astype(np.int64)
+    vals[~valid] = 0
+    return vals
+
+
+def _decode_timestamp(b0, b1, b2, b3, b4):
+    """33-bit PTS/DTS (5 bytes) 벡터 디코딩"""
+    return (((b0 >> 1) & 0x07) << 30) | (b1 << 22) | ((b2 >> 1) << 15) | (b3 << 7) | (b4 >> 1)
+
+
+def decode_columns(buf, start_index=0, lap=None):
+    """
+    패킷 묶음을 컬럼 형태로 디코딩합니다.
+    :param buf: 188 * N 바이트 버퍼
+    :param start_index: 첫 패킷의 파일 내 패킷 인덱스 (offset 계산용)
+    :param lap: 단계별 계측 함수 lap(stage) (ts_scan_profile.ScanStageProfiler.lap, None이면 계측 안 함)
+    :return: { 필드명: np.ndarray(N) }
+        index, offset          : 패킷 인덱스 / 바이트 오프셋
+        sync, tei, pusi, prio  : 헤더 플래그 (bool)
+        pid, scram, adapt, cc  : 헤더 필드
+        af_len, discontinuity, random_access, pcr_flag, pcr : Adaptation Field (pcr은 27MHz 값, 없으면 -1)
+        payload_off            : Payload 시작 위치 (Payload 없으면 188)
+        pes_start, stream_id, pes_len, pts, dts : PES 헤더 (PUSI=1 & Start Code 확인된 패킷만)
+        pes_flags              : PES 헤더 7번째 바이트 (PTS_DTS_flags 등, 헤더 밖이면 0)
+    """
+    pk = packets_view(buf)
+    n = len(pk)
+    rows = np.arange(n)
+
+    b1 = pk[:, 1]
+    b3 = pk[:, 3]
+
+    index = np.arange(start_index, start_index + n, dtype=np.int64)
+    pid = ((b1.astype(np.uint16) & 0x1F) << 8) | pk[:, 2]
+    adapt = (b3 >> 4) & 0x3
+    if lap: lap('header')
+
+    # --- Adaptation Field ---
+    has_af = (adapt & 0x2) != 0
+    af_len = np.where(has_af, pk[:, 4], 0).astype(np.uint8)
+    af_flags = np.where(has_af & (af_len > 0), pk[:, 5], 0).astype(np.uint8)
+    pcr_flag = (af_flags & 0x10) != 0
+
+    pcr = np.full(n, NO_VALUE, dtype=np.int64)
+    has_pcr = pcr_flag & (af_len >= 7)
+    if has_pcr.any():
+        p = pk[has_pcr, 6:12].astype(np.int64)
+        base = (p[:, 0] << 25) | (p[:, 1] << 17) | (p[:, 2] << 9) | (p[:, 3] << 1) | (p[:, 4] >> 7)
+        ext = ((p[:, 4] & 0x1) << 8) | p[:, 5]
+        pcr[has_pcr] = base * 300 + ext
+    if lap: lap('pcr')
+
+    # --- Payload ---
+    payload_off = np.where(has_af, 5 + af_len.astype(np.int16), 4).astype(np.int16)
+    payload_off[(adapt & 0x1) == 0] = TS_PACKET_SIZE
+    payload_off = np.minimum(payload_off, TS_PACKET_SIZE)
+
+    # --- PES Header (PUSI=1) ---
+    pusi = (b1 & 0x40) != 0
+    stream_id = np.zeros(n, dtype=np.uint8)
+    pes_len = np.zeros(n, dtype=np.uint16)
+    pes_flags = np.zeros(n, dtype=np.uint8)
+    pts = np.full(n, NO_VALUE, dtype=np.int64)
+    dts = np.full(n, NO_VALUE, dtype=np.int64)
+    pes_start = np.zeros(n, dtype=bool)
+
+    cand = np.nonzero(pusi & (payload_off <= TS_PACKET_SIZE - 6))[0]
+    if len(cand):
+        po = payload_off[cand].astype(np.int64)
+        g = lambda k: _gather(pk, cand, po + k)
+        is_pes = (g(0) == 0) & (g(1) == 0) & (g(2) == 1)
+        cand, po = cand[is_pes], po[is_pes]
+        pes_start[cand] = True
+        if len(cand):
+            g = lambda k: _gather(pk, cand, po + k)
+            sid = g(3)
+            stream_id[cand] = sid
+            pes_len[cand] = (g(4) << 8) | g(5)
+            pes_flags[cand] = g(7)
+
+            # Optional PES Header: video, audio, private_1 (TSParser.parse_pes_header와 동일 조건)
+            has_opt = (((sid >= 0xC0) & (sid <= 0xEF)) | (sid == 0xBD)) & (po + 9 < TS_PACKET_SIZE)
+            flags = pes_flags[cand] >> 6
+            has_pts = has_opt & (flags >= 2) & (po + 14 <= TS_PACKET_SIZE)
+            has_dts = has_opt & (flags == 3) & (po + 19 <= TS_PACKET_SIZE)
+            pts_v = _decode_timestamp(g(9), g(10), g(11), g(12), g(13))
+            dts_v = _decode_timestamp(g(14), g(15), g(16), g(17), g(18))
+            pts[cand[has_pts]] = pts_v[has_pts]
+            dts[cand[has_dts]] = dts_v[has_dts]
+    if lap: lap('pes')
+
+    cols = {
+        'index': index,
+        'offset': index * TS_PACKET_SIZE,
+        'sync': pk[:, 0] == 0x47,
+        'tei': (b1 & 0x80) != 0,
+        'pusi': pusi,
+        'prio': (b1 & 0x20) != 0,
+        'pid': pid,
+        'scram': (b3 >> 6) & 0x3,
+        'adapt': adapt,
+        'cc': b3 & 0xF,
+        'af_len': af_len,
+        'discontinuity': (af_flags & 0x80) != 0,
+        'random_access': (af_flags & 0x40) != 0,
+        'pcr_flag': pcr_flag,
+        'pcr': pcr,
+        'payload_off': payload_off,
+        'pes_start': pes_start,
+        'stream_id': stream_id,
+        'pes_len': pes_len,
+        'pes_flags': pes_flags,
+        'pts': pts,
+        'dts': dts,
+    }
+    if lap: lap('header')
+    return cols
+
+
+def read_chunks(file_path, start_index=0, chunk_packets=DEFAULT_CHUNK_PACKETS, stop_flag=None):
+    """
+    파일을 Chunk 단위로 읽어 (start_index, buffer)를 순차 반환하는 제너레이터
+    :param stop_flag: 호출 시 True를 반환하면 중단 (예: lambda: not self.running)
+    """
+    with open(file_path, "rb") as f:
+        f.seek(start_index * TS_PACKET_SIZE)
+        idx = start_index
+        while True:
+            if stop_flag and stop_flag(): break
+            buf = f.read(chunk_packets * TS_PACKET_SIZE)
+            n = len(buf) // TS_PACKET_SIZE
+            if n == 0: break
+            yield idx, buf[:n * TS_PACKET_SIZE]
+            idx += n
+            if n < chunk_packets: break
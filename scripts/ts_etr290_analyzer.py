@@ -2,7 +2,14 @@
 MPEG2-TS ETR-290 Analysis Module
 ETR 290 규격(Priority 1, 2, 3)에 기반한 에러 체크 및 통계 분석을 수행합니다.
 """
-import struct
+import numpy as np
+
+from ts_columns import TS_PACKET_SIZE
+from ts_cc_checker import ContinuityChecker
+
+P1_KEYS = ['TS_sync_loss', 'Sync_byte_error', 'PAT_error', 'Continuity_count_error', 'PMT_error', 'PID_error']
+P2_KEYS = ['Transport_error', 'CRC_error', 'PCR_repetition_error', 'PCR_discontinuity_error', 'PCR_accuracy_error', 'PTS_error', 'CAT_error']
+MAX_VIOLATIONS = 10000          # 에러 종류별로 보관할 위반 위치 최대 개수 (개수 자체는 errors에 모두 집계)
 
 class TSETR290Analyzer:
     def __init__(self):
@@ -27,8 +34,8 @@ class TSETR290Analyzer:
         }
         
         # --- Internal State Tracking ---
-        # PID별 상태: { last_cc: int, duplicate_count: int }
-        self.pid_state = {}
+        # CC 검사 상태 (PID별 last_cc / 연속 중복 횟수) - 스캐너 통계와 같은 규칙
+        self.cc_checker = ContinuityChecker()
         
         # 이벤트 오프셋 기록 (Interval 분석용)
         # 리스트에 (byte_offset, extra_info) 저장
@@ -37,13 +44,18 @@ class TSETR290Analyzer:
             'pmt': {},          # { pmt_pid: [offset, ...] }
             'pcr': {},          # { pcr_pid: [offset, ...] }
             'pts': {},          # { pid: [offset, ...] }
+            'cc': [],           # CC 에러 위치 [(offset, pid), ...] (ContinuityChecker.events 공유)
         }
+        self.events['cc'] = self.cc_checker.events
         
         self.valid_pmt_pids = set()
         
         # 측정된 통계값 저장 (Max Interval 등)
         self.error_stats = {}
 
+        # 위반 위치 { 에러 이름: [(byte_offset, pid), ...] } (리포트 JSON용, 종류별 MAX_VIOLATIONS개까지)
+        self.violations = {k: [] for k in self.errors}
+
     def report_section_error(self, pid, error_type):
         """외부 모듈(Core)에서 감지된 섹션 에러(CRC, Table ID 등) 보고"""
         if error_type == 'CRC_error':
@@ -53,112 +65,83 @@ class TSETR290Analyzer:
             if pid == 0: self.errors['PAT_error'] += 1
             elif pid in self.valid_pmt_pids: self.errors['PMT_error'] += 1
 
-    def process_packet(self, packet, offset, pid, pusi, adapt, cnt):
+    def _add_violation(self, key, offset, pid):
+        v = self.violations[key]
+        if len(v) < MAX_VIOLATIONS:
+            v.append((int(offset), int(pid)))
+
+    def _add_violations(self, key, offsets, pids):
+        """위반 위치 일괄 추가 (offsets / pids: 같은 길이의 배열)"""
+        v = self.violations[key]
+        room = MAX_VIOLATIONS - len(v)
+        if room > 0 and len(offsets):
+            v.extend(zip(np.asarray(offsets[:room]).tolist(), np.asarray(pids[:room]).tolist()))
+
+    def process_columns(self, cols, cc_result=None):
         """
-        개별 패킷을 검사하여 즉시 확인 가능한 에러(1.2, 1.4, 2.1)를 체크하고 상태를 기록함.
+        패킷 묶음 단위 검사 (1.2 Sync / 2.1 TEI / 1.4 CC / 1.3, 1.5 Scrambling 및 PAT·PMT·PCR·PTS 수신 위치 수집)
+        :param cols: ts_columns.decode_columns() 결과
+        :param cc_result: 호출자가 이미 같은 묶음을 ContinuityChecker로 검사했다면 그 결과 (err_pid, err_offset)
+                          - 이 경우 자체 CC 검사를 생략합니다. (None이면 self.cc_checker로 검사)
         """
-        # 1.2 Sync_byte_error / 1.1 Sync loss (Check 0x47)
-        if packet[0] != 0x47:
-            self.errors['Sync_byte_error'] += 1
-            return # Cannot parse further
-            
-        # Parse Header Flags
-        header_val = struct.unpack('>I', packet[:4])[0]
-        tei = (header_val >> 23) & 0x1
-        scram = (header_val >> 6) & 0x3
-        
+        sync = cols['sync']
+        pid = cols['pid']
+        offsets = cols['offset']
+        bad_sync = int(np.count_nonzero(~sync))
+        if bad_sync:
+            self.errors['Sync_byte_error'] += bad_sync
+            self._add_violations('Sync_byte_error', offsets[~sync], pid[~sync])
+
+        pusi = cols['pusi'] & sync
+        scram = (cols['scram'] != 0) & sync
+
         # 2.1 Transport_error
-        if tei == 1:
-            self.errors['Transport_error'] += 1
-            
-        # 1.4 Continuity_count_error (Ignore Null Packet 0x1FFF)
-        if pid != 0x1FFF:
-            self._check_cc_error(pid, cnt, adapt)
-            
-        # 1.3 PAT Error Logic (Collection)
-        if pid == 0:
-            # Scrambling check
-            if scram != 0: self.errors['PAT_error'] += 1
-            # Table ID check (PUSI=1일 때만 가능, 여기서는 단순 Offset 수집)
-            if pusi: self.events['pat'].append(offset)
-            
-        # 1.5 PMT Error Logic (Collection)
-        if pid in self.valid_pmt_pids:
-            if scram != 0: self.errors['PMT_error'] += 1
-            if pusi:
-                if pid not in self.events['pmt']: self.events['pmt'][pid] = []
-                self.events['pmt'][pid].append(offset)
-                
-        # 2.3 PCR Collection (Adaptation Field 존재 시)
-        if (adapt & 0x2) and len(packet) >= 12:
-            af_len = packet[4]
-            if af_len > 0:
-                flags = packet[5]
-                pcr_flag = (flags >> 4) & 0x1
-                if pcr_flag:
-                    if pid not in self.events['pcr']: self.events['pcr'][pid] = []
-                    self.events['pcr'][pid].append(offset)
+        tei = cols['tei'] & sync
+        n_tei = int(np.count_nonzero(tei))
+        if n_tei:
+            self.errors['Transport_error'] += n_tei
+            self._add_violations('Transport_error', offsets[tei], pid[tei])
 
-        # 2.5 PTS Collection (PUSI=1)
-        if pusi:
-            # PES Header 간단 체크 (Start Code)
-            off = 4
-            if adapt & 0x2: off = 5 + packet[4]
-            
-            if off < 188 - 9: # Min header size
-                prefix = (packet[off] << 16) | (packet[off+1] << 8) | packet[off+2]
-                if prefix == 0x000001:
-                    # Check PTS flag
-                    flags_2 = packet[off+7]
-                    pts_flag = (flags_2 >> 7) & 0x1
-                    if pts_flag:
-                        if pid not in self.events['pts']: self.events['pts'][pid] = []
-                        self.events['pts'][pid].append(offset)
+        # 1.4 Continuity_count_error
+        if cc_result is None:
+            cc_result = self.cc_checker.check(cols)
+        self.errors['Continuity_count_error'] += len(cc_result[0])
+        self._add_violations('Continuity_count_error', cc_result[1], cc_result[0])
 
-    def _check_cc_error(self, pid, curr_cc, adapt):
-        """1.4 Continuity Count Check"""
-        # Initialize state
-        if pid not in self.pid_state:
-            self.pid_state[pid] = {'last_cc': -1, 'dup_cnt': 0}
-            # 첫 패킷은 에러 아님, 상태만 저장
-            if adapt & 0x1: # Payload exists
-                self.pid_state[pid]['last_cc'] = curr_cc
-            return
+        # 1.3 PAT (Scrambling / 수신 위치)
+        is_pat = (pid == 0) & sync
+        if is_pat.any():
+            bad = is_pat & scram
+            self.errors['PAT_error'] += int(np.count_nonzero(bad))
+            self._add_violations('PAT_error', offsets[bad], pid[bad])
+            self.events['pat'].extend(offsets[is_pat & pusi].tolist())
 
-        state = self.pid_state[pid]
-        last_cc = state['last_cc']
-        
-        # Adaptation Field Control
-        # 00: Reserved, 01: Payload, 10: Adapt, 11: Both
-        has_payload = (adapt & 0x1)
-        
-        if has_payload:
-            if last_cc == -1:
-                state['last_cc'] = curr_cc
-                return
-                
-            if curr_cc == last_cc:
-                # Duplicate Packet (Allowed up to 2 times total i.e. 1 repetition)
-                # ETR 290: "Packet sent twice" is OK, "more than twice" is error?
-                # Usually CC should increment. Duplicate packets are for padding sometimes.
-                # Here we implement basic discontinuity check.
-                state['dup_cnt'] += 1
-                pass 
-            else:
-                expected = (last_cc + 1) & 0xF
-                if curr_cc != expected:
-                    self.errors['Continuity_count_error'] += 1
-                
-                state['last_cc'] = curr_cc
-                state['dup_cnt'] = 0
-        else:
-            # No payload (Adaptation only) -> CC should NOT increment
-            # But if it increments, it's discontinuity?
-            # Standard says: CC increments only if payload exists.
-            # So for adapt-only, CC should be same as previous packet with payload.
-            # But strictly ETR290 Continuity_count_error usually refers to Discontinuity indicator or Missing packets.
-            # We stick to payload-based CC check for now.
-            pass
+        # 1.5 PMT (Scrambling / 수신 위치)
+        for pmt_pid in self.valid_pmt_pids:
+            is_pmt = (pid == pmt_pid) & sync
+            if not is_pmt.any(): continue
+            bad = is_pmt & scram
+            self.errors['PMT_error'] += int(np.count_nonzero(bad))
+            self._add_violations('PMT_error', offsets[bad], pid[bad])
+            sel = is_pmt & pusi
+            if sel.any():
+                self.events['pmt'].setdefault(pmt_pid, []).extend(offsets[sel].tolist())
+
+        # 2.3 PCR 수신 위치 (PCR flag만 확인)
+        self._collect_by_pid('pcr', pid, offsets, cols['pcr_flag'] & sync)
+
+        # 2.5 PTS 수신 위치 (PES Start Code + PTS flag)
+        po = cols['payload_off'].astype(np.int64)
+        has_pts = pusi & cols['pes_start'] & (po < TS_PACKET_SIZE - 9) & ((cols['pes_flags'] & 0x80) != 0)
+        self._collect_by_pid('pts', pid, offsets, has_pts)
+
+    def _collect_by_pid(self, key, pid, offsets, mask):
+        """events[key][pid]에 mask된 패킷 오프셋을 PID별로 추가"""
+        if not mask.any(): return
+        sel_pid = pid[mask]
+        sel_off = offsets[mask]
+        for q in np.unique(sel_pid).tolist():
+            self.events[key].setdefault(q, []).extend(sel_off[sel_pid == q].tolist())
 
     def register_pmt_pid(self, pid):
         """Scanner에서 PMT PID를 발견하면 등록 (1.5 에러 체크용)"""
@@ -176,7 +159,7 @@ class TSETR290Analyzer:
         # ByteRate (Bytes per second)
         byte_rate = file_size / duration_sec
         
-        def check_interval(offsets, limit_sec, error_key, error_key_discont=None):
+        def check_interval(offsets, limit_sec, error_key, error_key_discont=None, pid=None):
             if not offsets or len(offsets) < 2:
                 # 데이터가 1개 이하면 Interval 계산 불가
                 self.error_stats[error_key] = {'max_ms': 0.0, 'min_ms': 0.0, 'avg_ms': 0.0}
@@ -203,9 +186,11 @@ class TSETR290Analyzer:
                 # Repetition Error (너무 늦게 옴)
                 if diff_sec > limit_sec:
                     self.errors[error_key] += 1
+                    self._add_violation(error_key, curr, pid)
                     # 2.3 PCR의 경우 Discontinuity(100ms)와 Repetition(40ms)가 나뉨
                     if error_key_discont and diff_sec > 0.1: # 100ms
                         self.errors[error_key_discont] += 1
+                        self._add_violation(error_key_discont, curr, pid)
                 
                 last_offset = curr
             
@@ -222,14 +207,14 @@ class TSETR290Analyzer:
                      self.error_stats[error_key_discont] = self.error_stats[error_key]
 
         # 1.3 PAT Interval > 0.5s
-        check_interval(self.events['pat'], 0.5, 'PAT_error')
+        check_interval(self.events['pat'], 0.5, 'PAT_error', pid=0)
         
         # 1.5 PMT Interval > 0.5s
         # 여러 PMT 중 가장 나쁜(Max) 값을 기록
         pmt_max_ms = 0
         pmt_err_count = 0
         for pid, offsets in self.events['pmt'].items():
-            check_interval(offsets, 0.5, 'PMT_error')
+            check_interval(offsets, 0.5, 'PMT_error', pid=pid)
             st = self.error_stats.get('PMT_error')
             if st and st['max_ms'] > pmt_max_ms: pmt_max_ms = st['max_ms']
         
@@ -240,7 +225,7 @@ class TSETR290Analyzer:
         # 2.3 PCR Interval > 40ms (Repetition), > 100ms (Discontinuity)
         pcr_max_ms = 0
         for pid, offsets in self.events['pcr'].items():
-            check_interval(offsets, 0.04, 'PCR_repetition_error', 'PCR_discontinuity_error')
+            check_interval(offsets, 0.04, 'PCR_repetition_error', 'PCR_discontinuity_error', pid=pid)
             st = self.error_stats.get('PCR_repetition_error')
             if st and st['max_ms'] > pcr_max_ms: pcr_max_ms = st['max_ms']
         if self.events['pcr']:
@@ -249,73 +234,26 @@ class TSETR290Analyzer:
         # 2.5 PTS Interval > 700ms
         pts_max_ms = 0
         for pid, offsets in self.events['pts'].items():
-            check_interval(offsets, 0.7, 'PTS_error')
+            check_interval(offsets, 0.7, 'PTS_error', pid=pid)
             st = self.error_stats.get('PTS_error')
             if st and st['max_ms'] > pts_max_ms: pts_max_ms = st['max_ms']
         if self.events['pts']:
              self.error_stats['PTS_error'] = {'max_ms': pts_max_ms}
 
-    def get_report_markdown(self):
-        """Markdown 포맷 리포트 반환"""
-        lines = []
-        lines.append("## ETR-290 Analysis Report")
-        
-        def get_stat_str(key):
-            if key in self.error_stats:
-                st = self.error_stats[key]
-                if 'max_ms' in st:
-                    return f"(Max: {st['max_ms']:.2f}ms)"
-            return ""
-
-        # Priority 1
-        lines.append("### Priority 1 (Critical)")
-        p1_keys = ['TS_sync_loss', 'Sync_byte_error', 'PAT_error', 'Continuity_count_error', 'PMT_error', 'PID_error']
-        
-        has_p1_err = False
-        for k in p1_keys:
-            cnt = self.errors.get(k, 0)
-            status = "✅ OK" if cnt == 0 else f"❌ **{cnt} Errors**"
-            stat_info = get_stat_str(k)
-            if cnt > 0: has_p1_err = True
-            lines.append(f"- **{k}**: {status} {stat_info}")
-            
-        if not has_p1_err: lines.append("> **Result**: Stream is Decodable (No Priority 1 Errors)")
-        else: lines.append("> **Result**: ⚠️ Stream may have decoding issues.")
-        
-        lines.append("")
-        
-        # Priority 2
-        lines.append("### Priority 2 (Recommended)")
-        p2_keys = ['Transport_error', 'CRC_error', 'PCR_repetition_error', 'PCR_discontinuity_error', 'PCR_accuracy_error', 'PTS_error', 'CAT_error']
-        
-        for k in p2_keys:
-            cnt = self.errors.get(k, 0)
-            # PCR Accuracy는 외부(Jitter Analyzer)에서 주입해주지 않으면 0일 수 있음
-            status = "✅ OK" if cnt == 0 else f"⚠️ **{cnt} Errors**"
-            stat_info = get_stat_str(k)
-            lines.append(f"- **{k}**: {status} {stat_info}")
-            
-        
-        # [추가] 상세 측정 통계 섹션
-        lines.append("")
-        lines.append("### Detailed Measurement Statistics")
-        lines.append("| Type | Min (ms) | Max (ms) | Avg (ms) | Note |")
-        lines.append("|:---|---:|---:|---:|:---|")
-        
-        # 표시할 항목들 정의
-        stats_map = [
-            ('PCR_repetition_error', 'PCR Interval'),
-            ('PCR_discontinuity_error', 'PCR Discont Check'),
-            ('PTS_error', 'PTS Interval'),
-            ('PAT_error', 'PAT Interval'),
-            ('PMT_error', 'PMT Interval'),
-        ]
-        
-        for key, label in stats_map:
-            st = self.error_stats.get(key)
-            if st and 'min_ms' in st:
-                lines.append(f"| {label} | {st['min_ms']:.2f} | {st['max_ms']:.2f} | {st['avg_ms']:.2f} | - |")
-            else:
-                lines.append(f"| {label} | - | - | - | No Data |")
+    def to_dict(self):
+        """
+        리포트 모델 (JSON 직렬화 가능)
+        :return: {'priority1': {에러: 개수}, 'priority2': {...}, 'stats': {에러: {'min_ms','max_ms','avg_ms'}},
+                  'violations': {에러: [[byte_offset, pid], ...]}} (위반 위치가 있는 에러만)
+        """
+        return {
+            'priority1': {k: int(self.errors.get(k, 0)) for k in P1_KEYS},
+            'priority2': {k: int(self.errors.get(k, 0)) for k in P2_KEYS},
+            'stats': {k: {m: float(v) for m, v in st.items()} for k, st in self.error_stats.items()},
+            'violations': {k: list(v) for k, v in self.violations.items() if v},
+        }
 
-        return lines
+    def get_report_markdown(self):
+        """Markdown 포맷 리포트 반환 (to_dict() 모델 기준, ts_report.render_etr290 참조)"""
+        from ts_report import render_etr290
+        return render_etr290(self.to_dict())
@@ -0,0 +1,351 @@
+"""
+[파일 개요]
+패킷 필터 표현식 (Filter Expression)
+
+[목적 및 필요성]
+GUI의 필터는 7개의 고정 토글(PAT, PMT, Video, Audio, PCR, PTS, DTS)의 OR 조합뿐이라
+"PID 0x100이면서 PUSI와 random_access가 모두 켜진 패킷"이나 "TEI 또는 스크램블된 모든 패킷" 같은 조건을 표현할 수 없습니다.
+이 모듈은 패킷 필드에 대한 작은 표현식 언어를 제공하며, 표현식은 decode_columns() 컬럼 배열에 대한
+NumPy 마스크 함수로 컴파일됩니다. GUI Smart Search(ts_search), CLI 추출(아래 __main__), 스캐너 리포트가 공통으로 사용합니다.
+
+[문법]
+    expr       := or_expr
+    or_expr    := and_expr (('or' | '||') and_expr)*
+    and_expr   := not_expr (('and' | '&&') not_expr)*
+    not_expr   := ('not' | '!') not_expr | '(' expr ')' | condition
+    condition  := field                                  (필드 단독: 0이 아니면 참, pcr/pts/dts는 값이 있으면 참)
+                | field op number                        (op: == != < <= > >=)
+                | field 'in' '(' number (',' number)* ')'
+    number     := 10진수 | 0x16진수 | 0b2진수 | true | false
+
+[필드]
+    패킷 헤더 : pid, pusi, tei, prio, cc, scram (scrambled = scram != 0), adapt
+    적응 필드 : af_len, discontinuity, random_access, pcr (27MHz 값)
+    PES 헤더  : pes_start, stream_id, pes_len, pts, dts (90kHz 값)
+    위치      : index, offset
+    PSI 정보  : stream_type, program (PMT에서 얻은 값, pid_map / programs 필요)
+    단축      : video, audio (stream_type 분류), pmt (PMT PID), null (PID 0x1FFF)
+
+[예시]
+    pid == 0x100 and pusi and random_access
+    tei or scrambled
+    program == 1 and pts > 90000
+    stream_type in (0x1B, 0x24) and not pusi
+"""
+import argparse
+import os
+import re
+import sys
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from ts_columns import TS_PACKET_SIZE, NUM_PIDS, NULL_PID, NO_VALUE, decode_columns, read_chunks
+
+# GUI 필터 버튼 / ts_search와 동일한 Stream Type 분류
+VIDEO_TYPES = (0x01, 0x02, 0x1B, 0x24)     # MPEG1, MPEG2, H.264, HEVC
+AUDIO_TYPES = (0x03, 0x04, 0x0F, 0x81)     # MPEG1, MPEG2, AAC, AC3
+
+# 컬럼 필드 (decode_columns 키와 동일)
+COLUMN_FIELDS = ('pid', 'pusi', 'tei', 'prio', 'cc', 'scram', 'adapt', 'af_len', 'discontinuity',
+                 'random_access', 'pcr', 'pes_start', 'stream_id', 'pes_len', 'pts', 'dts', 'index', 'offset')
+OPTIONAL_FIELDS = ('pcr', 'pts', 'dts')                 # 없는 패킷은 NO_VALUE(-1)
+CONTEXT_FIELDS = ('stream_type', 'program')              # PID -> PSI 정보 조회
+PREDICATES = ('scrambled', 'video', 'audio', 'pmt', 'null')
+COMPARE_OPS = ('==', '!=', '<', '<=', '>', '>=')
+
+_TOKEN_RE = re.compile(r"\s*(?:(0[xX][0-9a-fA-F]+|0[bB][01]+|\d+)|([A-Za-z_][A-Za-z_0-9]*)|(==|!=|<=|>=|&&|\|\||[<>!(),]))")
+
+
+class FilterSyntaxError(ValueError):
+    """표현식 문법 오류 (pos: 오류 위치)"""
+    def __init__(self, message, pos=-1):
+        super().__init__(f"{message} (at {pos})" if pos >= 0 else message)
+        self.pos = pos
+
+
+def _tokenize(text):
+    tokens = []
+    pos = 0
+    text = text.rstrip()
+    while pos < len(text):
+        m = _TOKEN_RE.match(text, pos)
+        if not m:
+            raise FilterSyntaxError(f"Unexpected character '{text[pos:].lstrip()[:1]}'", pos)
+        num, name, op = m.groups()
+        start = m.start(m.lastindex)
+        if num is not None: tokens.append(('num', int(num, 0), start))
+        elif name is not None: tokens.append(('name', name.lower(), start))
+        else: tokens.append(('op', op, start))
+        pos = m.end()
+    tokens.append(('end', None, len(text)))
+    return tokens
+
+
+class _Env:
+    """마스크 평가 환경: 컬럼 + PSI 정보(지연 생성 LUT)"""
+    def __init__(self, cols, pid_map, programs):
+        self.cols = cols
+        self.pid_map = pid_map or {}
+        self.programs = programs or {}
+        self._lut = {}
+
+    def stream_types(self):
+        lut = self._lut.get('stream_type')
+        if lut is None:
+            lut = np.full(NUM_PIDS, NO_VALUE, dtype=np.int64)
+            for pid, info in self.pid_map.items():
+                lut[pid] = info.get('type', NO_VALUE)
+            self._lut['stream_type'] = lut
+        return lut
+
+    def program_pids(self, pred):
+        """pred(프로그램 번호)가 참인 프로그램에 속한 PID(PMT + ES) LUT"""
+        lut = np.zeros(NUM_PIDS, dtype=bool)
+        for num, prog in self.programs.items():
+            if pred(num):
+                lut[prog['pmt_pid']] = True
+                for pid in prog.get('pids', {}):
+                    lut[pid] = True
+        return lut
+
+    def pmt_pids(self):
+        lut = np.zeros(NUM_PIDS, dtype=bool)
+        for prog in self.programs.values():
+            lut[prog['pmt_pid']] = True
+        return lut
+
+
+def _compare(values, op, v):
+    if op == '==': return values == v
+    if op == '!=': return values != v
+    if op == '<': return values < v
+    if op == '<=': return values <= v
+    if op == '>': return values > v
+    return values >= v
+
+
+class _Parser:
+    """재귀 하강 파서: 토큰 -> 평가 함수 fn(env) -> bool mask"""
+    def __init__(self, text):
+        self.tokens = _tokenize(text)
+        self.i = 0
+        self.uses_context = False
+
+    def peek(self):
+        return self.tokens[self.i]
+
+    def take(self):
+        tok = self.tokens[self.i]
+        self.i += 1
+        return tok
+
+    def accept(self, *values):
+        kind, val, _ = self.peek()
+        if kind in ('op', 'name') and val in values:
+            self.i += 1
+            return True
+        return False
+
+    def expect_op(self, value):
+        kind, val, pos = self.take()
+        if kind != 'op' or val != value:
+            raise FilterSyntaxError(f"Expected '{value}'", pos)
+
+    def parse(self):
+        fn = self.or_expr()
+        kind, _, pos = self.peek()
+        if kind != 'end':
+            raise FilterSyntaxError("Unexpected token", pos)
+        return fn
+
+    def or_expr(self):
+        terms = [self.and_expr()]
+        while self.accept('or', '||'):
+            terms.append(self.and_expr())
+        if len(terms) == 1: return terms[0]
+        return lambda env: np.logical_or.reduce([t(env) for t in terms])
+
+    def and_expr(self):
+        terms = [self.not_expr()]
+        while self.accept('and', '&&'):
+            terms.append(self.not_expr())
+        if len(terms) == 1: return terms[0]
+        return lambda env: np.logical_and.reduce([t(env) for t in terms])
+
+    def not_expr(self):
+        if self.accept('not', '!'):
+            inner = self.not_expr()
+            return lambda env: ~inner(env)
+        if self.accept('('):
+            fn = self.or_expr()
+            self.expect_op(')')
+            return fn
+        return self.condition()
+
+    def number(self):
+        kind, val, pos = self.take()
+        if kind == 'num': return val
+        if kind == 'name' and val in ('true', 'false'): return int(val == 'true')
+        raise FilterSyntaxError("Expected number", pos)
+
+    def condition(self):
+        kind, name, pos = self.take()
+        if kind != 'name':
+            raise FilterSyntaxError("Expected field name", pos)
+
+        if name in PREDICATES:
+            return self._predicate(name)
+        if name not in COLUMN_FIELDS and name not in CONTEXT_FIELDS:
+            raise FilterSyntaxError(f"Unknown field '{name}'", pos)
+
+        values = self._field(name)
+        optional = name in OPTIONAL_FIELDS or name == 'stream_type'
+
+        kind, op, _ = self.peek()
+        if kind == 'op' and op in COMPARE_OPS:
+            self.take()
+            v = self.number()
+            if name == 'program':
+                return lambda env: env.program_pids(lambda num: _compare(num, op, v))[env.cols['pid']]
+            if optional:
+                return lambda env: (values(env) != NO_VALUE) & _compare(values(env), op, v)
+            return lambda env: _compare(values(env), op, v)
+
+        if self.accept('in'):
+            self.expect_op('(')
+            items = [self.number()]
+            while self.accept(','):
+                items.append(self.number())
+            self.expect_op(')')
+            if name == 'program':
+                return lambda env: env.program_pids(lambda num: num in items)[env.cols['pid']]
+            return lambda env: np.isin(values(env), items)
+
+        # 필드 단독 사용: 참/거짓 판정
+        if name == 'program':
+            raise FilterSyntaxError("'program' needs a comparison", pos)
+        if optional:
+            return lambda env: values(env) != NO_VALUE
+        return lambda env: values(env) != 0
+
+    def _field(self, name):
+        if name == 'stream_type':
+            self.uses_context = True
+            return lambda env: env.stream_types()[env.cols['pid']]
+        if name == 'program':
+            self.uses_context = True
+            return None
+        return lambda env: env.cols[name]
+
+    def _predicate(self, name):
+        if name == 'scrambled':
+            return lambda env: env.cols['scram'] != 0
+        if name == 'null':
+            return lambda env: env.cols['pid'] == NULL_PID
+        self.uses_context = True
+        if name == 'pmt':
+            return lambda env: env.pmt_pids()[env.cols['pid']]
+        types = VIDEO_TYPES if name == 'video' else AUDIO_TYPES
+        return lambda env: np.isin(env.stream_types()[env.cols['pid']], types)
+
+
+class FilterExpr:
+    """컴파일된 필터 표현식"""
+    def __init__(self, text):
+        self.text = text.strip()
+        parser = _Parser(self.text)
+        self._fn = parser.parse()
+        self.uses_context = parser.uses_context     # stream_type / program 등 PSI 정보 필요 여부
+
+    def __repr__(self):
+        return f"FilterExpr({self.text!r})"
+
+    def mask(self, cols, pid_map=None, programs=None):
+        """
+        decode_columns() 결과에 대한 조건 마스크
+        :param pid_map / programs: PSI 정보 (TSParser 또는 ScanSnapshot의 같은 이름 필드)
+        """
+        return self._fn(_Env(cols, pid_map, programs))
+
+
+def compile_filter(text):
+    """표현식 문자열을 FilterExpr로 컴파일 (문법 오류 시 FilterSyntaxError)"""
+    return FilterExpr(text)
+
+
+def parse_named_filters(items):
+    """
+    CLI --filter 인자(NAME=EXPR 목록) -> { 이름: 표현식 문자열 }
+    형식 오류나 표현식 문법 오류는 스캔을 시작하기 전에 FilterSyntaxError로 알립니다.
+    """
+    filters = {}
+    for item in items:
+        name, sep, text = item.partition("=")
+        if not sep or not name.strip():
+            raise FilterSyntaxError(f"--filter expects NAME=EXPR, got '{item}'")
+        try:
+            compile_filter(text)
+        except FilterSyntaxError as e:
+            raise FilterSyntaxError(f"--filter {name.strip()}: {e}") from None
+        filters[name.strip()] = text.strip()
+    return filters
+
+
+def filters_to_expr(active_filters):
+    """GUI 토글 필터 상태를 동일한 의미의 표현식 문자열로 변환 (모두 꺼져 있으면 None)"""
+    parts = {'PAT': 'pid == 0', 'PMT': 'pmt', 'Video': 'video', 'Audio': 'audio',
+             'PCR': 'pcr', 'PTS': 'pts', 'DTS': 'dts'}
+    terms = [parts[k] for k, on in active_filters.items() if on and k in parts]
+    return " or ".join(terms) if terms else None
+
+
+def _main(argv=None):
+    """CLI: 조건에 맞는 패킷 개수 / 위치 출력, -o 지정 시 해당 패킷만 새 TS 파일로 추출"""
+    ap = argparse.ArgumentParser(description="Extract MPEG2-TS packets matching a filter expression")
+    ap.add_argument("file", help="input .ts file")
+    ap.add_argument("expr", help="filter expression, e.g. \"pid == 0x100 and pusi\"")
+    ap.add_argument("-o", "--output", help="write matching packets to this .ts file")
+    ap.add_argument("-n", "--show", type=int, default=10, help="number of matching packet indexes to print")
+    args = ap.parse_args(argv)
+
+    try:
+        expr = compile_filter(args.expr)
+    except FilterSyntaxError as e:
+        print(f"[Error] {e}")
+        return 2
+
+    pid_map, programs = {}, {}
+    if expr.uses_context:
+        from ts_parser_core import TSParser
+        parser = TSParser(args.file)
+        parser.quick_scan()
+        pid_map, programs = parser.pid_map, parser.programs
+
+    total = matched = 0
+    first = []
+    out = open(args.output, "wb") if args.output else None
+    try:
+        for start_idx, buf in read_chunks(args.file, 0, 32768):
+            cols = decode_columns(buf, start_idx)
+            hit = np.flatnonzero(expr.mask(cols, pid_map, programs))
+            total += len(cols['pid'])
+            matched += len(hit)
+            if len(first) < args.show:
+                first.extend((hit[:args.show - len(first)] + start_idx).tolist())
+            if out and len(hit):
+                pk = np.frombuffer(buf, dtype=np.uint8).reshape(-1, TS_PACKET_SIZE)
+                out.write(pk[hit].tobytes())
+    finally:
+        if out: out.close()
+
+    print(f"{matched:,} / {total:,} packets match: {expr.text}")
+    if first:
+        print("First matches: " + ", ".join(str(i) for i in first))
+    if out:
+        print(f"Written: {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(_main())
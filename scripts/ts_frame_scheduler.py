@@ -0,0 +1,104 @@
+"""
+[파일 개요]
+재생 프레임 스케줄러 (FrameScheduler) - 재생 커서 진행 속도와 화면 갱신 주기 분리
+
+[목적 및 필요성]
+기존 재생은 루프 1회(렌더 1회)마다 커서를 speed 패킷만큼 옮기고 cv2.waitKey(1~10)로 대기했기 때문에,
+재생 속도(패킷/초)가 렌더 시간에 좌우되었고 고배속에서는 화면이 커서를 따라가지 못했습니다.
+이 모듈은
+    - 커서 위치: 재생 시작(또는 속도 변경) 시점의 (시각, 인덱스)를 기준으로 벽시계 시간 * 목표 패킷/초로 계산
+    - 화면 갱신: 목표 FPS 간격의 표시 시점까지 waitKey로 대기, 렌더가 늦어 놓친 표시 시점은 건너뜀
+으로 두 주기를 분리합니다. 표시 시점 사이의 패킷은 그리지 않으므로(Frame Skip) 배속과 무관하게
+렌더 비용은 일정하고, 빨리감기는 예측 가능한 패킷/초로 진행합니다.
+
+[사용법]
+    sched = FrameScheduler()
+    idx, at_edge = sched.advance(cur_idx, speed, total_pkts)    # speed: 배속 (x1 = BASE_PPS 패킷/초, 음수: 역방향)
+    key = cv2.waitKey(sched.wait_ms())
+    sched.reset()                                               # 정지 시 (다음 재생에서 기준점 재설정)
+"""
+import time
+
+TARGET_FPS = 60                 # 재생 중 화면 갱신 목표
+BASE_PPS = 60                   # x1 재생 속도 (패킷/초) - 기존 x1(프레임당 1패킷)과 비슷한 체감 속도
+
+# >> / << 버튼으로 이동하는 재생 배속 (음수: 역방향)
+SPEED_STEPS = [-1000.0, -200.0, -50.0, -10.0, -5.0, -2.0, -1.0, 1.0, 2.0, 5.0, 10.0, 50.0, 200.0, 1000.0]
+
+
+def next_speed(speed, direction):
+    """현재 배속에서 direction(+1: >>, -1: <<) 방향의 다음 배속"""
+    if direction > 0:
+        faster = [s for s in SPEED_STEPS if s > speed]
+        return faster[0] if faster else SPEED_STEPS[-1]
+    slower = [s for s in SPEED_STEPS if s < speed]
+    return slower[-1] if slower else SPEED_STEPS[0]
+
+
+class FrameScheduler:
+    """벽시계 기반 재생 커서 + 목표 FPS 화면 갱신 스케줄러"""
+    def __init__(self, target_fps=TARGET_FPS, base_pps=BASE_PPS):
+        self.target_fps = target_fps
+        self.base_pps = base_pps
+
+        self._anchor = None             # (기준 시각, 기준 인덱스, 배속) - 재생 시작/속도 변경/외부 이동 시 재설정
+        self._last_idx = None           # 마지막으로 반환한 커서 (다르면 외부에서 이동한 것)
+        self._next_frame = 0.0          # 다음 화면 표시 시각
+
+        # 통계
+        self.frames = 0                 # 표시한 프레임 수
+        self.late_frames = 0            # 렌더가 늦어 건너뛴 표시 시점 수
+        self.skipped_packets = 0        # 그리지 않고 지나간 패킷 수
+
+    @property
+    def frame_interval(self):
+        return 1.0 / self.target_fps
+
+    def packets_per_second(self, speed):
+        return speed * self.base_pps
+
+    def packets_per_frame(self, speed):
+        """표시 프레임당 커서 이동량 (선읽기 윈도우 크기 계산용, 최소 1)"""
+        step = int(round(self.packets_per_second(speed) / self.target_fps))
+        return step or (1 if speed >= 0 else -1)
+
+    def reset(self):
+        self._anchor = None
+        self._last_idx = None
+
+    def advance(self, idx, speed, total_pkts=None, now=None):
+        """
+        현재 시각의 재생 커서 계산
+        :param idx: 현재 커서 (마지막 반환값과 다르면 외부 이동으로 보고 기준점 재설정)
+        :return: (새 커서, 파일 끝/처음에 도달했는지)
+        """
+        if now is None: now = time.perf_counter()
+        if self._anchor is None or self._anchor[2] != speed or idx != self._last_idx:
+            self._anchor = (now, idx, speed)
+            self._next_frame = now
+
+        t0, i0, _ = self._anchor
+        new = i0 + int((now - t0) * self.packets_per_second(speed))
+        at_edge = False
+        if new < 0:
+            new, at_edge = 0, True
+        elif total_pkts is not None and new >= total_pkts:
+            new, at_edge = max(0, total_pkts - 1), True
+
+        if self._last_idx is not None:
+            self.skipped_packets += max(0, abs(new - self._last_idx) - 1)
+        self._last_idx = new
+        self.frames += 1
+        return new, at_edge
+
+    def wait_ms(self, now=None):
+        """다음 표시 시점까지 남은 시간 (ms, cv2.waitKey 인자 - 최소 1)"""
+        if now is None: now = time.perf_counter()
+        interval = self.frame_interval
+        self._next_frame += interval
+        if self._next_frame < now:
+            # 렌더가 표시 간격보다 오래 걸림: 놓친 표시 시점은 건너뛰고 다음 시점에 맞춤
+            missed = int((now - self._next_frame) / interval) + 1
+            self.late_frames += missed
+            self._next_frame += missed * interval
+        return max(1, int((self._next_frame - now) * 1000))
@@ -0,0 +1,119 @@
+"""
+[파일 개요]
+Go To 대상 해석 (패킷 번호 / 바이트 오프셋 / PCR 시각 / PTS 시각 -> 패킷 인덱스)
+
+[목적 및 필요성]
+특정 패킷(예: 12,345,678번)이나 스트림 시각(예: 00:42:10.5)으로 이동하려면 빨리감기 버튼을 누르고 기다리는 수밖에 없었습니다.
+이 모듈은 GUI 'g' 키 입력 문자열을 해석하고, 시각은 TSPacketIndex의 PCR / PTS 인덱스에서 이진 탐색(O(log n))으로
+패킷 인덱스를 찾습니다. 패킷 번호 / 오프셋은 계산만 하므로 인덱스 구축 여부와 무관합니다.
+
+[문법]
+    12345678 | #12345678 | pkt 12345678       패킷 번호 (0부터, 1,234,567처럼 ',' / '_' 허용)
+    @1048576 | @0x100000 | off 1048576        바이트 오프셋 (패킷 경계로 내림)
+    00:42:10.5 | 42:10.5 | 2530.5s            PCR 시각 (PCR PID의 첫 PCR 기준 경과 시간)
+    pcr 00:42:10.5 [pid 0x100]                PCR 시각, PCR PID 지정
+    pts 00:42:10.5 [pid 0x101]                PTS 시각 (PID의 첫 PTS 기준), PID 생략 시 선택 PID
+
+[사용법]
+    target = parse_goto("pts 1:02.5 pid 0x101")
+    idx, msg = resolve_goto(target, pkt_index, total_pkts, pcr_pid=0x100, selected_pid=0x101)
+"""
+import re
+
+from ts_columns import TS_PACKET_SIZE
+
+_NUM = r"(?:0x[0-9a-f]+|\d[\d,_]*)"
+_TIME = r"(?:\d+:)?(?:\d+:)?\d+(?:\.\d*)?s?"
+_PID_SUFFIX = rf"(?:\s+pid\s*=?\s*(?P<pid>{_NUM}))?"
+_PATTERNS = [
+    ('packet', re.compile(rf"^(?:#|pkt\s*=?\s*|packet\s*=?\s*)?(?P<v>{_NUM})$")),
+    ('offset', re.compile(rf"^(?:@|off\s*=?\s*|offset\s*=?\s*)(?P<v>{_NUM})$")),
+    ('pcr', re.compile(rf"^(?:pcr\s*=?\s*)?(?P<v>{_TIME}){_PID_SUFFIX}$")),
+    ('pts', re.compile(rf"^pts\s*=?\s*(?P<v>{_TIME}){_PID_SUFFIX}$")),
+]
+
+
+class GotoSyntaxError(ValueError):
+    """Go To 입력 문법 오류"""
+
+
+def _parse_number(text):
+    text = text.replace(',', '').replace('_', '')
+    return int(text, 16) if text.startswith('0x') else int(text)
+
+
+def parse_time(text):
+    """'[[HH:]MM:]SS[.frac][s]' -> 초"""
+    parts = text.rstrip('s').split(':')
+    seconds = 0.0
+    for part in parts:
+        seconds = seconds * 60 + float(part)
+    return seconds
+
+
+def format_time(seconds):
+    """초 -> 'HH:MM:SS.sss'"""
+    sign = '-' if seconds < 0 else ''
+    seconds = abs(seconds)
+    h, rem = divmod(seconds, 3600)
+    m, s = divmod(rem, 60)
+    return f"{sign}{int(h):02d}:{int(m):02d}:{s:06.3f}"
+
+
+def parse_goto(text):
+    """
+    입력 문자열 해석
+    :return: {'kind': 'packet' | 'offset' | 'pcr' | 'pts', 'value': int 또는 초(float), 'pid': int 또는 None}
+    """
+    s = ' '.join(text.strip().lower().split())
+    if not s:
+        raise GotoSyntaxError("empty input")
+    # 콜론 / 's' / 소수점이 없는 단독 숫자는 패킷 번호 (시각 패턴보다 먼저 검사)
+    for kind, pattern in _PATTERNS:
+        m = pattern.match(s)
+        if not m: continue
+        groups = m.groupdict()
+        pid = _parse_number(groups['pid']) if groups.get('pid') else None
+        if pid is not None and pid > 0x1FFF:
+            raise GotoSyntaxError(f"PID out of range: 0x{pid:X}")
+        if kind in ('packet', 'offset'):
+            return {'kind': kind, 'value': _parse_number(m.group('v')), 'pid': None}
+        return {'kind': kind, 'value': parse_time(m.group('v')), 'pid': pid}
+    raise GotoSyntaxError(f"cannot parse '{text.strip()}' (e.g. 12345678, @0x100000, 00:42:10.5, pts 1:02.5 pid 0x101)")
+
+
+def resolve_goto(target, pkt_index, total_pkts, pcr_pid=None, selected_pid=None):
+    """
+    해석된 대상 -> 패킷 인덱스
+    :param pkt_index: TSPacketIndex (PCR / PTS 시각 이진 탐색용)
+    :param pcr_pid: 'pcr' 대상의 PID 생략 시 기본값 (선택 프로그램의 PCR PID 등)
+    :param selected_pid: 'pts' 대상의 PID 생략 시 기본값
+    :return: (패킷 인덱스 또는 -1, 상태 메시지)
+    """
+    kind, value = target['kind'], target['value']
+    last = max(0, total_pkts - 1)
+    if kind == 'packet':
+        if value > last:
+            return -1, f"Packet #{value:,} is beyond the end of file ({total_pkts:,} packets)"
+        return value, f"Go to packet #{value:,}"
+    if kind == 'offset':
+        idx = value // TS_PACKET_SIZE
+        if idx > last:
+            return -1, f"Offset {value:,} is beyond the end of file"
+        return idx, f"Go to offset {value:,} (packet #{idx:,})"
+
+    pid = target['pid']
+    if pid is None:
+        pid = pcr_pid if kind == 'pcr' else selected_pid
+    if pid is None and pkt_index is not None:
+        pids = pkt_index.time_pids(kind)
+        pid = pids[0] if pids else None
+    label = f"{kind.upper()} {format_time(value)}"
+    if pid is None or pkt_index is None:
+        return -1, f"{label}: no {kind.upper()} PID"
+    idx = pkt_index.find_time(kind, pid, value)
+    if idx < 0:
+        if not pkt_index.complete:
+            return -1, f"{label}: not indexed yet on PID 0x{pid:X} ({pkt_index.progress * 100:.0f}%)"
+        return -1, f"{label}: beyond the last {kind.upper()} on PID 0x{pid:X}"
+    return idx, f"Go to {label} on PID 0x{pid:X} (packet #{idx:,})"
@@ -0,0 +1,370 @@
+"""
+[파일 개요]
+PCR Jitter 창 (JitterView) - 백그라운드 분석 + 줌 레벨별 타일 캐시 렌더링
+
+[목적 및 필요성]
+툴바의 Jitter 버튼은 show_jitter 값만 토글할 뿐 창이 구현되어 있지 않았고,
+TSJitterAnalyzer(zitter_measurement.py)의 analyze_full()은 np.polyfit 등으로 수백 ms가 걸릴 수 있어 GUI 스레드에서 호출할 수 없었습니다.
+이 모듈은
+    - 분석: 워커 스레드가 파일에서 대상 PID의 PCR을 Chunk 단위로 수집(벡터화)하고 analyze_full()까지 수행
+            (PID/파일이 바뀌면 이전 분석은 취소, 최신 요청만 처리)
+    - 렌더: X축을 2배 단위 줌 레벨로 나누고, 레벨마다 TILE_W x TILE_H 타일(그리드 + Timing/Alignment Jitter 곡선)을 미리 그려 LRU 캐시
+            타일의 Y는 0ns 기준선에서의 거리(px)로 고정하고 Y 이동(center_px)은 합성 시 행 위치로만 반영
+            → 상하좌우 Pan은 타일 Blit만, X 줌은 다른 레벨의 타일, Y 줌(scale_y)만 다시 렌더
+              (분석 직후 0~PRERENDER_LEVELS-1 레벨의 처음 화면 타일은 워커가 미리 렌더)
+    - 조작: 드래그 Pan, 휠 X줌(마우스 위치 기준), Shift+휠 Y줌, 더블클릭 전체 보기
+을 제공합니다. 축 라벨/통계 텍스트는 타일 합성 후 화면 좌표로 그립니다.
+
+[사용법]
+    view = JitterView()
+    view.open()
+    view.set_source("a.ts", 0x100)      # 같은 값이면 무시, 바뀌면 백그라운드 재분석
+    view.update()                       # GUI 루프에서 매 프레임 (바뀐 경우만 imshow)
+    view.close()
+"""
+import threading
+from collections import OrderedDict
+
+import cv2
+import numpy as np
+
+from ts_columns import TS_PACKET_SIZE, packets_view, decode_columns, read_chunks
+from zitter_measurement import (TSJitterAnalyzer, COLOR_BG, COLOR_GRID, COLOR_AXIS, COLOR_TIMING,
+                                COLOR_ALIGN, COLOR_LIMIT, COLOR_TEXT)
+
+TILE_W = 256                    # 타일 폭 (px)
+TILE_H = 256                    # 타일 높이 (px)
+MAX_TILES = 512                 # 타일 캐시 (LRU, 타일당 192KB - 약 100MB 상한)
+MAX_LEVEL = 20                  # 최대 X 줌 레벨 (전체 보기 x 2^20)
+PRERENDER_LEVELS = 4            # 분석 직후 미리 그릴 줌 레벨 수
+COLLECT_CHUNK_PACKETS = 65536
+LIMIT_NS = 500                  # ISO/IEC 13818-1 PCR 정확도 한계 (+/- 500ns)
+TIME_STEPS = [0.001, 0.002, 0.005, 0.01, 0.02, 0.05, 0.1, 0.2, 0.5, 1, 2, 5, 10, 20, 30, 60, 120, 300, 600, 1800, 3600]
+MIN_TIME_GRID_PX = 90           # 시간 그리드 최소 간격
+
+
+def collect_pcr(file_path, pid, cancel=None):
+    """
+    파일에서 PID의 PCR 수집
+    :return: (byte offset 배열, PCR 초 배열) - 취소되면 None
+    """
+    offs, secs = [], []
+    stop = cancel.is_set if cancel is not None else None
+    for start_idx, buf in read_chunks(file_path, 0, COLLECT_CHUNK_PACKETS, stop):
+        pk = packets_view(buf)
+        c_pid = ((pk[:, 1].astype(np.uint16) & 0x1F) << 8) | pk[:, 2]
+        # Adaptation Field + PCR_flag 후보만 디코딩
+        cand = np.nonzero((c_pid == pid) & ((pk[:, 3] & 0x20) != 0) & (pk[:, 4] > 0) & ((pk[:, 5] & 0x10) != 0))[0]
+        if len(cand):
+            cols = decode_columns(pk[cand])
+            ok = cols['pcr'] >= 0
+            offs.append((start_idx + cand[ok]).astype(np.float64) * TS_PACKET_SIZE)
+            secs.append(cols['pcr'][ok] / 27_000_000.0)
+    if cancel is not None and cancel.is_set():
+        return None
+    if not offs:
+        return np.zeros(0), np.zeros(0)
+    return np.concatenate(offs), np.concatenate(secs)
+
+
+def _time_step(px_per_sec):
+    for step in TIME_STEPS:
+        if step * px_per_sec >= MIN_TIME_GRID_PX:
+            return step
+    return TIME_STEPS[-1]
+
+
+def _ns_step(scale_y):
+    step = 500
+    while step * scale_y < 20: step *= 2
+    while step >= 2 and step * scale_y > 120: step //= 2
+    return step
+
+
+class JitterView:
+    """PCR Jitter 분석 창 (OpenCV 별도 창)"""
+    def __init__(self, window_name="PCR Jitter Analysis", width=1000, height=500):
+        self.window_name = window_name
+        self.width = width
+        self.height = height
+
+        self.file_path = None
+        self.pid = None
+        self.result = None              # (분석 완료된 TSJitterAnalyzer, X축 초 배열) - 교체는 대입 1회
+        self.status = "Select a program / PCR PID"
+
+        # Viewport (X: 줌 레벨 + world px 위치, Y: ns 배율 + 중심 이동 px)
+        self.level = 0
+        self.offset_px = 0
+        self.scale_y = 0.2
+        self.center_px = 0
+
+        self._tiles = OrderedDict()     # { (result id, level, k, row, scale_y): image }
+        self._tile_lock = threading.Lock()
+        self._cancel = threading.Event()
+        self._thread = None
+        self._opened = False
+        self._dirty = True
+        self._drag = None               # 드래그 중 마지막 마우스 위치 (x, y)
+        self._blank = None              # 배경색 화면 (합성 시작 이미지, 복사만 함)
+
+    # --- Window ---
+    def open(self):
+        if self._opened: return
+        cv2.namedWindow(self.window_name)
+        cv2.setMouseCallback(self.window_name, self._mouse_cb)
+        self._opened = True
+        self._dirty = True
+
+    def close(self):
+        self._cancel.set()
+        if self._opened:
+            try: cv2.destroyWindow(self.window_name)
+            except cv2.error: pass
+        self._opened = False
+
+    @property
+    def visible(self):
+        """사용자가 창을 닫았으면 False"""
+        if not self._opened: return False
+        try:
+            return cv2.getWindowProperty(self.window_name, cv2.WND_PROP_VISIBLE) >= 1
+        except cv2.error:
+            return False
+
+    def update(self):
+        """바뀐 내용이 있으면 다시 합성하여 표시"""
+        if self._opened and self._dirty:
+            self._dirty = False
+            cv2.imshow(self.window_name, self.compose())
+
+    # --- Analysis ---
+    def set_source(self, file_path, pid):
+        """분석 대상 지정 (같으면 무시, 바뀌면 이전 분석 취소 후 백그라운드 분석)"""
+        if (file_path, pid) == (self.file_path, self.pid): return
+        self.file_path, self.pid = file_path, pid
+        self._cancel.set()
+        self._cancel = threading.Event()
+        self.result = None
+        with self._tile_lock:
+            self._tiles.clear()
+        self._dirty = True
+        if not file_path or pid is None:
+            self.status = "Select a program / PCR PID"
+            return
+        self.status = f"Analyzing PCR PID 0x{pid:X}..."
+        self._thread = threading.Thread(target=self._worker, args=(file_path, pid, self._cancel))
+        self._thread.daemon = True
+        self._thread.start()
+
+    def _worker(self, file_path, pid, cancel):
+        try:
+            res = collect_pcr(file_path, pid, cancel)
+            if res is None: return
+            offs, secs = res
+            if len(offs) < 2:
+                self.status = f"No PCR on PID 0x{pid:X}"
+                self._dirty = True
+                return
+            an = TSJitterAnalyzer()
+            an.raw_pcr_data = np.column_stack((offs, secs))
+            an.analyze_full()
+            if cancel.is_set(): return
+            # X축: 회귀 직선상의 이상 시각 (첫 PCR 기준) - PCR wrap/discontinuity가 있어도 파일 순서대로 단조 증가
+            axis = (offs - offs[0]) * 8.0 / an.bitrate if an.bitrate > 0 else np.arange(len(offs), dtype=np.float64)
+
+            # 전체 보기로 초기화 후 낮은 줌 레벨 타일 미리 렌더
+            self.level, self.offset_px, self.center_px = 0, 0, 0
+            self.scale_y = self._fit_scale_y(an)
+            result = (an, axis)
+            self.result = result
+            self.status = ""
+            self._dirty = True
+            rows = self._visible_rows(self._base_y(0))
+            for level in range(PRERENDER_LEVELS):
+                for k in range(-(-self._world_width(level) // TILE_W)):
+                    for row in rows:
+                        if cancel.is_set(): return
+                        self._tile(result, level, k, row)
+        except Exception as e:
+            print(f"[Error] Jitter analysis failed: {e}")
+            self.status = f"Analysis failed: {e}"
+            self._dirty = True
+
+    def _fit_scale_y(self, an):
+        jitter_range = max(abs(an.max_jitter), abs(an.min_jitter), LIMIT_NS) * 2
+        return (self.height * 0.7) / jitter_range
+
+    # --- Coordinates ---
+    def _world_width(self, level):
+        """레벨의 전체 폭 (px) - 레벨 0은 창 폭"""
+        return self.width << level
+
+    def _px_per_sec(self, axis, level):
+        return self._world_width(level) / (float(axis[-1]) or 1.0)
+
+    def _base_y(self, center_px):
+        """0ns 기준선의 화면 y"""
+        return self.height // 2 + center_px
+
+    def _visible_rows(self, base_y):
+        """화면에 보이는 타일 행 번호 (행 r은 기준선 아래 r * TILE_H ~ (r + 1) * TILE_H px 구간)"""
+        return range(-base_y // TILE_H, (self.height - 1 - base_y) // TILE_H + 1)
+
+    # --- Tiles ---
+    def _tile(self, result, level, k, row):
+        key = (id(result), level, k, row, self.scale_y)
+        with self._tile_lock:
+            tile = self._tiles.get(key)
+            if tile is not None:
+                self._tiles.move_to_end(key)
+                return tile
+        tile = self._render_tile(result, level, k, row, key[4])
+        with self._tile_lock:
+            self._tiles[key] = tile
+            while len(self._tiles) > MAX_TILES:
+                self._tiles.popitem(last=False)
+        return tile
+
+    def _render_tile(self, result, level, k, row, scale_y):
+        """타일 1개: 배경 / Y 그리드 / 한계선 / 시간 그리드 / Timing·Alignment Jitter 곡선 (Y는 기준선 상대 좌표)"""
+        an, axis = result
+        h = TILE_H
+        tile = np.empty((h, TILE_W, 3), dtype=np.uint8)
+        tile[:] = COLOR_BG
+        base_y = -row * TILE_H      # 타일 좌표계에서 0ns 기준선의 y (타일 밖일 수 있음)
+
+        # 타일 안에 들어오는 그리드 줄만 (j번째 줄: 기준선에서 int(|j| * 간격)px, 화면 라벨과 같은 반올림)
+        grid = _ns_step(scale_y) * scale_y
+        for j in range(int(-base_y // grid) - 1, int((h - base_y) // grid) + 2):
+            if j == 0: continue
+            gy = base_y + (int(j * grid) if j > 0 else -int(-j * grid))
+            if 0 <= gy < h:
+                cv2.line(tile, (0, gy), (TILE_W, gy), COLOR_GRID, 1)
+        cv2.line(tile, (0, base_y), (TILE_W, base_y), COLOR_AXIS, 1)
+        limit_px = int(LIMIT_NS * scale_y)
+        cv2.line(tile, (0, base_y - limit_px), (TILE_W, base_y - limit_px), COLOR_LIMIT, 1)
+        cv2.line(tile, (0, base_y + limit_px), (TILE_W, base_y + limit_px), COLOR_LIMIT, 1)
+
+        pps = self._px_per_sec(axis, level)
+        t0 = k * TILE_W / pps
+        t1 = (k + 1) * TILE_W / pps
+        step = _time_step(pps)
+        g = np.ceil(t0 / step) * step
+        while g < t1:
+            gx = int(round((g - t0) * pps))
+            cv2.line(tile, (gx, 0), (gx, h), COLOR_GRID, 1)
+            g += step
+
+        # 타일 범위 + 양쪽 1개 점 (타일 경계에서 선이 끊기지 않게)
+        lo = max(0, int(np.searchsorted(axis, t0)) - 1)
+        hi = min(len(axis), int(np.searchsorted(axis, t1)) + 1)
+        if hi - lo >= 2:
+            xs = ((axis[lo:hi] - t0) * pps).astype(np.int32)
+            for series, color in ((an.timing_jitter, COLOR_TIMING), (an.align_jitter, COLOR_ALIGN)):
+                ys = np.floor(base_y - np.asarray(series[lo:hi]) * scale_y).astype(np.int32)     # 음수 좌표도 같은 방향으로 반올림
+                cv2.polylines(tile, [np.column_stack((xs, ys))], False, color, 1, cv2.LINE_AA)
+        return tile
+
+    # --- Compose ---
+    def compose(self):
+        """보이는 타일 Blit + 축 라벨 / 통계"""
+        w, h = self.width, self.height
+        if self._blank is None:
+            self._blank = np.empty((h, w, 3), dtype=np.uint8)
+            self._blank[:] = COLOR_BG
+        img = self._blank.copy()
+        result = self.result
+        if result is None:
+            cv2.putText(img, self.status, (w // 2 - 200, h // 2), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (150, 150, 150), 1)
+            return img
+
+        an, axis = result
+        level, off = self.level, self.offset_px
+        base_y = self._base_y(self.center_px)
+        rows = self._visible_rows(base_y)
+        for k in range(max(0, off // TILE_W), -(-min(off + w, self._world_width(level)) // TILE_W)):
+            x = k * TILE_W - off
+            sx1, sx2 = max(0, -x), min(TILE_W, w - x)
+            if sx2 <= sx1: continue
+            for row in rows:
+                tile = self._tile(result, level, k, row)
+                y = base_y + row * TILE_H
+                sy1, sy2 = max(0, -y), min(TILE_H, h - y)
+                if sy2 > sy1:
+                    img[y + sy1:y + sy2, x + sx1:x + sx2] = tile[sy1:sy2, sx1:sx2]
+
+        # Y 라벨
+        ns_step = _ns_step(self.scale_y)
+        for i in range(-32, 33):
+            ly = base_y - int(i * ns_step * self.scale_y)
+            if 70 <= ly < h - 20:
+                cv2.putText(img, f"{i * ns_step}ns", (5, ly - 2), cv2.FONT_HERSHEY_PLAIN, 0.8, COLOR_AXIS, 1)
+
+        # 시간 라벨 (첫 PCR 기준 상대 초)
+        pps = self._px_per_sec(axis, level)
+        step = _time_step(pps)
+        t_left = off / pps
+        g = max(0.0, np.ceil(t_left / step) * step)
+        while (g - t_left) * pps < w and g <= axis[-1]:
+            gx = int(round((g - t_left) * pps))
+            cv2.putText(img, f"{g:.3f}s" if step < 1 else f"{g:.0f}s", (gx + 3, h - 6), cv2.FONT_HERSHEY_PLAIN, 0.8, COLOR_AXIS, 1)
+            g += step
+
+        info = (f"PCR PID 0x{self.pid:X} | Bitrate: {an.bitrate / 1_000_000:.2f} Mbps | "
+                f"Timing Max: {max(abs(an.max_jitter), abs(an.min_jitter)):.0f}ns | Align Max: {an.max_align_jitter:.0f}ns")
+        cv2.putText(img, info, (20, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.55, COLOR_TEXT, 1)
+        cv2.putText(img, f"Zoom x{1 << level} | {len(axis):,} PCRs", (w - 230, 55),
+                    cv2.FONT_HERSHEY_SIMPLEX, 0.45, COLOR_AXIS, 1)
+        cv2.putText(img, "Drag: pan  Wheel: zoom  Shift+Wheel: Y zoom  Double-click: fit", (20, 55),
+                    cv2.FONT_HERSHEY_SIMPLEX, 0.4, (120, 120, 120), 1)
+        return img
+
+    # --- Interaction ---
+    def _clamp(self):
+        world = self._world_width(self.level)
+        self.offset_px = int(min(max(self.offset_px, -self.width // 2), world - self.width // 2))
+
+    def zoom_x(self, direction, anchor_x):
+        """X 줌 레벨 변경 (anchor_x 화면 위치의 시간 고정)"""
+        new_level = min(MAX_LEVEL, max(0, self.level + direction))
+        if new_level == self.level: return
+        world_x = self.offset_px + anchor_x
+        world_x = world_x * 2 if new_level > self.level else world_x // 2
+        self.level = new_level
+        self.offset_px = world_x - anchor_x
+        self._clamp()
+        self._dirty = True
+
+    def zoom_y(self, factor):
+        self.scale_y *= factor
+        self._dirty = True
+
+    def pan(self, dx, dy):
+        self.offset_px -= int(dx)
+        self.center_px += int(dy)
+        self._clamp()
+        self._dirty = True
+
+    def fit(self):
+        self.level, self.offset_px, self.center_px = 0, 0, 0
+        if self.result is not None:
+            self.scale_y = self._fit_scale_y(self.result[0])
+        self._dirty = True
+
+    def _mouse_cb(self, event, x, y, flags, param):
+        if event == cv2.EVENT_LBUTTONDOWN:
+            self._drag = (x, y)
+        elif event == cv2.EVENT_LBUTTONUP:
+            self._drag = None
+        elif event == cv2.EVENT_MOUSEMOVE and self._drag and (flags & cv2.EVENT_FLAG_LBUTTON):
+            self.pan(x - self._drag[0], y - self._drag[1])
+            self._drag = (x, y)
+        elif event == cv2.EVENT_LBUTTONDBLCLK:
+            self.fit()
+        elif event == cv2.EVENT_MOUSEWHEEL:
+            up = cv2.getMouseWheelDelta(flags) > 0
+            if flags & cv2.EVENT_FLAG_SHIFTKEY:
+                self.zoom_y(1.25 if up else 0.8)
+            else:
+                self.zoom_x(1 if up else -1, x)
@@ -0,0 +1,235 @@
+"""
+[파일 개요]
+PID별 PUSI(PES/Section 시작) 위치 인덱스 (TSPacketIndex)
+
+[목적 및 필요성]
+GUI의 이전/다음 PES Start 탐색은 read_packet_at()으로 패킷을 1개씩 읽으며 최대 50만 번 반복했기 때문에,
+PES 단위가 큰 4K HEVC 스트림에서는 버튼 한 번에 화면이 수 초간 멈췄습니다.
+이 모듈은 백그라운드 스레드에서 파일을 Chunk 단위로 읽어 PID별 PUSI 패킷 인덱스를 만들고,
+탐색 요청은 인덱스에서 이진 탐색(np.searchsorted)으로 즉시 응답합니다.
+인덱스가 아직 해당 구간을 덮지 못했으면 그 구간만 Chunk 단위(정방향/역방향)로 읽어 찾습니다.
+같은 패스에서 PCR / PTS가 있는 패킷(후보만 디코딩)의 값도 PID별로 모아, 시각 -> 패킷 인덱스 이동(Go To)도 이진 탐색으로 처리합니다.
+    - 시각은 PID별 첫 값 기준 상대 초 (33bit wrap 보정)
+    - PTS 역순(B-frame)이나 PCR 역행이 있어도 탐색이 가능하도록 누적 최대값(도달 시각) 배열에서 탐색
+
+[사용법]
+    index = TSPacketIndex("a.ts")
+    index.start()                               # 백그라운드 구축 시작
+    idx = index.find_next(0x100, cur_idx)       # 다음 PUSI 패킷 인덱스 (-1: 없음)
+    idx = index.find_prev(0x100, cur_idx)       # 이전 PUSI 패킷 인덱스 (-1: 없음)
+    idx = index.find_time('pcr', 0x100, 2530.5) # 첫 PCR 후 2530.5초에 처음 도달한 패킷 (-1: 아직 인덱스되지 않음)
+"""
+import os
+import threading
+import time
+
+import numpy as np
+
+from ts_columns import TS_PACKET_SIZE, packets_view, decode_headers, decode_columns, read_chunks
+
+INDEX_CHUNK_PACKETS = 16384         # 인덱스 구축 시 한 번에 읽는 패킷 수 (약 3MB)
+FALLBACK_CHUNK_PACKETS = 8192       # 인덱스 미완성 구간 직접 탐색 시 Chunk 크기 (약 1.5MB)
+FALLBACK_MAX_PACKETS = 500000       # 직접 탐색 최대 범위 (기존 GUI 탐색 한도와 동일)
+
+# 시각 인덱스 종류: (클럭 Hz, wrap 주기)
+TIME_KINDS = {
+    'pcr': (27_000_000, (1 << 33) * 300),
+    'pts': (90_000, 1 << 33),
+}
+
+
+class TSPacketIndex:
+    """PID별 PUSI 패킷 위치를 백그라운드에서 수집하는 인덱스"""
+    def __init__(self, file_path, chunk_packets=INDEX_CHUNK_PACKETS):
+        self.file_path = file_path
+        self.chunk_packets = chunk_packets
+        self.total_pkts = os.path.getsize(file_path) // TS_PACKET_SIZE if file_path and os.path.exists(file_path) else 0
+
+        self.indexed_upto = 0       # [0, indexed_upto) 구간의 패킷이 인덱스에 반영됨
+        self.complete = False
+        self.running = False
+
+        self._lock = threading.Lock()
+        self._parts = {}            # { pid: [np.ndarray, ...] } (Chunk별 PUSI 위치)
+        self._merged = {}           # { pid: (part 개수, 합쳐진 배열) } - positions() 캐시
+        self._time_parts = {k: {} for k in TIME_KINDS}     # { kind: { pid: [(패킷 인덱스 배열, 값 배열), ...] } }
+        self._time_merged = {}      # { (kind, pid): (part 개수, (인덱스, 상대 초, 도달 시각)) } - timestamps() 캐시
+        self._thread = None
+
+    # --- Build ---
+    def start(self):
+        """백그라운드 인덱스 구축 시작"""
+        if self.running or self.complete or not self.total_pkts: return
+        self.running = True
+        self._thread = threading.Thread(target=self._build_loop)
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self):
+        self.running = False
+        if self._thread and self._thread.is_alive():
+            self._thread.join(timeout=1.0)
+        self._thread = None
+
+    @property
+    def progress(self):
+        return (self.indexed_upto / self.total_pkts) if self.total_pkts else 1.0
+
+    def _build_loop(self):
+        try:
+            for start_idx, buf in read_chunks(self.file_path, self.indexed_upto, self.chunk_packets,
+                                              lambda: not self.running):
+                pid, pusi = decode_headers(buf)
+                sel = np.nonzero(pusi)[0]
+                if len(sel):
+                    sel_pid = pid[sel]
+                    order = np.argsort(sel_pid, kind='stable')
+                    sel_pid, sel = sel_pid[order], sel[order] + start_idx
+                    bounds = np.nonzero(np.diff(sel_pid))[0] + 1
+                    with self._lock:
+                        for grp_pid, grp in zip(sel_pid[np.r_[0, bounds]].tolist(), np.split(sel, bounds)):
+                            self._parts.setdefault(grp_pid, []).append(grp)
+                self._index_times(buf, pid, pusi, start_idx)
+                self.indexed_upto = start_idx + len(buf) // TS_PACKET_SIZE
+                time.sleep(0)   # GUI 스레드에 GIL 양보
+            else:
+                self.complete = self.running
+        finally:
+            self.running = False
+
+    def _index_times(self, buf, pid, pusi, start_idx):
+        """PCR / PTS 값 수집 (PUSI 또는 PCR_flag 후보 패킷만 디코딩)"""
+        pk = packets_view(buf)
+        pcr_cand = ((pk[:, 3] & 0x20) != 0) & (pk[:, 4] > 0) & ((pk[:, 5] & 0x10) != 0)
+        cand = np.nonzero(pusi | pcr_cand)[0]
+        if not len(cand): return
+        cols = decode_columns(pk[cand])
+        for kind in TIME_KINDS:
+            vals = cols[kind]
+            ok = np.nonzero(vals >= 0)[0]
+            if not len(ok): continue
+            t_pid = pid[cand[ok]]
+            order = np.argsort(t_pid, kind='stable')
+            t_pid, ok = t_pid[order], ok[order]
+            bounds = np.nonzero(np.diff(t_pid))[0] + 1
+            parts = self._time_parts[kind]
+            with self._lock:
+                for grp_pid, grp in zip(t_pid[np.r_[0, bounds]].tolist(), np.split(ok, bounds)):
+                    parts.setdefault(grp_pid, []).append((cand[grp] + start_idx, vals[grp]))
+
+    # --- Query ---
+    def positions(self, pid):
+        """지금까지 인덱스된 PID의 PUSI 패킷 위치 (오름차순 배열)"""
+        with self._lock:
+            parts = self._parts.get(pid)
+            if not parts:
+                return np.zeros(0, dtype=np.int64)
+            cached = self._merged.get(pid)
+            if cached is not None and cached[0] == len(parts):
+                return cached[1]
+            arr = np.concatenate(parts)
+            self._parts[pid] = [arr]
+            self._merged[pid] = (1, arr)
+            return arr
+
+    def time_pids(self, kind):
+        """kind('pcr' / 'pts') 값이 인덱스된 PID 목록"""
+        with self._lock:
+            return sorted(self._time_parts[kind])
+
+    def timestamps(self, kind, pid):
+        """
+        지금까지 인덱스된 PID의 시각 (첫 값 기준 상대 초)
+        :return: (패킷 인덱스 배열, 상대 초 배열, 도달 시각 배열 = 상대 초의 누적 최대값 - 비감소)
+        """
+        with self._lock:
+            parts = self._time_parts[kind].get(pid)
+            if not parts:
+                empty = np.zeros(0, dtype=np.float64)
+                return np.zeros(0, dtype=np.int64), empty, empty
+            key = (kind, pid)
+            cached = self._time_merged.get(key)
+            if cached is not None and cached[0] == len(parts):
+                return cached[1]
+            idx = np.concatenate([p[0] for p in parts])
+            raw = np.concatenate([p[1] for p in parts])
+            self._time_parts[kind][pid] = [(idx, raw)]
+
+        # 33bit wrap 보정: 반 주기 이상 역행하면 wrap으로 간주
+        clock, wrap = TIME_KINDS[kind]
+        unwrapped = raw.astype(np.float64)
+        if len(raw) > 1:
+            back = np.diff(raw) < -(wrap // 2)
+            if back.any():
+                unwrapped[1:] += np.cumsum(back) * float(wrap)
+        rel = (unwrapped - unwrapped[0]) / clock
+        res = (idx, rel, np.maximum.accumulate(rel))
+        with self._lock:
+            self._time_merged[key] = (1, res)
+        return res
+
+    def find_time(self, kind, pid, seconds):
+        """
+        PID의 첫 kind 값 기준 seconds초에 처음 도달한 패킷 인덱스 (이진 탐색)
+        :return: 패킷 인덱스, 인덱스된 구간에 없으면 -1 (구축 중이면 이후 구간에 있을 수 있음)
+        """
+        idx, _, reach = self.timestamps(kind, pid)
+        k = np.searchsorted(reach, seconds, side='left')
+        return int(idx[k]) if k < len(idx) else -1
+
+    def find_next(self, pid, idx):
+        """idx 이후(idx 제외) 첫 PUSI 패킷 인덱스, 없으면 -1"""
+        upto = self.indexed_upto
+        pos = self.positions(pid)
+        k = np.searchsorted(pos, idx, side='right')
+        if k < len(pos):
+            return int(pos[k])
+        if self.complete:
+            return -1
+        return self._scan_forward(pid, max(idx + 1, upto))
+
+    def find_prev(self, pid, idx):
+        """idx 이전(idx 제외) 마지막 PUSI 패킷 인덱스, 없으면 -1"""
+        upto = self.indexed_upto
+        if idx > upto:
+            # 인덱스가 덮지 못한 [upto, idx) 구간을 역방향으로 먼저 탐색
+            found = self._scan_backward(pid, idx, upto)
+            if found >= 0:
+                return found
+            idx = upto
+        pos = self.positions(pid)
+        k = np.searchsorted(pos, idx, side='left')
+        return int(pos[k - 1]) if k > 0 else -1
+
+    # --- Fallback (인덱스 미완성 구간 직접 읽기) ---
+    def _scan_forward(self, pid, start, limit=FALLBACK_MAX_PACKETS):
+        """[start, min(total_pkts, start + limit)) 구간을 앞에서부터 Chunk 단위로 탐색"""
+        end = min(self.total_pkts, start + limit)
+        if start >= end:
+            return -1
+        for chunk_start, buf in read_chunks(self.file_path, start, FALLBACK_CHUNK_PACKETS):
+            # 마지막 Chunk는 end까지만 검사 (구간 밖 위치를 반환하지 않음)
+            buf = buf[:(end - chunk_start) * TS_PACKET_SIZE]
+            c_pid, c_pusi = decode_headers(buf)
+            hit = np.nonzero((c_pid == pid) & c_pusi)[0]
+            if len(hit):
+                return chunk_start + int(hit[0])
+            if chunk_start + len(c_pid) >= end:
+                break
+        return -1
+
+    def _scan_backward(self, pid, end, stop, limit=FALLBACK_MAX_PACKETS):
+        """[max(stop, end - limit), end) 구간을 뒤에서부터 Chunk 단위로 탐색"""
+        lower = max(stop, end - limit, 0)
+        with open(self.file_path, "rb") as f:
+            hi = end
+            while hi > lower:
+                lo = max(lower, hi - FALLBACK_CHUNK_PACKETS)
+                f.seek(lo * TS_PACKET_SIZE)
+                buf = f.read((hi - lo) * TS_PACKET_SIZE)
+                c_pid, c_pusi = decode_headers(buf)
+                hit = np.nonzero((c_pid == pid) & c_pusi)[0]
+                if len(hit):
+                    return lo + int(hit[-1])
+                hi = lo
+        return -1
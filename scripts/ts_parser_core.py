@@ -8,6 +8,7 @@ import os
 import threading
 import time
 import zlib
+from collections import OrderedDict
 
 # Stream Type 정의 (ISO/IEC 13818-1)
 STREAM_TYPES = {
@@ -16,6 +17,11 @@ STREAM_TYPES = {
     0x24: "H.265 (HEVC)", 0x81: "AC3 Audio"
 }
 
+# 랜덤 접근 읽기 캐시 (read_packet_at / read_packets)
+# mmap을 쓰기 어려운 환경(네트워크 파일시스템 등)에서 같은 주변 구간을 반복해서 읽는 비용을 줄입니다.
+CACHE_BLOCK_PACKETS = 348                   # 블록 크기: 348 * 188 = 65,424 bytes (약 64KB, 패킷 경계 정렬)
+DEFAULT_CACHE_BUDGET = 16 * 1024 * 1024     # 캐시 메모리 한도 (bytes, 0이면 캐시 사용 안 함)
+
 class TSParser:
     def __init__(self, file_path):
         self.file_path = file_path
@@ -31,6 +37,14 @@ class TSParser:
         self.last_log = "Ready."
         
         self._thread = None
+
+        # 블록 단위 LRU 읽기 캐시 { block_no: bytes }
+        self.cache_budget = DEFAULT_CACHE_BUDGET
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self._blocks = OrderedDict()
+        self._cache_bytes = 0
+        self._cache_lock = threading.Lock()
         
         # Precompute CRC32 Table for MPEG-2 (Poly: 0x04C11DB7)
         self._crc32_table = []
@@ -84,14 +98,89 @@ class TSParser:
             self.last_log = "Ready."
 
     def read_packet_at(self, index):
-        """특정 인덱스의 패킷(188 bytes)을 읽어서 반환 (Seek 기능용)"""
-        if not os.path.exists(self.file_path): return None
+        """특정 인덱스의 패킷(188 bytes)을 읽어서 반환 (Seek 기능용, 블록 캐시 사용)"""
+        if index < 0: return None
         try:
+            # 캐시 적중 시에는 파일 존재 확인(stat)도 생략 (없는 파일은 블록 읽기에서 예외 -> None)
+            if self.cache_budget <= 0:
+                if not os.path.exists(self.file_path): return None
+                with open(self.file_path, "rb") as f:
+                    f.seek(index * 188)
+                    data = f.read(188)
+            else:
+                block_no, k = divmod(index, CACHE_BLOCK_PACKETS)
+                data = self._get_block(block_no)[k * 188:(k + 1) * 188]
+            return data if len(data) == 188 else None
+        except: return None
+
+    def read_packets(self, index, count):
+        """
+        index부터 최대 count개 패킷을 연속으로 읽어 반환 (bytes, 파일 끝에서는 짧을 수 있음)
+        캐시 한도의 1/4을 넘는 큰 구간은 캐시를 오염시키지 않도록 직접 읽습니다.
+        """
+        if index < 0 or count <= 0 or not os.path.exists(self.file_path): return b''
+        if self.cache_budget <= 0 or count * 188 > self.cache_budget // 4:
             with open(self.file_path, "rb") as f:
                 f.seek(index * 188)
-                data = f.read(188)
-                return data if len(data) == 188 else None
-        except: return None
+                return f.read(count * 188)
+
+        first, last = index // CACHE_BLOCK_PACKETS, (index + count - 1) // CACHE_BLOCK_PACKETS
+        data = b''.join(self._get_block(b) for b in range(first, last + 1))
+        off = (index - first * CACHE_BLOCK_PACKETS) * 188
+        data = data[off:off + count * 188]
+        return data[:len(data) - len(data) % 188]
+
+    def _get_block(self, block_no):
+        """캐시된 블록 반환, 없으면 파일에서 읽어 캐시에 추가 (LRU 순서로 한도 초과분 제거)"""
+        with self._cache_lock:
+            data = self._blocks.get(block_no)
+            if data is not None:
+                self._blocks.move_to_end(block_no)
+                self.cache_hits += 1
+                return data
+            self.cache_misses += 1
+
+        block_bytes = CACHE_BLOCK_PACKETS * 188
+        with open(self.file_path, "rb") as f:
+            f.seek(block_no * block_bytes)
+            data = f.read(block_bytes)
+
+        # 파일 끝의 짧은 블록은 캐시하지 않음 (녹화 중인 파일처럼 커지는 경우 다음 읽기에서 새 데이터를 반영)
+        if len(data) < block_bytes: return data
+
+        with self._cache_lock:
+            if block_no not in self._blocks:
+                self._blocks[block_no] = data
+                self._cache_bytes += len(data)
+            self._evict()
+        return data
+
+    def _evict(self):
+        while self._cache_bytes > self.cache_budget and len(self._blocks) > 1:
+            _, old = self._blocks.popitem(last=False)
+            self._cache_bytes -= len(old)
+
+    def set_cache_budget(self, nbytes):
+        """캐시 메모리 한도 변경 (0: 캐시 비활성화 및 비움)"""
+        with self._cache_lock:
+            self.cache_budget = max(0, int(nbytes))
+            if self.cache_budget == 0:
+                self._blocks.clear()
+                self._cache_bytes = 0
+            else:
+                self._evict()
+
+    def clear_cache(self):
+        with self._cache_lock:
+            self._blocks.clear()
+            self._cache_bytes = 0
+
+    def cache_stats(self):
+        """{'hits', 'misses', 'hit_ratio', 'blocks', 'bytes', 'budget'}"""
+        total = self.cache_hits + self.cache_misses
+        return {'hits': self.cache_hits, 'misses': self.cache_misses,
+                'hit_ratio': (self.cache_hits / total) if total else 0.0,
+                'blocks': len(self._blocks), 'bytes': self._cache_bytes, 'budget': self.cache_budget}
 
     def calculate_crc32(self, data):
         """MPEG2-TS CRC32 Calculation (Using Table)"""
@@ -0,0 +1,202 @@
+"""
+[파일 개요]
+PES 진행 위치 캐시 (PESProgressCache)
+
+[목적 및 필요성]
+GUI의 PES 패널은 PES Continuation 패킷을 표시할 때마다(매 프레임) 최대 10,000 패킷(약 1.9MB)을 다시 읽고
+Python 루프로 역추적하여 PES 시작 위치와 진행률(몇 번째 패킷인지, 누적 바이트)을 계산했습니다.
+이 모듈은 그 결과를 (PID, 패킷 인덱스) 단위로 기억하고,
+    - 이미 계산된 위치: 즉시 반환
+    - 한 칸 앞/뒤 이동: 이웃 위치의 결과 + 현재 패킷(메모리에 있음)만으로 증분 계산
+    - 그 외(점프 등): 백그라운드 스레드에서 PUSI 인덱스로 시작 위치를 찾고 한 번의 Chunk 읽기로 계산
+하므로 렌더 루프에서는 파일 I/O가 발생하지 않습니다.
+
+[결과 항목] (dict)
+    start_idx    : PES 시작 패킷 인덱스 (-1: 탐색 범위 내 없음)
+    seq          : 시작 패킷부터 현재 패킷 직전까지 같은 PID 패킷 수 (현재 패킷의 순번)
+    acc_bytes    : 위 패킷들의 Payload 누적 바이트 (현재 패킷 제외)
+    pes_length   : 시작 패킷의 PES_packet_length (None: PES 헤더 아님)
+    cur_match    : 현재 패킷이 대상 PID인지
+    cur_len      : 현재 패킷의 Payload 길이
+"""
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from ts_columns import TS_PACKET_SIZE, decode_columns
+
+MAX_ENTRIES = 4096              # 기억할 (PID, 인덱스) 결과 수 (LRU)
+MAX_BACKTRACK = 200000          # 시작 위치 탐색/누적 계산 최대 범위 (패킷 수, 약 37MB)
+READ_CHUNK_PACKETS = 16384
+
+
+def _packet_info(packet):
+    """(pid, pusi, payload 길이) - 현재 패킷(메모리)에서 추출"""
+    pid = ((packet[1] & 0x1F) << 8) | packet[2]
+    pusi = (packet[1] & 0x40) != 0
+    adapt = (packet[3] >> 4) & 0x3
+    off = 4
+    if adapt & 0x2: off = 5 + packet[4]
+    if not adapt & 0x1: off = TS_PACKET_SIZE
+    return pid, pusi, max(0, TS_PACKET_SIZE - off)
+
+
+class PESProgressCache:
+    """(PID, 패킷 인덱스)별 PES 진행 정보를 기억하고 백그라운드에서 계산하는 클래스"""
+    def __init__(self, parser, packet_index=None, max_entries=MAX_ENTRIES):
+        self.parser = parser
+        self.packet_index = packet_index
+        self.max_entries = max_entries
+
+        self._memo = OrderedDict()      # { (pid, idx): result dict }
+        self._lock = threading.Lock()
+        self._pending = None            # (pid, idx, packet) - 가장 최근 요청만 계산
+        self._wake = threading.Event()
+        self._thread = None
+        self._closed = False
+
+    def get(self, pid, idx, packet):
+        """
+        PES 진행 정보 조회 (GUI 스레드, 파일 I/O 없음)
+        :param packet: idx 위치의 패킷 데이터 (188 bytes, 이미 읽은 것)
+        :return: 결과 dict, 아직 계산 중이면 None
+        """
+        key = (pid, idx)
+        with self._lock:
+            res = self._memo.get(key)
+            if res is not None:
+                self._memo.move_to_end(key)
+                return res
+            prev = self._memo.get((pid, idx - 1))
+            nxt = self._memo.get((pid, idx + 1))
+
+        res = self._derive(pid, idx, packet, prev, nxt)
+        if res is not None:
+            self._store(key, res)
+            return res
+
+        self._request(pid, idx, packet)
+        return None
+
+    def peek(self, pid, idx):
+        """계산된 결과만 조회 (계산 요청 없음, 렌더 캐시 key 용도)"""
+        with self._lock:
+            return self._memo.get((pid, idx))
+
+    def clear(self):
+        with self._lock:
+            self._memo.clear()
+            self._pending = None
+
+    def close(self):
+        self._closed = True
+        self._wake.set()
+
+    # --- 증분 계산 ---
+    def _derive(self, pid, idx, packet, prev, nxt):
+        c_pid, c_pusi, c_len = _packet_info(packet)
+        match = c_pid == pid
+
+        # 현재 패킷이 대상 PID의 시작 패킷이면 계산 불필요
+        if match and c_pusi:
+            return self._make(idx, 0, 0, self._pes_length(packet), True, c_len)
+
+        # 한 칸 앞으로: 직전 패킷(prev)의 기여분을 더함
+        if prev is not None and prev['start_idx'] >= 0:
+            seq, acc = prev['seq'], prev['acc_bytes']
+            if prev['cur_match']:
+                seq, acc = seq + 1, acc + prev['cur_len']
+            return self._make(prev['start_idx'], seq, acc, prev['pes_length'], match, c_len)
+
+        # 한 칸 뒤로: 다음 패킷(nxt)의 값에서 현재 패킷의 기여분을 뺌 (nxt가 시작 패킷이면 이전 PES이므로 불가)
+        if nxt is not None and 0 <= nxt['start_idx'] < idx + 1:
+            seq, acc = nxt['seq'], nxt['acc_bytes']
+            if match:
+                seq, acc = seq - 1, acc - c_len
+            return self._make(nxt['start_idx'], seq, acc, nxt['pes_length'], match, c_len)
+        return None
+
+    @staticmethod
+    def _make(start_idx, seq, acc, pes_length, cur_match, cur_len):
+        return {'start_idx': start_idx, 'seq': seq, 'acc_bytes': acc, 'pes_length': pes_length,
+                'cur_match': cur_match, 'cur_len': cur_len}
+
+    def _pes_length(self, packet):
+        _, _, c_len = _packet_info(packet)
+        info = self.parser.parse_pes_header(packet[TS_PACKET_SIZE - c_len:]) if c_len else None
+        return info['pes_length'] if info else None
+
+    def _store(self, key, res):
+        with self._lock:
+            self._memo[key] = res
+            self._memo.move_to_end(key)
+            while len(self._memo) > self.max_entries:
+                self._memo.popitem(last=False)
+
+    # --- 백그라운드 계산 ---
+    def _request(self, pid, idx, packet):
+        with self._lock:
+            self._pending = (pid, idx, packet)
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._worker_loop)
+            self._thread.daemon = True
+            self._thread.start()
+        self._wake.set()
+
+    def _worker_loop(self):
+        while not self._closed:
+            self._wake.wait()
+            self._wake.clear()
+            with self._lock:
+                job, self._pending = self._pending, None
+            if job is None or self._closed: continue
+            pid, idx, packet = job
+            try:
+                res = self._compute(pid, idx, packet)
+            except Exception as e:
+                print(f"[Error] PES progress failed: {e}")
+                res = self._make(-1, 0, 0, None, False, 0)
+            self._store((pid, idx), res)
+
+    def _find_start(self, pid, idx):
+        """idx 이전의 PUSI 패킷 위치 (PUSI 인덱스 우선, 없으면 -1)"""
+        if self.packet_index is not None:
+            return self.packet_index.find_prev(pid, idx)
+        return -1
+
+    def _compute(self, pid, idx, packet):
+        c_pid, _, c_len = _packet_info(packet)
+        match = c_pid == pid
+        lower = max(0, idx - MAX_BACKTRACK)
+
+        start = self._find_start(pid, idx)
+        if self.packet_index is not None and start < lower:
+            return self._make(-1, 0, 0, None, match, c_len)
+
+        # [start, idx) 구간을 읽어 같은 PID 패킷 수와 Payload 바이트를 한 번에 계산
+        # (인덱스가 없으면 같은 구간을 역방향으로 읽으며 시작 위치도 함께 찾음)
+        # (TSParser.read_packets: 짧은 구간은 블록 캐시로 처리, 긴 구간은 직접 읽기)
+        seq, acc, pes_length = 0, 0, None
+        hi = idx
+        lo_limit = start if start >= 0 else lower
+        while hi > lo_limit:
+            lo = max(lo_limit, hi - READ_CHUNK_PACKETS)
+            buf = self.parser.read_packets(lo, hi - lo)
+            cols = decode_columns(buf, lo)
+            sel = cols['pid'] == pid
+            if start < 0:
+                hits = np.nonzero(sel & cols['pusi'])[0]
+                if len(hits):
+                    start = lo + int(hits[-1])
+                    sel[:hits[-1]] = False
+                    lo_limit = start
+            seq += int(np.count_nonzero(sel))
+            acc += int((TS_PACKET_SIZE - cols['payload_off'][sel].astype(np.int64)).sum())
+            if start >= lo:
+                k = (start - lo) * TS_PACKET_SIZE
+                pes_length = self._pes_length(buf[k:k + TS_PACKET_SIZE])
+            hi = lo
+        if start < 0:
+            return self._make(-1, 0, 0, None, match, c_len)
+        return self._make(start, seq, acc, pes_length, match, c_len)
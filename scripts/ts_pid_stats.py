@@ -0,0 +1,205 @@
+"""
+[파일 개요]
+PID별 통계 테이블 (PIDStatsTable)
+
+[목적 및 필요성]
+기존 TSScanner.stats는 PID를 키로 하는 dict of dict이며, 패킷마다 문자열 키 필드를 갱신하므로
+대용량 파일에서 느리고 메모리도 많이 사용합니다.
+PIDStatsTable은 PID(0~8191)를 인덱스로 하는 NumPy 배열(컬럼)로 통계를 보관하고,
+ts_columns.decode_columns()가 만든 패킷 묶음 단위로 np.bincount / np.add.at 등을 사용해 한 번에 갱신합니다.
+리포트 / GUI / 공유 메모리 게시 코드는 get(pid), pids(), summary() 등의 접근자를 통해 값을 읽습니다.
+"""
+import numpy as np
+
+from ts_columns import NUM_PIDS
+from ts_cc_checker import ContinuityChecker
+
+PCR_HZ = 27_000_000.0
+PTS_HZ = 90_000.0
+MAX_TS_GAP = 5.0        # 이 이상 벌어진 PCR/PTS 간격은 불연속으로 간주 (초)
+
+_INT64_MAX = np.iinfo(np.int64).max
+
+
+def _prev_in_group(pids, values, last):
+    """
+    파일 순서의 이벤트(pids, values)를 PID별로 묶어 각 이벤트의 '같은 PID 직전 값'을 구합니다.
+    그룹의 첫 이벤트는 이전 Chunk에서 이어지는 last[pid]를 사용하고, 처리 후 last[pid]를 그룹의 마지막 값으로 갱신합니다.
+    :return: (pid, value, prev) - PID 기준 안정 정렬 순서
+    """
+    order = np.argsort(pids, kind='stable')
+    p = pids[order]
+    v = values[order]
+
+    first = np.ones(len(p), dtype=bool)
+    first[1:] = p[1:] != p[:-1]
+    tail = np.ones(len(p), dtype=bool)
+    tail[:-1] = first[1:]
+
+    prev = np.empty_like(v)
+    prev[1:] = v[:-1]
+    prev[first] = last[p[first]]
+    last[p[tail]] = v[tail]
+    return p, v, prev
+
+
+class PIDStatsTable:
+    """PID 인덱스 기반 컬럼형 통계 저장소"""
+    def __init__(self):
+        z = lambda dtype=np.int64: np.zeros(NUM_PIDS, dtype=dtype)
+
+        self.count = z()                                            # 패킷 수
+        self.cc = ContinuityChecker()                               # CC 검사 (ETR-290과 결과 공유)
+        self.cc_errors = self.cc.errors                             # CC 에러 수
+        self.last_cc = self.cc.last_cc                              # 마지막 Payload 패킷의 CC (-1: 없음)
+        self.scrambled = z()                                        # 스크램블 패킷 수
+
+        # Packet Arrival Interval (Byte 단위)
+        self.last_pkt_offset = np.full(NUM_PIDS, -1, dtype=np.int64)
+        self.pkt_intv_sum = z()
+        self.pkt_intv_count = z()
+        self.pkt_intv_max = z()
+        self.pkt_intv_min = np.full(NUM_PIDS, _INT64_MAX, dtype=np.int64)
+
+        # PES Length (PUSI=1 & PES Start Code)
+        self.pes_len_sum = z()
+        self.pes_count = z()
+
+        # PCR (초 단위 간격)
+        self.last_pcr = np.full(NUM_PIDS, np.nan)
+        self.pcr_intv_sum = z(np.float64)
+        self.pcr_intv_count = z()
+        self.pcr_intv_min = np.full(NUM_PIDS, np.inf)
+        self.pcr_intv_max = z(np.float64)
+        self.pcr_samples = {}       # { pid: [(offset, pcr_sec), ...] } - Jitter 분석용 원본 (PCR 패킷만)
+
+        # PTS (초 단위 간격)
+        self.last_pts = np.full(NUM_PIDS, np.nan)
+        self.pts_intv_sum = z(np.float64)
+        self.pts_intv_count = z()
+
+    # --- Bulk Update ---
+    def update(self, cols, lap=None):
+        """
+        decode_columns() 결과(패킷 묶음 1개)로 모든 통계를 갱신
+        :param lap: 단계별 계측 함수 lap(stage) (CC 검사는 'cc', 나머지는 'stats'로 누적, None이면 계측 안 함)
+        :return: 이 묶음의 CC 검사 결과 (err_pid, err_offset) - TSETR290Analyzer.process_columns()에 전달 가능
+        """
+        pid = cols['pid'].astype(np.int64)
+        if len(pid) == 0: return None
+
+        self.count += np.bincount(pid, minlength=NUM_PIDS)
+        self.scrambled += np.bincount(pid[cols['scram'] != 0], minlength=NUM_PIDS)
+        if lap: lap('stats')
+
+        cc_result = self.cc.check(cols)
+        if lap: lap('cc')
+        self._update_arrival(pid, cols['offset'])
+
+        pes = cols['pes_start'] & (cols['pes_len'] > 0)
+        if pes.any():
+            self.pes_len_sum += np.bincount(pid[pes], weights=cols['pes_len'][pes], minlength=NUM_PIDS).astype(np.int64)
+            self.pes_count += np.bincount(pid[pes], minlength=NUM_PIDS)
+
+        self._update_pcr(pid, cols)
+        self._update_pts(pid, cols)
+        if lap: lap('stats')
+        return cc_result
+
+    def _update_arrival(self, pid, offsets):
+        """같은 PID 패킷 사이의 바이트 간격 (합계/개수/최대/최소)"""
+        p, v, prev = _prev_in_group(pid, offsets, self.last_pkt_offset)
+        ok = prev != -1
+        if not ok.any(): return
+        p, diff = p[ok], (v - prev)[ok]
+        self.pkt_intv_sum += np.bincount(p, weights=diff, minlength=NUM_PIDS).astype(np.int64)
+        self.pkt_intv_count += np.bincount(p, minlength=NUM_PIDS)
+        np.maximum.at(self.pkt_intv_max, p, diff)
+        np.minimum.at(self.pkt_intv_min, p, diff)
+
+    def _update_pcr(self, pid, cols):
+        has = cols['pcr'] >= 0
+        if not has.any(): return
+        pcr_pid = pid[has]
+        sec = cols['pcr'][has] / PCR_HZ
+        offs = cols['offset'][has] + 188
+
+        for q in np.unique(pcr_pid).tolist():
+            sel = pcr_pid == q
+            self.pcr_samples.setdefault(q, []).extend(zip(offs[sel].tolist(), sec[sel].tolist()))
+
+        p, v, prev = _prev_in_group(pcr_pid, sec, self.last_pcr)
+        diff = v - prev
+        ok = ~np.isnan(prev) & (diff > 0) & (diff < MAX_TS_GAP)
+        if ok.any():
+            np.add.at(self.pcr_intv_sum, p[ok], diff[ok])
+            np.add.at(self.pcr_intv_count, p[ok], 1)
+            np.minimum.at(self.pcr_intv_min, p[ok], diff[ok])
+            np.maximum.at(self.pcr_intv_max, p[ok], diff[ok])
+
+    def _update_pts(self, pid, cols):
+        has = cols['pts'] >= 0
+        if not has.any(): return
+        p, v, prev = _prev_in_group(pid[has], cols['pts'][has] / PTS_HZ, self.last_pts)
+        diff = v - prev
+        ok = ~np.isnan(prev) & (diff > 0) & (diff < MAX_TS_GAP)
+        if ok.any():
+            np.add.at(self.pts_intv_sum, p[ok], diff[ok])
+            np.add.at(self.pts_intv_count, p[ok], 1)
+
+    # --- Accessors ---
+    def __contains__(self, pid):
+        return 0 <= pid < NUM_PIDS and self.count[pid] > 0
+
+    def pids(self):
+        """패킷이 1개 이상 있는 PID 목록 (오름차순)"""
+        return np.nonzero(self.count)[0].tolist()
+
+    def pcr_pids(self):
+        """PCR이 수집된 PID 목록"""
+        return sorted(self.pcr_samples.keys())
+
+    def pts_pids(self):
+        """PTS 간격이 1개 이상 계산된 PID 목록"""
+        return np.nonzero(self.pts_intv_count)[0].tolist()
+
+    def pid_counts(self):
+        """{ pid: count } (패킷이 있는 PID만)"""
+        nz = np.nonzero(self.count)[0]
+        return dict(zip(nz.tolist(), self.count[nz].tolist()))
+
+    def summary(self):
+        """GUI / 스냅샷용 요약 통계 { pid: {'cc_errors', 'scrambled'} }"""
+        return {pid: {'cc_errors': int(self.cc_errors[pid]), 'scrambled': int(self.scrambled[pid])}
+                for pid in self.pids()}
+
+    def get(self, pid):
+        """
+        PID 1개의 통계를 dict로 반환 (리포트 작성용)
+        간격 값이 없으면 avg/min/max는 None
+        """
+        if not 0 <= pid < NUM_PIDS:
+            return {}
+        pkt_n = int(self.pkt_intv_count[pid])
+        pcr_n = int(self.pcr_intv_count[pid])
+        pts_n = int(self.pts_intv_count[pid])
+        pes_n = int(self.pes_count[pid])
+        return {
+            'count': int(self.count[pid]),
+            'cc_errors': int(self.cc_errors[pid]),
+            'last_cc': int(self.last_cc[pid]),
+            'scrambled': int(self.scrambled[pid]),
+            'pkt_intervals_count': pkt_n,
+            'pkt_avg_intv': (self.pkt_intv_sum[pid] / pkt_n) if pkt_n else None,
+            'pkt_max_intv': int(self.pkt_intv_max[pid]) if pkt_n else None,
+            'pkt_min_intv': int(self.pkt_intv_min[pid]) if pkt_n else None,
+            'pes_count': pes_n,
+            'pes_avg_len': (self.pes_len_sum[pid] / pes_n) if pes_n else None,
+            'pcr_list': self.pcr_samples.get(pid, []),
+            'pcr_intervals_count': pcr_n,
+            'pcr_avg_intv': (self.pcr_intv_sum[pid] / pcr_n) if pcr_n else None,
+            'pcr_min_intv': float(self.pcr_intv_min[pid]) if pcr_n else None,
+            'pcr_max_intv': float(self.pcr_intv_max[pid]) if pcr_n else None,
+            'pts_intervals_count': pts_n,
+            'pts_avg_intv': (self.pts_intv_sum[pid] / pts_n) if pts_n else None,
+        }
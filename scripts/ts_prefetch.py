@@ -0,0 +1,124 @@
+"""
+[파일 개요]
+재생용 패킷 선읽기(Read-ahead) 버퍼 (PacketPrefetcher)
+
+[목적 및 필요성]
+GUI 재생 중에는 프레임마다 update_packet_view() -> read_packet_at()이 호출되고, 매번 파일을 새로 열어 188바이트를 읽습니다.
+x50 배속이나 역방향 재생에서는 렌더링보다 이 I/O 비용이 재생 속도를 결정했습니다.
+이 모듈은 백그라운드 스레드가 재생 커서의 진행 방향(앞/뒤)으로 패킷 구간(윈도우)을 미리 읽어 두고,
+GUI는 메모리에서 패킷을 꺼내 쓰도록 합니다. 윈도우 크기는 재생 속도에 맞춰 조절되며,
+커서가 윈도우 끝에 가까워지면 다음 윈도우를 읽어 한 번에 교체합니다(속성 대입 1회, Lock 불필요).
+
+[사용법]
+    pf = PacketPrefetcher("a.ts")
+    pf.set_cursor(idx, speed)       # 재생 위치 / 속도(패킷/프레임, 음수: 역방향) 통지
+    data = pf.get(idx)              # 선읽기된 패킷 (없으면 None -> 직접 읽기)
+    pf.close()
+"""
+import os
+import threading
+
+from ts_columns import TS_PACKET_SIZE
+
+FRAMES_AHEAD = 120              # 윈도우가 커버할 재생 프레임 수 (약 2~4초)
+MIN_WINDOW_PACKETS = 1024       # 최소 윈도우 (약 190KB)
+MAX_WINDOW_PACKETS = 65536      # 최대 윈도우 (약 12MB)
+BEHIND_RATIO = 0.125            # 진행 반대 방향으로 남겨둘 비율 (한 칸 되돌리기 대비)
+REFILL_RATIO = 0.5              # 진행 방향 잔여가 이 비율 미만이면 다음 윈도우 준비
+
+
+class PacketPrefetcher:
+    """재생 커서 주변 패킷을 백그라운드에서 미리 읽어 두는 버퍼"""
+    def __init__(self, file_path, frames_ahead=FRAMES_AHEAD):
+        self.file_path = file_path
+        self.frames_ahead = frames_ahead
+        self.total_pkts = os.path.getsize(file_path) // TS_PACKET_SIZE if file_path and os.path.exists(file_path) else 0
+
+        self._window = (0, b'')         # (첫 패킷 인덱스, 패킷 데이터) - 교체는 튜플 대입 1회
+        self._cursor = 0
+        self._speed = 1
+        self._wake = threading.Event()
+        self._thread = None
+        self._closed = False
+
+        # 통계 (디버그/프로파일용)
+        self.hits = 0
+        self.misses = 0
+        self.refills = 0
+
+    # --- GUI 스레드 ---
+    def set_cursor(self, idx, speed=1):
+        """재생 위치 통지, 윈도우 잔여가 부족하면 백그라운드 선읽기 요청"""
+        self._cursor = idx
+        self._speed = int(speed) or 1
+        if self._needs_refill():
+            if self._thread is None or not self._thread.is_alive():
+                if self._closed or not self.total_pkts: return
+                self._thread = threading.Thread(target=self._worker_loop)
+                self._thread.daemon = True
+                self._thread.start()
+            self._wake.set()
+
+    def get(self, idx):
+        """선읽기된 패킷 반환 (윈도우 밖이면 None)"""
+        start, data = self._window
+        off = (idx - start) * TS_PACKET_SIZE
+        if 0 <= off and off + TS_PACKET_SIZE <= len(data):
+            self.hits += 1
+            return data[off:off + TS_PACKET_SIZE]
+        self.misses += 1
+        return None
+
+    def close(self):
+        self._closed = True
+        self._wake.set()
+        if self._thread and self._thread.is_alive():
+            self._thread.join(timeout=1.0)
+        self._thread = None
+        self._window = (0, b'')
+
+    # --- 윈도우 계산 ---
+    def window_size(self, speed=None):
+        """재생 속도(패킷/프레임)에 맞춘 윈도우 크기 (패킷 수)"""
+        speed = abs(self._speed if speed is None else speed)
+        return max(MIN_WINDOW_PACKETS, min(MAX_WINDOW_PACKETS, speed * self.frames_ahead))
+
+    def _needs_refill(self):
+        start, data = self._window
+        end = start + len(data) // TS_PACKET_SIZE
+        cur = self._cursor
+        if not start <= cur < end:
+            return True
+        remain = (end - cur) if self._speed > 0 else (cur - start)
+        edge = (end >= self.total_pkts) if self._speed > 0 else (start <= 0)
+        return not edge and remain < self.window_size() * REFILL_RATIO
+
+    def _target_range(self, cur, speed):
+        size = self.window_size(speed)
+        behind = int(size * BEHIND_RATIO)
+        if speed > 0:
+            lo, hi = cur - behind, cur + size - behind
+        else:
+            lo, hi = cur - size + behind + 1, cur + behind + 1
+        lo = max(0, lo)
+        hi = min(self.total_pkts, max(hi, lo))
+        return lo, hi
+
+    # --- 백그라운드 ---
+    def _worker_loop(self):
+        while not self._closed:
+            self._wake.wait()
+            self._wake.clear()
+            if self._closed: break
+            if not self._needs_refill(): continue
+            cur, speed = self._cursor, self._speed
+            lo, hi = self._target_range(cur, speed)
+            try:
+                with open(self.file_path, "rb") as f:
+                    f.seek(lo * TS_PACKET_SIZE)
+                    data = f.read((hi - lo) * TS_PACKET_SIZE)
+            except OSError as e:
+                print(f"[Error] Prefetch failed: {e}")
+                continue
+            self._window = (lo, data[:len(data) - len(data) % TS_PACKET_SIZE])
+            self.refills += 1
@@ -0,0 +1,239 @@
+"""
+[파일 개요]
+렌더 루프 프로파일러 (RenderProfiler) - 패널별 Draw 시간 / 프레임 시간 / FPS / 스캐너 처리량 / 캐시 적중률
+
+[목적 및 필요성]
+GUI 렌더 루프에서 어떤 패널이 얼마나 시간을 쓰는지 알 수 없어 최적화 효과를 비교하기 어려웠습니다.
+이 모듈은 프레임 단위로 구간(Section) 시간을 모아
+    - 최근 N 프레임 평균을 화면 오버레이로 표시 (GUI 'i' 키)
+    - 프레임별 기록을 CSV로 저장 (GUI 'r' 키로 시작/중지, output/Profile_YYYYmmdd_HHMMSS.csv)
+하고, 저장된 CSV들을 열별 평균/p50/p95로 나란히 비교하는 CLI를 제공합니다. (버전 간 비교용)
+
+[사용법]
+    prof = RenderProfiler()
+    prof.begin_frame()
+    with prof.timed('hex'): draw_hex()          # 또는 prof.add('hex', seconds)
+    prof.end_frame({'scan_packets': n, 'parser_cache': (hits, misses), ...})
+
+    python scripts/ts_profiler.py output/Profile_old.csv output/Profile_new.csv
+"""
+import argparse
+import csv
+import datetime
+import os
+import sys
+import time
+from collections import deque
+from contextlib import contextmanager
+
+import numpy as np
+
+FPS_WINDOW = 120                # 오버레이 평균 / 처리량 / 적중률 계산 프레임 수
+CSV_FLUSH_FRAMES = 60
+
+# CSV / 오버레이 구간 (순서 고정, 없는 구간은 0)
+SECTIONS = ['toolbar', 'timeline', 'tree', 'detail', 'pes', 'hex', 'scan', 'menu', 'report', 'overlay', 'imshow', 'wait']
+# 적중률을 계산할 캐시 카운터 (counters[name] = (hits, misses) 누적값)
+CACHES = ['parser_cache', 'prefetch', 'layers', 'text']
+
+
+class RenderProfiler:
+    """프레임 단위 구간 시간 수집기 (오버레이 / CSV 기록)"""
+    def __init__(self, window=FPS_WINDOW):
+        self.enabled = False            # 오버레이 표시
+        self.csv_path = None            # CSV 기록 중이면 파일 경로
+        self.frame_no = 0
+
+        self._frames = deque(maxlen=window)     # [(frame 시작 시각, frame_s, {section: s}, counters)]
+        self._cur = {}
+        self._t0 = None
+        self._start = time.perf_counter()
+        self._csv_file = None
+        self._csv = None
+        self._csv_rows = 0
+
+    @property
+    def active(self):
+        return self.enabled or self._csv is not None
+
+    # --- 수집 ---
+    def begin_frame(self):
+        self._cur = {}
+        self._t0 = time.perf_counter() if self.active else None
+
+    def add(self, name, seconds):
+        if self._t0 is not None:
+            self._cur[name] = self._cur.get(name, 0.0) + seconds
+
+    @contextmanager
+    def timed(self, name):
+        if self._t0 is None:
+            yield
+            return
+        t = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - t)
+
+    def end_frame(self, counters=None):
+        """
+        프레임 종료: 구간 시간 / 카운터 기록
+        :param counters: {'scan_packets': 누적 패킷 수, 'cursor': 패킷 인덱스, 'dirty': bool, CACHES 이름: (hits, misses)}
+        """
+        if self._t0 is None: return
+        now = time.perf_counter()
+        frame = (self._t0, now - self._t0, self._cur, dict(counters or {}))
+        self._frames.append(frame)
+        self.frame_no += 1
+        if self._csv is not None:
+            self._write_row(frame)
+
+    # --- 통계 ---
+    def summary(self):
+        """
+        최근 window 프레임 통계
+        :return: {'fps', 'frame_ms', 'work_ms', 'sections': {name: ms}, 'scan_pps', 'scan_mbps', 'hit': {cache: ratio or None}}
+        """
+        frames = self._frames
+        n = len(frames)
+        res = {'fps': 0.0, 'frame_ms': 0.0, 'work_ms': 0.0, 'sections': {}, 'scan_pps': 0.0, 'scan_mbps': 0.0,
+               'hit': {c: None for c in CACHES}}
+        if not n: return res
+        frame_s = sum(f[1] for f in frames) / n
+        wait_s = sum(f[2].get('wait', 0.0) for f in frames) / n
+        res['frame_ms'] = frame_s * 1000
+        res['work_ms'] = (frame_s - wait_s) * 1000
+        res['sections'] = {s: sum(f[2].get(s, 0.0) for f in frames) / n * 1000 for s in SECTIONS}
+        if n < 2: return res
+
+        first, last = frames[0], frames[-1]
+        span = (last[0] + last[1]) - first[0]
+        if span > 0:
+            res['fps'] = n / span
+            pkts = last[3].get('scan_packets', 0) - first[3].get('scan_packets', 0)
+            res['scan_pps'] = max(0, pkts) / span
+            res['scan_mbps'] = res['scan_pps'] * 188 / 1e6
+        for c in CACHES:
+            if c in first[3] and c in last[3]:
+                hits = last[3][c][0] - first[3][c][0]
+                misses = last[3][c][1] - first[3][c][1]
+                res['hit'][c] = hits / (hits + misses) if hits + misses > 0 else None
+        return res
+
+    # --- 오버레이 ---
+    def draw(self, img, x, y, w=350):
+        """통계 오버레이 (반투명 박스, 박스 영역만 Blending)"""
+        s = self.summary()
+        sec = s['sections']
+        lines = [
+            (f"FPS {s['fps']:5.1f}   frame {s['frame_ms']:6.2f} ms   work {s['work_ms']:6.2f} ms", (0, 255, 255)),
+            (f"toolbar {sec.get('toolbar', 0):5.2f}  timeline {sec.get('timeline', 0):5.2f}  tree {sec.get('tree', 0):5.2f}", (220, 220, 220)),
+            (f"detail {sec.get('detail', 0):5.2f}  pes {sec.get('pes', 0):5.2f}  hex {sec.get('hex', 0):5.2f}  scan {sec.get('scan', 0):5.2f}", (220, 220, 220)),
+            (f"menu {sec.get('menu', 0):5.2f}  imshow {sec.get('imshow', 0):5.2f}  wait {sec.get('wait', 0):6.2f}  overlay {sec.get('overlay', 0):5.2f}", (220, 220, 220)),
+            (f"Scan {s['scan_pps'] / 1e3:9,.0f} kpkt/s  {s['scan_mbps']:7.1f} MB/s", (100, 255, 100)),
+            ("Hit " + "  ".join(f"{c.split('_')[0]} {'-' if r is None else f'{r * 100:.0f}%'}" for c, r in s['hit'].items()), (100, 200, 255)),
+        ]
+        if self.csv_path:
+            lines.append((f"REC {os.path.basename(self.csv_path)} ({self._csv_rows:,})", (80, 80, 255)))
+
+        import cv2  # 오버레이를 그릴 때만 필요 (CSV 비교 CLI는 cv2 없이 실행)
+        h = 12 + 20 * len(lines)
+        roi = img[y:y + h, x:x + w]
+        dark = np.zeros_like(roi)
+        cv2.addWeighted(dark, 0.7, roi, 0.3, 0, roi)
+        cv2.rectangle(img, (x, y), (x + w - 1, y + h - 1), (0, 200, 255), 1)
+        for k, (text, color) in enumerate(lines):
+            cv2.putText(img, text, (x + 8, y + 22 + 20 * k), cv2.FONT_HERSHEY_SIMPLEX, 0.42, color, 1)
+
+    # --- CSV ---
+    def start_csv(self, path=None):
+        """프레임별 기록 시작 (path 생략 시 output/Profile_YYYYmmdd_HHMMSS.csv)"""
+        self.stop_csv()
+        if path is None:
+            root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+            output_dir = os.path.join(root_dir, "output")
+            if not os.path.exists(output_dir):
+                os.makedirs(output_dir)
+            timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+            path = os.path.join(output_dir, f"Profile_{timestamp}.csv")
+        self._csv_file = open(path, "w", newline="", encoding="utf-8")
+        self._csv = csv.writer(self._csv_file)
+        self._csv.writerow(['frame', 'time_s', 'frame_ms', 'work_ms'] + [f"{s}_ms" for s in SECTIONS]
+                           + ['dirty', 'cursor', 'scan_packets'] + [f"{c}_{k}" for c in CACHES for k in ('hits', 'misses')])
+        self._csv_rows = 0
+        self.csv_path = path
+        return path
+
+    def stop_csv(self):
+        """기록 중지 (기록한 파일 경로 반환, 기록 중이 아니면 None)"""
+        path = self.csv_path
+        if self._csv_file is not None:
+            self._csv_file.close()
+        self._csv_file = self._csv = self.csv_path = None
+        return path
+
+    def _write_row(self, frame):
+        t0, frame_s, sections, counters = frame
+        wait = sections.get('wait', 0.0)
+        row = [self.frame_no, f"{t0 - self._start:.4f}", f"{frame_s * 1000:.3f}", f"{(frame_s - wait) * 1000:.3f}"]
+        row += [f"{sections.get(s, 0.0) * 1000:.3f}" for s in SECTIONS]
+        row += [int(bool(counters.get('dirty'))), counters.get('cursor', ''), counters.get('scan_packets', '')]
+        for c in CACHES:
+            row += list(counters.get(c, ('', '')))
+        self._csv.writerow(row)
+        self._csv_rows += 1
+        if self._csv_rows % CSV_FLUSH_FRAMES == 0:
+            self._csv_file.flush()
+
+
+# --- CSV 비교 CLI ---
+def load_csv(path):
+    """CSV -> {열 이름: float 배열} (숫자가 아닌 값은 NaN)"""
+    with open(path, newline="", encoding="utf-8") as f:
+        rows = list(csv.reader(f))
+    if not rows: return {}
+    header, body = rows[0], rows[1:]
+    cols = {}
+    for k, name in enumerate(header):
+        vals = []
+        for r in body:
+            try: vals.append(float(r[k]))
+            except (ValueError, IndexError): vals.append(np.nan)
+        cols[name] = np.array(vals, dtype=np.float64)
+    return cols
+
+
+def compare_csv(paths, out=sys.stdout):
+    """여러 CSV의 *_ms 열을 평균 / p50 / p95로 나란히 출력"""
+    data = [load_csv(p) for p in paths]
+    names = [n for n in data[0] if n.endswith('_ms')] if data else []
+    print("| column | " + " | ".join(os.path.basename(p) + " (mean / p50 / p95)" for p in paths) + " |", file=out)
+    print("|---|" + "---|" * len(paths), file=out)
+    for name in names:
+        cells = []
+        for d in data:
+            v = d.get(name)
+            v = v[~np.isnan(v)] if v is not None else v
+            if v is None or not len(v):
+                cells.append("-")
+            else:
+                cells.append(f"{v.mean():.3f} / {np.percentile(v, 50):.3f} / {np.percentile(v, 95):.3f}")
+        print(f"| {name} | " + " | ".join(cells) + " |", file=out)
+    for p, d in zip(paths, data):
+        frames = len(next(iter(d.values()))) if d else 0
+        t = d.get('time_s')
+        fps = (frames - 1) / (t[-1] - t[0]) if t is not None and frames > 1 and t[-1] > t[0] else 0.0
+        print(f"\n{os.path.basename(p)}: {frames:,} frames, {fps:.1f} FPS", file=out)
+
+
+def _main(argv=None):
+    ap = argparse.ArgumentParser(description="Compare GUI render profiles (CSV recorded with the 'r' key)")
+    ap.add_argument("csv", nargs="+", help="Profile CSV files")
+    args = ap.parse_args(argv)
+    compare_csv(args.csv)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(_main())
@@ -0,0 +1,416 @@
+"""
+[파일 개요]
+BScan 리포트 모델 (ts_report) - 구조화된 결과(dict) 생성 / Markdown 렌더링 / JSON 스트리밍 저장
+
+[목적 및 필요성]
+TSScanner._generate_report()는 Markdown 줄만 만들었기 때문에, 대시보드에 넣으려면 Markdown을 다시 파싱해야 했습니다.
+이 모듈은 스캔 결과를 하나의 모델(JSON 직렬화 가능한 dict)로 만들고, Markdown은 그 모델에서 렌더링합니다.
+    - build_report(scanner)  : 파일 요약 / PSI / Program / PID 통계 / PCR(Jitter) / PTS / ETR-290(개수, 측정값, 위반 위치) / 필터
+    - render_markdown(model) : 기존 BScan 리포트와 같은 Markdown 줄 목록
+    - write_json(model, fp)  : 큰 배열(위반 위치 등)을 한꺼번에 문자열로 만들지 않고 항목 단위로 파일에 기록
+
+[모델 구조] (REPORT_VERSION = 1)
+    summary  : date, file, total_packets, file_size, duration_s, bitrate_bps, video_packets, audio_packets
+    psi_tables, pat_found, programs[{number, type, pmt_pid, pcr_pid, streams[{pid, desc, pcr}]}]
+    pids[{pid, desc, packets, usage_pct, avg_interval_ms, avg_pes_len, cc_errors, scrambled}]
+    pcr[{pid, count, interval_ms{min,max,avg}, jitter{bitrate_bps, min_ns, max_ns, align_max_ns, pass}}]
+    pts[{pid, desc, count, avg_interval_ms, fps}]
+    etr290   : TSETR290Analyzer.to_dict() (priority1, priority2, stats, violations{에러: [[byte_offset, pid], ...]})
+    filters[{name, expr, matches, ratio_pct, first_packet}]
+    scan_profile : ScanStageProfiler.to_dict() (sample_every, sampled_chunks, wall_s, packets_per_s, counters, stages[{stage, seconds, pct}])
+    값이 없으면 null
+
+[사용법]
+    model = build_report(scanner)               # 스캔 완료 후
+    lines = render_markdown(model)
+    with open("report.json", "w") as f: write_json(model, f)
+"""
+import datetime
+import json
+
+import numpy as np
+
+try:
+    from zitter_measurement import TSJitterAnalyzer
+except ImportError:
+    TSJitterAnalyzer = None
+
+REPORT_VERSION = 1
+JITTER_MIN_SAMPLES = 10         # Jitter 분석 최소 PCR 수 (초과)
+JITTER_LIMIT_NS = 500           # ISO/IEC 13818-1 PCR 정확도 한계
+
+PSI_PIDS = {
+    0x0000: "PAT (Program Association Table)",
+    0x0001: "CAT (Conditional Access Table)",
+    0x0002: "TSDT (TS Description Table)",
+    0x0010: "NIT (Network Information Table)",
+    0x0011: "SDT (Service Description Table)",
+    0x0012: "EIT (Event Information Table)",
+    0x0014: "TDT/TOT (Time Date Table)"
+}
+
+
+# --- Model ---
+def build_report(scanner):
+    """스캔 완료된 TSScanner -> 리포트 모델 (ETR-290 finalize 포함, 1회만 호출)"""
+    parser, stats = scanner.parser, scanner.stats
+    total = parser.packet_count
+    model = {
+        'version': REPORT_VERSION,
+        'summary': {
+            'date': datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'file': scanner.file_path,
+            'total_packets': total,
+            'file_size': parser.file_size,
+            'duration_s': None,
+            'bitrate_bps': None,
+            'video_packets': 0,
+            'audio_packets': 0,
+        },
+        'scan_profile': scanner.profile.to_dict(),
+    }
+    if total == 0:
+        return model
+
+    # 전체 재생 시간 추정 (PCR 기반): 모든 PCR 중 가장 빠른 것과 늦은 것
+    first_pcr = last_pcr = None
+    for pid in stats.pcr_pids():
+        pcr_list = stats.get(pid)['pcr_list']
+        if pcr_list:
+            if first_pcr is None or pcr_list[0][1] < first_pcr: first_pcr = pcr_list[0][1]
+            if last_pcr is None or pcr_list[-1][1] > last_pcr: last_pcr = pcr_list[-1][1]
+    duration = 0.0
+    summary = model['summary']
+    if first_pcr is not None:
+        duration = last_pcr - first_pcr
+        summary['duration_s'] = duration
+        if duration > 0:
+            summary['bitrate_bps'] = (total * 188 * 8) / duration
+    for pid, count in parser.pid_counts.items():
+        desc = parser.pid_map.get(pid, {}).get('desc', '')
+        if 'Video' in desc: summary['video_packets'] += count
+        if 'Audio' in desc: summary['audio_packets'] += count
+
+    # PSI / Program 구조
+    model['psi_tables'] = [{'pid': pid, 'name': name, 'packets': parser.pid_counts[pid]}
+                           for pid, name in PSI_PIDS.items() if pid in parser.pid_counts]
+    model['pat_found'] = 0 in parser.pid_counts
+    programs = []
+    for prog_num, prog in sorted(parser.programs.items()):
+        pcr_pid = prog.get('pcr_pid_val', 0x1FFF)
+        programs.append({
+            'number': prog_num,
+            'type': "NIT" if prog_num == 0 else "Program",
+            'pmt_pid': prog['pmt_pid'],
+            'pcr_pid': pcr_pid if pcr_pid != 0x1FFF else None,
+            'streams': [{'pid': pid, 'desc': info['desc'], 'pcr': pid == pcr_pid} for pid, info in prog['pids'].items()],
+        })
+    model['programs'] = programs
+
+    # PID 통계
+    byte_rate = (parser.file_size / duration) if duration > 0 else 0
+    pmt_pids = {p['pmt_pid'] for p in parser.programs.values()}
+    rows = []
+    for pid, count in sorted(parser.pid_counts.items(), key=lambda x: x[1], reverse=True):
+        st = stats.get(pid)
+        desc = "Unknown"
+        if pid == 0: desc = "PAT"
+        elif pid == 0x1FFF: desc = "Null Packet"
+        elif pid in parser.pid_map: desc = parser.pid_map[pid]['desc']
+        if pid in pmt_pids: desc = "PMT"
+        rows.append({
+            'pid': pid,
+            'desc': desc,
+            'packets': count,
+            'usage_pct': count / total * 100,
+            'avg_interval_ms': (st['pkt_avg_intv'] / byte_rate * 1000)
+                               if byte_rate > 0 and st.get('pkt_intervals_count', 0) > 0 else None,
+            'avg_pes_len': st['pes_avg_len'] if st.get('pes_count', 0) > 0 else None,
+            'cc_errors': st.get('cc_errors', 0),
+            'scrambled': st.get('scrambled', 0),
+        })
+    model['pids'] = rows
+
+    # PCR (간격 / Jitter)
+    pcr = []
+    for pid in stats.pcr_pids():
+        st = stats.get(pid)
+        entry = {'pid': pid, 'count': len(st['pcr_list']), 'interval_ms': None, 'jitter': None}
+        if st['pcr_intervals_count']:
+            entry['interval_ms'] = {'min': st['pcr_min_intv'] * 1000, 'max': st['pcr_max_intv'] * 1000,
+                                    'avg': st['pcr_avg_intv'] * 1000}
+        if TSJitterAnalyzer and len(st['pcr_list']) > JITTER_MIN_SAMPLES:
+            analyzer = TSJitterAnalyzer()
+            analyzer.raw_pcr_data = st['pcr_list']
+            analyzer.analyze_full()
+            entry['jitter'] = {
+                'bitrate_bps': float(analyzer.bitrate),
+                'min_ns': float(analyzer.min_jitter),
+                'max_ns': float(analyzer.max_jitter),
+                'align_max_ns': float(getattr(analyzer, 'max_align_jitter', 0)),
+                'pass': abs(analyzer.max_jitter) <= JITTER_LIMIT_NS and abs(analyzer.min_jitter) <= JITTER_LIMIT_NS,
+            }
+        pcr.append(entry)
+    model['pcr'] = pcr
+
+    # PTS (프레임 간격)
+    pts = []
+    for pid in stats.pts_pids():
+        st = stats.get(pid)
+        avg_sec = st['pts_avg_intv']
+        pts.append({'pid': pid, 'desc': parser.pid_map.get(pid, {}).get('desc', 'Unknown'),
+                    'count': st['pts_intervals_count'] + 1, 'avg_interval_ms': avg_sec * 1000,
+                    'fps': 1.0 / avg_sec if avg_sec > 0 else 0})
+    model['pts'] = pts
+
+    # ETR-290 (간격 에러 계산 + Jitter 결과 반영)
+    etr = scanner.etr290
+    if etr:
+        if duration > 0:
+            etr.finalize_analysis(duration, parser.file_size)
+        worst = max([max(abs(p['jitter']['max_ns']), abs(p['jitter']['min_ns'])) for p in pcr if p['jitter']] or [0])
+        if worst > JITTER_LIMIT_NS:
+            etr.errors['PCR_accuracy_error'] = 1    # Flag set
+        model['etr290'] = etr.to_dict()
+    else:
+        model['etr290'] = None
+
+    # 리포트용 필터 표현식
+    model['filters'] = [{'name': name, 'expr': m['expr'].text, 'matches': m['count'],
+                         'ratio_pct': m['count'] / total * 100, 'first_packet': m['first'] if m['first'] >= 0 else None}
+                        for name, m in scanner.filter_matches.items()]
+    return model
+
+
+# --- Markdown ---
+def render_markdown(model):
+    """리포트 모델 -> MTS-430 Style Markdown 줄 목록"""
+    s = model['summary']
+    total = s['total_packets']
+    if total == 0: return ["No packets scanned."]
+
+    lines = []
+    lines.append(f"# MPEG2-TS Analysis Report")
+    lines.append(f"- **Date**: {s['date']}")
+    lines.append(f"- **File**: {s['file']}")
+    lines.append(f"- **Total Packets**: {total:,}")
+    lines.append(f"- **File Size**: {s['file_size']:,} bytes")
+
+    duration = s['duration_s']
+    if duration is not None:
+        lines.append(f"- **Estimated Duration**: {duration:.2f} sec")
+        if duration > 0:
+            lines.append(f"- **Overall Bitrate**: {s['bitrate_bps']/1_000_000:.2f} Mbps")
+            v_pkts, a_pkts = s['video_packets'], s['audio_packets']
+            if v_pkts > 0: lines.append(f"- **Video Packets**: {v_pkts:,} ({v_pkts / duration:.1f} pps)")
+            if a_pkts > 0: lines.append(f"- **Audio Packets**: {a_pkts:,} ({a_pkts / duration:.1f} pps)")
+    lines.append("")
+
+    # --- 1. PSI/SI Structure ---
+    lines.append("## 1. PSI/SI Structure")
+    if model['psi_tables']:
+        lines.append("### Detected Tables")
+        lines.extend(f"- **{t['name']}**: Found ({t['packets']} packets)" for t in model['psi_tables'])
+        lines.append("")
+
+    lines.append("### PAT & Program Hierarchy")
+    if model['pat_found']:
+        lines.append("- **PAT (PID 0x0000)**")
+        for prog in model['programs']:
+            lines.append(f"  - **{prog['type']} {prog['number']}**")
+            lines.append(f"    - PMT PID: 0x{prog['pmt_pid']:04X}")
+            if prog['pcr_pid'] is not None:
+                lines.append(f"    - PCR PID: 0x{prog['pcr_pid']:04X}")
+            if not prog['streams']:
+                lines.append(f"    - (No components found or PMT not parsed)")
+            for es in prog['streams']:
+                desc = es['desc']
+                icon = "📺 " if "Video" in desc else ("🔊 " if "Audio" in desc else "")
+                role = " (PCR)" if es['pcr'] else ""
+                lines.append(f"    - PID 0x{es['pid']:04X}: {icon}{desc}{role}")
+    else:
+        lines.append("- **PAT not found** (Stream might be partial or invalid)")
+    lines.append("")
+
+    # --- 2. PID Statistics (Table) ---
+    lines.append("## 2. PID Statistics & Errors")
+    lines.append("| PID | Type | Count | Usage | Avg Intv (ms) | Avg PES Len | CC Err | Scrambled |")
+    lines.append("|:---:|:---|---:|---:|---:|---:|:---:|:---:|")
+    for r in model['pids']:
+        intv = f"{r['avg_interval_ms']:.2f}" if r['avg_interval_ms'] is not None else "-"
+        pes_len = f"{r['avg_pes_len']:.0f}" if r['avg_pes_len'] is not None else "-"
+        cc_str = f"**{r['cc_errors']}**" if r['cc_errors'] > 0 else "0"
+        scram_str = "Yes" if r['scrambled'] > 0 else "No"
+        lines.append(f"| 0x{r['pid']:04X} | {r['desc']} | {r['packets']:,} | {r['usage_pct']:.1f}% | {intv} | {pes_len} | {cc_str} | {scram_str} |")
+    lines.append("")
+
+    # --- 3. PCR Analysis (Jitter & Interval) ---
+    lines.append("## 3. PCR Analysis (Timing)")
+    for p in model['pcr']:
+        lines.append(f"### PID 0x{p['pid']:04X}")
+        lines.append(f"- **Packet Count**: {p['count']}")
+        iv = p['interval_ms']
+        if iv:
+            lines.append(f"- **Interval**: Min {iv['min']:.2f}ms / Max {iv['max']:.2f}ms / Avg {iv['avg']:.2f}ms")
+            if iv['max'] > 40: lines.append(f"  - ⚠️ Warning: Max Interval > 40ms (DVB recommended)")
+        j = p['jitter']
+        if j:
+            lines.append(f"- **Calculated Bitrate**: {j['bitrate_bps']/1_000_000:.4f} Mbps")
+            lines.append(f"- **Timing Jitter (PCR Accuracy)**:")
+            lines.append(f"  - Min: {j['min_ns']:.0f} ns")
+            lines.append(f"  - Max: {j['max_ns']:.0f} ns")
+            if j['align_max_ns'] > 0:
+                lines.append(f"- **Alignment Jitter**: Max {j['align_max_ns']:.0f} ns")
+            if j['pass']:
+                lines.append(f"  - ✅ **Pass**: Within ISO limit")
+            else:
+                lines.append(f"  - ❌ **Fail**: Exceeds ISO limit (±500ns)")
+        else:
+            lines.append("- **Jitter**: Not enough samples or Analyzer module missing.")
+        lines.append("")
+    if not model['pcr']: lines.append("No PCR packets found.")
+
+    # --- 4. PTS Analysis (Frame Interval) ---
+    lines.append("## 4. PTS Analysis (Presentation Timing)")
+    for p in model['pts']:
+        lines.append(f"* **PID 0x{p['pid']:04X} ({p['desc']})**")
+        lines.append(f"  - Count: {p['count']}")
+        lines.append(f"  - Avg Interval: {p['avg_interval_ms']:.2f} ms")
+        if "Video" in p['desc']:
+            lines.append(f"  - **Estimated FPS**: {p['fps']:.2f}")
+    if not model['pts']: lines.append("No PTS found.")
+    lines.append("")
+
+    # --- 5. ETR-290 Analysis ---
+    if model['etr290']:
+        lines.extend(render_etr290(model['etr290']))
+
+    # --- 6. Filter Expressions ---
+    if model['filters']:
+        lines.append("")
+        lines.append("## 6. Filter Expressions")
+        lines.append("| Name | Expression | Matches | Ratio | First Packet |")
+        lines.append("|:---|:---|---:|---:|---:|")
+        for m in model['filters']:
+            first = f"{m['first_packet']:,}" if m['first_packet'] is not None else "-"
+            lines.append(f"| {m['name']} | `{m['expr']}` | {m['matches']:,} | {m['ratio_pct']:.2f}% | {first} |")
+
+    # --- 7. Scan Profile ---
+    if model.get('scan_profile'):
+        lines.append("")
+        lines.extend(render_scan_profile(model['scan_profile']))
+    return lines
+
+
+def render_scan_profile(prof):
+    """스캐너 단계별 계측 (ScanStageProfiler.to_dict()) -> Markdown 줄 목록"""
+    c = prof['counters']
+    rate = f" ({prof['packets_per_s'] / 1e3:,.0f} kpkt/s)" if prof['packets_per_s'] else ""
+    lines = ["## 7. Scan Profile"]
+    lines.append(f"- **Scan Time**: {prof['wall_s']:.3f} sec for {c['packets']:,} packets{rate}")
+    lines.append(f"- **Counters**: Chunks {c['chunks']:,} / PCR {c['pcr']:,} / PES Headers {c['pes']:,} / "
+                 f"PSI/SI Packets {c['psi']:,} / CC Errors {c['cc_errors']:,}")
+    lines.append(f"- **Stage Timing**: sampled every {prof['sample_every']} chunk(s) "
+                 f"({prof['sampled_chunks']:,} of {c['chunks']:,}), scaled to all packets")
+    lines.append("")
+    lines.append("| Stage | Time (ms) | Share |")
+    lines.append("|:---|---:|---:|")
+    for st in prof['stages']:
+        lines.append(f"| {st['stage']} | {st['seconds'] * 1e3:.1f} | {st['pct']:.1f}% |")
+    return lines
+
+
+def render_etr290(etr):
+    """ETR-290 모델 (TSETR290Analyzer.to_dict()) -> Markdown 줄 목록"""
+    lines = []
+    lines.append("## ETR-290 Analysis Report")
+    stats = etr['stats']
+
+    def get_stat_str(key):
+        st = stats.get(key)
+        return f"(Max: {st['max_ms']:.2f}ms)" if st and 'max_ms' in st else ""
+
+    # Priority 1
+    lines.append("### Priority 1 (Critical)")
+    for k, cnt in etr['priority1'].items():
+        status = "✅ OK" if cnt == 0 else f"❌ **{cnt} Errors**"
+        lines.append(f"- **{k}**: {status} {get_stat_str(k)}")
+    if not any(etr['priority1'].values()): lines.append("> **Result**: Stream is Decodable (No Priority 1 Errors)")
+    else: lines.append("> **Result**: ⚠️ Stream may have decoding issues.")
+    lines.append("")
+
+    # Priority 2 (PCR Accuracy는 외부 Jitter 분석 결과가 없으면 0)
+    lines.append("### Priority 2 (Recommended)")
+    for k, cnt in etr['priority2'].items():
+        status = "✅ OK" if cnt == 0 else f"⚠️ **{cnt} Errors**"
+        lines.append(f"- **{k}**: {status} {get_stat_str(k)}")
+
+    # 상세 측정 통계
+    lines.append("")
+    lines.append("### Detailed Measurement Statistics")
+    lines.append("| Type | Min (ms) | Max (ms) | Avg (ms) | Note |")
+    lines.append("|:---|---:|---:|---:|:---|")
+    stats_map = [
+        ('PCR_repetition_error', 'PCR Interval'),
+        ('PCR_discontinuity_error', 'PCR Discont Check'),
+        ('PTS_error', 'PTS Interval'),
+        ('PAT_error', 'PAT Interval'),
+        ('PMT_error', 'PMT Interval'),
+    ]
+    for key, label in stats_map:
+        st = stats.get(key)
+        if st and 'min_ms' in st:
+            lines.append(f"| {label} | {st['min_ms']:.2f} | {st['max_ms']:.2f} | {st['avg_ms']:.2f} | - |")
+        else:
+            lines.append(f"| {label} | - | - | - | No Data |")
+    return lines
+
+
+# --- JSON ---
+def _json_scalar(v):
+    if isinstance(v, (np.integer,)): return int(v)
+    if isinstance(v, (np.floating,)): v = float(v)
+    if isinstance(v, float) and not np.isfinite(v): return None     # NaN / inf -> null
+    if isinstance(v, (np.bool_,)): return bool(v)
+    return v
+
+
+def write_json(model, fp, indent=1):
+    """
+    리포트 모델을 JSON으로 기록 (dict / list는 항목 단위로 fp.write - 큰 배열도 전체 문자열을 만들지 않음)
+    :param indent: dict 들여쓰기 (스칼라만 담은 list는 한 줄로 기록)
+    """
+    def write(obj, depth):
+        if isinstance(obj, dict):
+            if not obj:
+                fp.write("{}")
+                return
+            pad = "\n" + " " * (indent * (depth + 1))
+            fp.write("{")
+            for k, (key, value) in enumerate(obj.items()):
+                fp.write(("," if k else "") + pad + json.dumps(str(key)) + ": ")
+                write(value, depth + 1)
+            fp.write("\n" + " " * (indent * depth) + "}")
+        elif isinstance(obj, (list, tuple, np.ndarray)):
+            flat = all(not isinstance(v, (dict, list, tuple, np.ndarray)) for v in obj)
+            fp.write("[")
+            pad = "" if flat else "\n" + " " * (indent * (depth + 1))
+            for k, value in enumerate(obj):
+                fp.write(("," if k else "") + pad)
+                write(value, depth + 1)
+            fp.write("]" if flat or not len(obj) else "\n" + " " * (indent * depth) + "]")
+        else:
+            fp.write(json.dumps(_json_scalar(obj), ensure_ascii=False))
+    write(model, 0)
+    fp.write("\n")
+
+
+def save_report(model, base_path):
+    """<base_path>.md / <base_path>.json 저장 -> (md 경로, json 경로)"""
+    md_path, json_path = base_path + ".md", base_path + ".json"
+    with open(md_path, "w", encoding="utf-8") as f:
+        for line in render_markdown(model):
+            f.write(line + "\n")
+    with open(json_path, "w", encoding="utf-8") as f:
+        write_json(model, f)
+    return md_path, json_path
@@ -0,0 +1,383 @@
+"""
+[파일 개요]
+프로세스 분리형 백그라운드 스캐너 (TSScanProcess)
+
+[목적 및 필요성]
+TSScanner 스레드는 GUI(OpenCV 렌더 루프)와 GIL을 공유하므로 스캔 중 화면이 끊기고,
+GUI를 위해 5000 패킷마다 sleep으로 양보하느라 스캔 자체도 느려집니다.
+TSScanProcess는 동일한 TSScanner를 별도 프로세스에서 양보 없이(full speed) 실행하고,
+진행률 / PID 카운트 / 통계 / PSI 구조를 multiprocessing.shared_memory의 고정 레이아웃 배열(8192 PID)에
+게시합니다. GUI는 Lock이나 Pickle 없이 배열을 직접 읽습니다.
+
+[공유 메모리 레이아웃] (int64 배열)
+    HDR (16)             : STATE, PACKET_COUNT, TOTAL_PKTS, VERSION, STOP_REQ, PROG_COUNT, PROG_PID_COUNT
+    PID_COUNTS (8192)    : PID별 패킷 수
+    CC_ERRORS (8192)     : PID별 CC 에러 수
+    SCRAMBLED (8192)     : PID별 스크램블 패킷 수
+    PROGRAMS (256 x 3)   : (prog_num, pmt_pid, pcr_pid)
+    PROG_PIDS (4096 x 3) : (prog_num, es_pid, stream_type) - 같은 ES PID가 여러 Program에 속하면 Program마다 1행
+    PROFILE              : 스캐너 단계별 계측 (ts_scan_profile.pack_profile: 시간은 ns, 카운터)
+
+VERSION은 Seqlock 방식으로 사용합니다. (쓰기 중에는 홀수, 쓰기 완료 시 짝수)
+스캔 완료 시 자식 TSScanner의 최종 결과(리포트 / 리포트 모델 / PIDStatsTable / Program 구조)를 Queue로 한 번 전달하므로,
+완료 후 TSScanProcess는 스레드 TSScanner와 같은 report / report_model / stats를 가집니다.
+"""
+import os
+import sys
+import time
+import multiprocessing as mp
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from ts_parser_core import STREAM_TYPES
+from ts_snapshot import SnapshotPublisher
+from ts_scan_profile import PROFILE_SLOTS, pack_profile, unpack_profile
+
+try:
+    from multiprocessing import shared_memory
+except ImportError:  # Python < 3.8
+    shared_memory = None
+
+NUM_PIDS = 8192
+MAX_PROGRAMS = 256
+MAX_PROG_PIDS = 4096                # (Program, ES PID) 행 최대 개수
+
+# Header Slots
+HDR_STATE = 0
+HDR_PACKET_COUNT = 1
+HDR_TOTAL_PKTS = 2
+HDR_VERSION = 3
+HDR_STOP_REQ = 4
+HDR_PROG_COUNT = 5
+HDR_PROG_PID_COUNT = 6
+HDR_SIZE = 16
+
+# States
+STATE_IDLE = 0
+STATE_RUNNING = 1
+STATE_COMPLETED = 2
+STATE_FAILED = 3
+
+# Array Offsets (int64 단위)
+OFF_PID_COUNTS = HDR_SIZE
+OFF_CC_ERRORS = OFF_PID_COUNTS + NUM_PIDS
+OFF_SCRAMBLED = OFF_CC_ERRORS + NUM_PIDS
+OFF_PROGRAMS = OFF_SCRAMBLED + NUM_PIDS
+OFF_PROG_PIDS = OFF_PROGRAMS + MAX_PROGRAMS * 3
+OFF_PROFILE = OFF_PROG_PIDS + MAX_PROG_PIDS * 3
+TOTAL_SLOTS = OFF_PROFILE + PROFILE_SLOTS
+
+
+class _SharedLayout:
+    """공유 메모리 블록 위의 NumPy View 묶음"""
+    def __init__(self, shm):
+        buf = np.ndarray((TOTAL_SLOTS,), dtype=np.int64, buffer=shm.buf)
+        self.raw = buf
+        self.hdr = buf[:HDR_SIZE]
+        self.pid_counts = buf[OFF_PID_COUNTS:OFF_CC_ERRORS]
+        self.cc_errors = buf[OFF_CC_ERRORS:OFF_SCRAMBLED]
+        self.scrambled = buf[OFF_SCRAMBLED:OFF_PROGRAMS]
+        self.programs = buf[OFF_PROGRAMS:OFF_PROG_PIDS].reshape(MAX_PROGRAMS, 3)
+        self.prog_pids = buf[OFF_PROG_PIDS:OFF_PROFILE].reshape(MAX_PROG_PIDS, 3)
+        self.profile = buf[OFF_PROFILE:]
+
+
+def _attach_shm(name):
+    """
+    자식 프로세스에서 공유 메모리 연결
+    (자식은 부모와 같은 resource_tracker를 사용하므로 해제(unlink)는 부모만 수행)
+    """
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:  # Python < 3.13
+        return shared_memory.SharedMemory(name=name)
+
+
+def _publish(layout, scanner):
+    """스캐너 상태를 공유 메모리에 기록 (Seqlock)"""
+    parser = scanner.parser
+    hdr = layout.hdr
+    hdr[HDR_VERSION] += 1   # 홀수: 쓰기 중
+
+    stats = scanner.stats       # PIDStatsTable: 같은 8192 PID 인덱스 배열이므로 그대로 복사
+    layout.pid_counts[:] = stats.count
+    layout.cc_errors[:] = stats.cc_errors
+    layout.scrambled[:] = stats.scrambled
+
+    progs = sorted(parser.programs.items())[:MAX_PROGRAMS]
+    n = 0
+    for i, (num, prog) in enumerate(progs):
+        layout.programs[i] = (num, prog['pmt_pid'], prog.get('pcr_pid_val', 0x1FFF))
+        for pid, info in sorted(prog['pids'].items()):
+            if n == MAX_PROG_PIDS: break
+            layout.prog_pids[n] = (num, pid, info['type'])
+            n += 1
+    hdr[HDR_PROG_COUNT] = len(progs)
+    hdr[HDR_PROG_PID_COUNT] = n
+    hdr[HDR_PACKET_COUNT] = parser.packet_count
+    layout.profile[:] = pack_profile(scanner.profile.to_dict())
+
+    hdr[HDR_VERSION] += 1   # 짝수: 쓰기 완료
+
+
+def _scan_worker(file_path, shm_name, result_queue, filter_exprs=None):
+    """자식 프로세스 진입점: TSScanner를 양보 없이 실행"""
+    from ts_parser_core import TSParser
+    from ts_scanner import TSScanner
+
+    shm = _attach_shm(shm_name)
+    layout = _SharedLayout(shm)
+    try:
+        parser = TSParser(file_path)
+        scanner = TSScanner(parser)
+        scanner.filter_exprs = dict(filter_exprs or {})
+        layout.hdr[HDR_TOTAL_PKTS] = parser.total_pkts
+
+        def on_progress(sc):
+            _publish(layout, sc)
+            if layout.hdr[HDR_STOP_REQ]:
+                sc.running = False
+
+        scanner.progress_callback = on_progress
+        scanner.progress_interval = 20000
+        scanner.yield_cpu = False
+        scanner.running = True
+        scanner._scan_loop()
+
+        # 최종 결과 전체 (공유 메모리에는 요약 카운터만 있으므로 리포트 모델 / 상세 통계 / Program 구조는 여기서 전달)
+        result_queue.put({
+            'report': scanner.report,
+            'report_model': scanner.report_model,
+            'stats': scanner.stats,
+            'programs': parser.programs,
+            'pid_map': parser.pid_map,
+            'pid_counts': parser.pid_counts,
+            'packet_count': parser.packet_count,
+            'profile': scanner.profile.to_dict(),
+        })
+        layout.hdr[HDR_STATE] = STATE_COMPLETED
+    except Exception as e:
+        result_queue.put({'report': [f"Scan failed: {e}"]})
+        layout.hdr[HDR_STATE] = STATE_FAILED
+    finally:
+        del layout
+        shm.close()
+
+
+class TSScanProcess:
+    """
+    TSScanner와 동일한 인터페이스(start/stop/running/completed/report)를 제공하는 프로세스 분리형 스캐너.
+    GUI는 매 프레임 get_snapshot()(내부적으로 poll())을 호출하여 공유 메모리의 최신 결과를 받습니다.
+    """
+    def __init__(self, parser_instance):
+        self.parser = parser_instance
+        self.file_path = parser_instance.file_path
+        self.report = []
+        self.report_model = None            # 리포트 모델 (ts_report.build_report, 스캔 완료 시 자식에서 전달)
+        self.stats = {}                     # 스캔 중: { pid: {'cc_errors': n, 'scrambled': n} } (요약), 완료 후: PIDStatsTable
+        self.filter_exprs = {}              # 리포트용 필터 표현식 { 이름: 문자열 } (자식 프로세스 TSScanner에 전달)
+        self.profile = None                 # 자식 TSScanner의 단계별 계측 (ScanStageProfiler.to_dict() 구조)
+
+        self._shm = None
+        self._layout = None
+        self._proc = None
+        self._queue = None
+        self._completed = False
+        self._last_version = -1
+        self._last_poll = 0.0
+        self.poll_interval = 0.1            # 공유 메모리 읽기 최소 간격 (10Hz)
+        self.snapshots = SnapshotPublisher(max_hz=0)   # poll()이 이미 주기를 제한하므로 추가 제한 없음
+
+    @staticmethod
+    def is_supported():
+        return shared_memory is not None
+
+    @property
+    def running(self):
+        return self._proc is not None and not self._completed and self._proc.is_alive()
+
+    @property
+    def completed(self):
+        return self._completed
+
+    def start(self):
+        """스캔 프로세스 시작"""
+        if self.running: return
+        self._cleanup()
+
+        # 재시작 시 초기화 (TSScanner.start와 동일)
+        self.parser.packet_count = 0
+        self.parser.pid_counts = {}
+        self.report = []
+        self.report_model = None
+        self.stats = {}
+        self.profile = None
+        self._completed = False
+        self._last_version = 0             # 0: 자식이 아직 게시 전 (초기화된 빈 레이아웃은 읽지 않음)
+        self._last_poll = 0.0
+        self.snapshots.publish(self.parser, self.stats, force=True)
+
+        self._shm = shared_memory.SharedMemory(create=True, size=TOTAL_SLOTS * 8)
+        self._layout = _SharedLayout(self._shm)
+        self._layout.raw[:] = 0
+        self._layout.hdr[HDR_STATE] = STATE_RUNNING
+
+        self._queue = mp.Queue()
+        self._proc = mp.Process(target=_scan_worker, args=(self.file_path, self._shm.name, self._queue, self.filter_exprs))
+        self._proc.daemon = True
+        self._proc.start()
+        self.parser.last_log = "Scanner: Started (process)..."
+
+    def stop(self):
+        """스캔 중단 요청"""
+        if self._layout is not None:
+            self._layout.hdr[HDR_STOP_REQ] = 1
+        if self._proc is not None and self._proc.is_alive():
+            # 중단 시에도 자식은 리포트를 만들고 종료하므로 결과를 먼저 수거
+            self._receive_report(timeout=1.0)
+            self._proc.join(timeout=1.0)
+            if self._proc.is_alive():
+                self._proc.terminate()
+        self.poll(force=True)
+
+    def get_snapshot(self):
+        """최신 통계 스냅샷 반환 (GUI 스레드에서 매 프레임 호출 가능)"""
+        self.poll()
+        if not self.running:
+            self.snapshots.publish(self.parser, self.stats)
+        return self.snapshots.latest
+
+    def get_profile(self):
+        """최근 게시된 단계별 계측 (to_dict() 구조, 아직 없으면 None)"""
+        return self.profile
+
+    def poll(self, force=False):
+        """
+        공유 메모리에서 최신 상태를 읽어 TSParser에 반영 (GUI 스레드에서 호출)
+        :param force: 읽기 간격(poll_interval) 제한 무시
+        :return: 새 데이터가 반영되었으면 True
+        """
+        if self._layout is None: return False
+
+        now = time.monotonic()
+        if not force and not self._completed and now - self._last_poll < self.poll_interval:
+            return False
+        self._last_poll = now
+
+        if not self._completed and self._layout.hdr[HDR_STATE] in (STATE_COMPLETED, STATE_FAILED):
+            self._receive_report(timeout=0)
+        elif not self._completed and self._proc is not None and not self._proc.is_alive():
+            # 자식이 리포트 없이 비정상 종료된 경우 (예: import 실패, 강제 종료)
+            self._receive_report(timeout=0.1)
+            if not self._completed:
+                self._completed = True
+                self.report = [f"Scan process exited unexpectedly (exit code {self._proc.exitcode})"]
+                self.parser.last_log = "Scanner: Failed (process exited)."
+
+        version = int(self._layout.hdr[HDR_VERSION])
+        if version == self._last_version or version % 2 == 1:
+            return False
+
+        data = self._read_consistent()
+        if data is None: return False
+        self._last_version, counts, cc_errors, scrambled, programs, prog_pids, pkt_count, profile = data
+        self.profile = unpack_profile(profile)
+
+        nz = np.nonzero(counts)[0]
+        self.parser.pid_counts = dict(zip(nz.tolist(), counts[nz].tolist()))
+        self.parser.packet_count = pkt_count
+        self.stats = {pid: {'cc_errors': int(cc_errors[pid]), 'scrambled': int(scrambled[pid])} for pid in nz.tolist()}
+
+        new_programs = {}
+        for num, pmt_pid, pcr_pid in programs.tolist():
+            old = self.parser.programs.get(num, {})
+            node = {'pmt_pid': pmt_pid, 'pcr_pid_val': pcr_pid, 'pids': dict(old.get('pids', {}))}
+            new_programs[num] = node
+        new_pid_map = dict(self.parser.pid_map)
+        for num, pid, stype in prog_pids.tolist():
+            info = {'type': stype, 'desc': STREAM_TYPES.get(stype, f"Unk(0x{stype:02X})")}
+            prog = new_programs.get(num)
+            if prog is not None and pid not in prog['pids']:
+                prog['pids'][pid] = info
+            new_pid_map.setdefault(pid, info)
+
+        # 새 객체로 교체 (GUI가 순회 중인 dict를 변경하지 않음)
+        # 자식이 아직 PAT를 파싱하지 못했으면 기존 Program 구조(quick_scan 결과)를 유지
+        if new_programs:
+            self.parser.programs = new_programs
+        self.parser.pid_map = new_pid_map
+        self.snapshots.publish(self.parser, self.stats, force=True)
+        return True
+
+    def close(self):
+        """프로세스 및 공유 메모리 정리"""
+        self.stop()
+        self._cleanup()
+
+    # --- Internal ---
+    def _read_consistent(self, retries=5):
+        """Seqlock 읽기: 읽는 도중 VERSION이 바뀌면 재시도"""
+        lay = self._layout
+        for _ in range(retries):
+            v1 = int(lay.hdr[HDR_VERSION])
+            if v1 % 2 == 1: continue
+            prog_count = int(lay.hdr[HDR_PROG_COUNT])
+            prog_pid_count = int(lay.hdr[HDR_PROG_PID_COUNT])
+            data = (v1, lay.pid_counts.copy(), lay.cc_errors.copy(), lay.scrambled.copy(),
+                    lay.programs[:prog_count].copy(), lay.prog_pids[:prog_pid_count].copy(),
+                    int(lay.hdr[HDR_PACKET_COUNT]), lay.profile.tolist())
+            if int(lay.hdr[HDR_VERSION]) == v1:
+                return data
+        return None
+
+    def _receive_report(self, timeout):
+        if self._completed or self._queue is None: return
+        try:
+            if timeout:
+                result = self._queue.get(timeout=timeout)
+            else:
+                result = self._queue.get_nowait()
+        except Exception:
+            return
+        self._completed = True
+        self.report = result['report']
+        if 'report_model' not in result:
+            self.parser.last_log = "Scanner: Failed."
+            return
+
+        # 자식 TSScanner의 최종 상태로 교체 (이후 공유 메모리는 다시 읽지 않음)
+        self.report_model = result['report_model']
+        self.stats = result['stats']
+        self.profile = result['profile']
+        self.parser.programs = result['programs']
+        self.parser.pid_map = result['pid_map']
+        self.parser.pid_counts = result['pid_counts']
+        self.parser.packet_count = result['packet_count']
+        if self._layout is not None:
+            self._last_version = int(self._layout.hdr[HDR_VERSION])
+        self.snapshots.publish(self.parser, self.stats, force=True)
+        self.parser.last_log = "Scanner: Completed. Report Saved."
+
+    def _cleanup(self):
+        if self._proc is not None and self._proc.is_alive():
+            self._proc.terminate()
+        self._proc = None
+        if self._shm is not None:
+            self._layout = None
+            try:
+                self._shm.close()
+                self._shm.unlink()
+            except Exception:
+                pass
+            self._shm = None
+
+
+def create_scanner(parser_instance, use_process=True):
+    """
+    환경에 맞는 스캐너 생성: shared_memory를 지원하면 TSScanProcess, 아니면 스레드 기반 TSScanner
+    """
+    if use_process and TSScanProcess.is_supported():
+        return TSScanProcess(parser_instance)
+    from ts_scanner import TSScanner
+    return TSScanner(parser_instance)
@@ -0,0 +1,147 @@
+"""
+[파일 개요]
+스캐너 단계별 계측 (ScanStageProfiler) - 읽기 / 헤더 / PCR / PES / 통계 / CC / PSI / ETR-290 / 필터 / 게시
+
+[목적 및 필요성]
+BScan이 느릴 때 디스크 읽기, 컬럼 디코딩, 통계 갱신, ETR-290 중 어디에 시간이 쓰이는지 알 수 없었습니다.
+RenderProfiler(ts_profiler)는 GUI 프레임 단위 도구라 cv2에 의존하고 스캐너 내부 단계를 나누지 못합니다.
+이 모듈은 TSScanner의 Chunk 처리 경로에 단계별 누적 시간과 카운터를 붙입니다.
+    - 시간: sample_every번째 Chunk만 perf_counter로 구간을 재고, 전체 패킷 수 비율로 환산 (오버헤드 수 % 이내)
+    - 카운터: Chunk / 패킷 / PCR / PES 헤더 / PSI·SI 패킷(PID 0x00~0x1F + PMT PID) / CC 에러는 매 Chunk 정확히 집계
+      (PSI·SI는 누적 PID별 패킷 수에서 다시 계산하므로 파일이 PAT보다 PMT로 먼저 시작해도 같은 값)
+결과는 BScan 진행 패널과 리포트(scan_profile)에 표시됩니다. NumPy / cv2를 import하지 않습니다.
+
+[사용법]
+    prof = ScanStageProfiler()
+    prof.start()
+    lap = prof.begin_chunk()            # 샘플 Chunk면 lap 함수, 아니면 None
+    ...; if lap: lap('read')            # 직전 lap 이후 경과 시간을 'read'에 누적
+    prof.end_chunk(packets)
+    prof.stop()
+    prof.to_dict()
+"""
+import time
+
+# 계측 단계 (표시 / 리포트 순서)
+STAGES = ('read', 'header', 'pcr', 'pes', 'stats', 'cc', 'psi', 'etr290', 'filters', 'publish')
+# 정확히 집계하는 카운터
+COUNTERS = ('chunks', 'packets', 'pcr', 'pes', 'psi', 'cc_errors')
+
+DEFAULT_SAMPLE_EVERY = 4        # N번째 Chunk마다 시간 측정 (1이면 전부)
+
+
+class ScanStageProfiler:
+    """스캐너 Chunk 처리 단계별 누적 시간 (샘플링) / 카운터"""
+    def __init__(self, sample_every=DEFAULT_SAMPLE_EVERY):
+        self.sample_every = max(1, int(sample_every))
+        self.reset()
+
+    def reset(self):
+        self.stage_s = dict.fromkeys(STAGES, 0.0)   # 샘플 Chunk에서 측정한 누적 시간 (초)
+        self.counters = dict.fromkeys(COUNTERS, 0)
+        self.sampled = 0                            # 시간을 측정한 Chunk 수
+        self.sampled_packets = 0                    # 시간을 측정한 Chunk의 패킷 수 (마지막 Chunk는 짧을 수 있음)
+        self.wall_s = 0.0                           # start() ~ stop() 경과 시간
+        self._t = None                              # 샘플 Chunk 진행 중이면 마지막 lap 시각
+        self._t_start = None
+
+    # --- 수집 ---
+    def start(self):
+        self.reset()
+        self._t_start = time.perf_counter()
+
+    def stop(self):
+        if self._t_start is not None:
+            self.wall_s = time.perf_counter() - self._t_start
+            self._t_start = None
+
+    def begin_chunk(self):
+        """Chunk 시작: 이번 Chunk가 샘플이면 lap 함수, 아니면 None 반환"""
+        if self.counters['chunks'] % self.sample_every:
+            self._t = None
+            return None
+        self._t = time.perf_counter()
+        return self.lap
+
+    def current_lap(self):
+        """진행 중인 Chunk가 샘플이면 lap 함수 (begin_chunk()를 호출한 곳과 다른 함수에서 사용)"""
+        return self.lap if self._t is not None else None
+
+    def lap(self, stage):
+        """직전 lap(또는 begin_chunk) 이후 경과 시간을 stage에 누적"""
+        t = time.perf_counter()
+        self.stage_s[stage] += t - self._t
+        self._t = t
+
+    def end_chunk(self, packets):
+        if self._t is not None:
+            self.sampled += 1
+            self.sampled_packets += packets
+            self._t = None
+        self.counters['chunks'] += 1
+        self.counters['packets'] += packets
+
+    def count(self, key, n):
+        self.counters[key] += n
+
+    def set_count(self, key, n):
+        """누적값을 직접 지정 (다른 누적 통계에서 다시 계산하는 카운터용)"""
+        self.counters[key] = n
+
+    # --- 결과 ---
+    def elapsed(self):
+        """진행 중이면 현재까지, 끝났으면 전체 경과 시간 (초)"""
+        if self._t_start is not None:
+            return time.perf_counter() - self._t_start
+        return self.wall_s
+
+    def estimated(self):
+        """단계별 추정 누적 시간 { stage: 초 } (샘플 시간 x 전체 패킷 수 / 샘플 Chunk 패킷 수)"""
+        if not self.sampled_packets:
+            return dict.fromkeys(STAGES, 0.0)
+        scale = self.counters['packets'] / self.sampled_packets
+        return {k: v * scale for k, v in self.stage_s.items()}
+
+    def to_dict(self):
+        """리포트 / GUI / 공유 메모리 게시용 (JSON 직렬화 가능)"""
+        est = self.estimated()
+        total = sum(est.values())
+        wall = self.elapsed()
+        return {
+            'sample_every': self.sample_every,
+            'sampled_chunks': self.sampled,
+            'wall_s': wall,
+            'packets_per_s': self.counters['packets'] / wall if wall > 0 else None,
+            'counters': dict(self.counters),
+            'stages': [{'stage': k, 'seconds': est[k], 'pct': est[k] / total * 100 if total > 0 else 0.0}
+                       for k in STAGES],
+        }
+
+
+# --- 공유 메모리 게시용 (ts_scan_process: int64 슬롯) ---
+PROFILE_SLOTS = 3 + len(STAGES) + len(COUNTERS)     # sample_every, sampled_chunks, wall_ns, 단계별 ns, 카운터
+
+
+def pack_profile(profile):
+    """to_dict() 결과 -> int64 값 목록 (시간은 ns)"""
+    return ([profile['sample_every'], profile['sampled_chunks'], int(profile['wall_s'] * 1e9)]
+            + [int(s['seconds'] * 1e9) for s in profile['stages']]
+            + [profile['counters'][k] for k in COUNTERS])
+
+
+def unpack_profile(values):
+    """pack_profile() 결과 -> to_dict()와 같은 구조"""
+    values = [int(v) for v in values]
+    stage_s = [v / 1e9 for v in values[3:3 + len(STAGES)]]
+    total = sum(stage_s)
+    counters = dict(zip(COUNTERS, values[3 + len(STAGES):]))
+    wall = values[2] / 1e9
+    return {
+        'sample_every': values[0],
+        'sampled_chunks': values[1],
+        'wall_s': wall,
+        'packets_per_s': counters['packets'] / wall if wall > 0 else None,
+        'counters': counters,
+        'stages': [{'stage': k, 'seconds': v, 'pct': v / total * 100 if total > 0 else 0.0}
+                   for k, v in zip(STAGES, stage_s)],
+    }
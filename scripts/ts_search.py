@@ -0,0 +1,164 @@
+"""
+[파일 개요]
+벡터화 필터 검색 엔진 (FilterSearch)
+
+[목적 및 필요성]
+GUI의 Smart Search(필터/PID 조건으로 다음·이전 패킷 찾기)는 프레임마다 패킷 1개씩 seek/read 후
+check_packet_filter()를 Python으로 실행하여 프레임당 50패킷밖에 진행하지 못했습니다.
+이 모듈은 활성 필터(PAT, PMT, Video, Audio, PCR, PTS, DTS, 선택 PID) 또는 필터 표현식(ts_filter_expr)을 NumPy 마스크로 변환하여
+수 MB Chunk 단위로 한 번에 평가하고, 정방향/역방향 검색을 취소 가능한 워커 스레드에서 수행합니다.
+
+[사용법]
+    spec = build_filter_spec(active_filters, snap.pid_map, snap.programs, selected_pid)
+    search = FilterSearch("a.ts")
+    search.start(spec, cur_idx + 1, +1)        # 백그라운드 검색 시작 (이전 검색은 취소)
+    res = search.poll()                         # 완료 시 {'idx', 'pid', 'scanned', 'elapsed'} (취소된 검색은 결과 없음)
+    idx = search.find(spec, cur_idx - 1, -1)    # 동기 검색 (-1: 없음)
+"""
+import os
+import threading
+import time
+
+import numpy as np
+
+from ts_columns import TS_PACKET_SIZE, NUM_PIDS, packets_view, decode_columns, read_chunks
+from ts_filter_expr import VIDEO_TYPES, AUDIO_TYPES
+
+SEARCH_CHUNK_PACKETS = 32768        # 한 번에 평가하는 패킷 수 (약 6MB)
+
+
+def build_filter_spec(active_filters, pid_map, programs, selected_pid=None, expr=None):
+    """
+    GUI 필터 상태를 검색 조건으로 변환
+    - 필터 표현식(expr, ts_filter_expr.FilterExpr)이 있으면 표현식만 사용
+    - 필터가 하나라도 켜져 있으면 필터 조건의 OR (선택 PID 무시, Global Search)
+    - 필터가 모두 꺼져 있으면 선택 PID만 검사
+    :return: {'pid_lut': bool[NUM_PIDS], 'pcr', 'pts', 'dts'} / {'expr', 'pid_map', 'programs'} 또는 None (조건 없음)
+    """
+    if expr is not None:
+        return {'expr': expr, 'pid_map': dict(pid_map), 'programs': dict(programs)}
+    lut = np.zeros(NUM_PIDS, dtype=bool)
+    f = active_filters
+    if any(f.values()):
+        if f.get('PAT'): lut[0] = True
+        if f.get('PMT'):
+            for prog in programs.values():
+                lut[prog['pmt_pid']] = True
+        for pid, info in pid_map.items():
+            ptype = info.get('type', 0)
+            if f.get('Video') and ptype in VIDEO_TYPES: lut[pid] = True
+            if f.get('Audio') and ptype in AUDIO_TYPES: lut[pid] = True
+        return {'pid_lut': lut, 'pcr': bool(f.get('PCR')), 'pts': bool(f.get('PTS')), 'dts': bool(f.get('DTS'))}
+    if selected_pid is not None:
+        lut[selected_pid] = True
+        return {'pid_lut': lut, 'pcr': False, 'pts': False, 'dts': False}
+    return None
+
+
+def match_mask(buf, spec):
+    """패킷 묶음에서 조건에 맞는 패킷 마스크 (bool 배열)"""
+    pk = packets_view(buf)
+    if 'expr' in spec:
+        return spec['expr'].mask(decode_columns(pk), spec['pid_map'], spec['programs'])
+
+    pid = ((pk[:, 1].astype(np.uint16) & 0x1F) << 8) | pk[:, 2]
+    mask = spec['pid_lut'][pid]
+
+    if spec['pcr']:
+        # Adaptation Field 존재 & 길이 > 0 & PCR_flag (decode_columns의 pcr_flag와 동일 조건)
+        has_af = (pk[:, 3] & 0x20) != 0
+        mask |= has_af & (pk[:, 4] > 0) & ((pk[:, 5] & 0x10) != 0)
+
+    if spec['pts'] or spec['dts']:
+        # PES 헤더는 PUSI 패킷만 디코딩 (전체 대비 소수)
+        cand = np.nonzero(((pk[:, 1] & 0x40) != 0) & ~mask)[0]
+        if len(cand):
+            cols = decode_columns(pk[cand])
+            hit = np.zeros(len(cand), dtype=bool)
+            if spec['pts']: hit |= cols['pts'] >= 0
+            if spec['dts']: hit |= cols['dts'] >= 0
+            mask[cand[hit]] = True
+    return mask
+
+
+class FilterSearch:
+    """조건에 맞는 다음/이전 패킷을 Chunk 단위로 찾는 취소 가능한 검색기"""
+    def __init__(self, file_path, chunk_packets=SEARCH_CHUNK_PACKETS):
+        self.file_path = file_path
+        self.chunk_packets = chunk_packets
+        self.total_pkts = os.path.getsize(file_path) // TS_PACKET_SIZE if file_path and os.path.exists(file_path) else 0
+
+        self.scanned = 0            # 현재 검색에서 평가한 패킷 수
+        self._cancel = threading.Event()
+        self._thread = None
+        self._result = None
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    # --- Background ---
+    def start(self, spec, from_idx, direction):
+        """from_idx(포함)부터 direction(+1/-1) 방향으로 백그라운드 검색 시작"""
+        self.cancel()
+        self._cancel = threading.Event()
+        self._result = None
+        self._thread = threading.Thread(target=self._worker, args=(spec, from_idx, direction, self._cancel))
+        self._thread.daemon = True
+        self._thread.start()
+
+    def cancel(self):
+        self._cancel.set()
+        if self._thread and self._thread.is_alive():
+            self._thread.join(timeout=1.0)
+        self._thread = None
+
+    def poll(self):
+        """완료된 검색 결과를 1회 반환 (진행 중이거나 결과가 없으면 None)"""
+        res, self._result = self._result, None
+        return res
+
+    def _worker(self, spec, from_idx, direction, cancel):
+        t0 = time.perf_counter()
+        try:
+            idx, pid = self.find(spec, from_idx, direction, cancel)
+        except Exception as e:
+            print(f"[Error] Filter search failed: {e}")
+            idx, pid = -1, None
+        if not cancel.is_set():
+            self._result = {'idx': idx, 'pid': pid, 'scanned': self.scanned, 'elapsed': time.perf_counter() - t0}
+
+    # --- Sync ---
+    def find(self, spec, from_idx, direction, cancel=None):
+        """
+        동기 검색
+        :return: (패킷 인덱스, PID) - 없거나 취소되면 (-1, None)
+        """
+        self.scanned = 0
+        stop = cancel.is_set if cancel is not None else None
+        chunks = self._forward(from_idx, stop) if direction > 0 else self._backward(from_idx, stop)
+        for chunk_start, buf in chunks:
+            hit = np.flatnonzero(match_mask(buf, spec))
+            self.scanned += len(buf) // TS_PACKET_SIZE
+            if len(hit):
+                k = int(hit[0] if direction > 0 else hit[-1])
+                pid = ((buf[k * TS_PACKET_SIZE + 1] & 0x1F) << 8) | buf[k * TS_PACKET_SIZE + 2]
+                return chunk_start + k, pid
+        return -1, None
+
+    def _forward(self, from_idx, stop):
+        if from_idx < 0: from_idx = 0
+        return read_chunks(self.file_path, from_idx, self.chunk_packets, stop)
+
+    def _backward(self, from_idx, stop):
+        """[0, from_idx] 구간을 뒤에서부터 Chunk 단위로 반환"""
+        hi = min(from_idx + 1, self.total_pkts)
+        with open(self.file_path, "rb") as f:
+            while hi > 0:
+                if stop and stop(): break
+                lo = max(0, hi - self.chunk_packets)
+                f.seek(lo * TS_PACKET_SIZE)
+                buf = f.read((hi - lo) * TS_PACKET_SIZE)
+                if not buf: break
+                yield lo, buf
+                hi = lo
@@ -0,0 +1,102 @@
+"""
+[파일 개요]
+스캐너 통계 스냅샷 (ScanSnapshot / SnapshotPublisher)
+
+[목적 및 필요성]
+GUI는 parser.pid_counts / parser.programs / scanner.stats를 직접 순회하는데, 스캐너 스레드가 같은 dict를
+동시에 수정하면 "dictionary changed size during iteration" 예외나 서로 맞지 않는 값(예: 카운트와 PMT 구성)이
+화면에 섞일 수 있습니다. 스캐너(작성자)는 일정 주기(기본 10Hz)로 변경 불가능한 스냅샷을 만들어 게시하고,
+GUI(독자)는 게시된 최신 스냅샷 하나만 읽습니다. 스냅샷 교체는 속성 대입 한 번이므로 Lock이 필요 없고,
+version이 바뀌었을 때만 패널을 다시 그리면 됩니다.
+"""
+import time
+from collections import namedtuple
+from types import MappingProxyType
+
+# 모든 dict 필드는 MappingProxyType (읽기 전용)
+ScanSnapshot = namedtuple('ScanSnapshot', [
+    'version',          # 게시 순번 (내용이 바뀔 때마다 증가)
+    'packet_count',     # 스캔한 패킷 수
+    'total_pkts',       # 파일 전체 패킷 수
+    'pid_counts',       # { pid: count }
+    'programs',         # { prog_num: {'pmt_pid', 'pcr_pid_val', 'pids': { pid: {'type', 'desc'} }} }
+    'pid_map',          # { pid: {'type', 'desc'} }
+    'stats',            # { pid: {'cc_errors', 'scrambled'} } (요약 통계)
+    'timestamp',        # 게시 시각 (time.monotonic)
+])
+
+_EMPTY = MappingProxyType({})
+
+
+def _frozen_programs(programs):
+    frozen = {}
+    for num, prog in list(programs.items()):
+        pids = {pid: MappingProxyType(dict(info)) for pid, info in list(prog.get('pids', {}).items())}
+        frozen[num] = MappingProxyType({
+            'pmt_pid': prog['pmt_pid'],
+            'pcr_pid_val': prog.get('pcr_pid_val', 0x1FFF),
+            'pids': MappingProxyType(pids),
+        })
+    return MappingProxyType(frozen)
+
+
+def _frozen_stats(stats):
+    # PIDStatsTable은 요약 접근자 사용, 그 외(프로세스 스캐너)는 { pid: {'cc_errors', 'scrambled'} } dict
+    summary = stats.summary() if hasattr(stats, 'summary') else stats
+    return MappingProxyType({
+        pid: MappingProxyType({'cc_errors': st.get('cc_errors', 0), 'scrambled': st.get('scrambled', 0)})
+        for pid, st in list(summary.items())
+    })
+
+
+def build_snapshot(version, parser, stats):
+    """
+    Parser / 통계 dict의 현재 상태를 복사하여 스냅샷 생성
+    (작성자 스레드에서 호출해야 복사 도중 값이 바뀌지 않습니다)
+    """
+    return ScanSnapshot(
+        version=version,
+        packet_count=parser.packet_count,
+        total_pkts=parser.total_pkts,
+        pid_counts=MappingProxyType(dict(parser.pid_counts)),
+        programs=_frozen_programs(parser.programs),
+        pid_map=MappingProxyType({pid: MappingProxyType(dict(info)) for pid, info in list(parser.pid_map.items())}),
+        stats=_frozen_stats(stats) if stats is not None else _EMPTY,
+        timestamp=time.monotonic(),
+    )
+
+
+class SnapshotPublisher:
+    """
+    주기 제한(max_hz) 스냅샷 게시기.
+    publish()는 작성자 스레드에서, latest는 어느 스레드에서나 읽을 수 있습니다.
+    """
+    def __init__(self, max_hz=10.0):
+        self.min_interval = 1.0 / max_hz if max_hz else 0.0
+        self.latest = None
+        self._version = 0
+        self._last_time = 0.0
+        self._last_sig = None
+
+    def publish(self, parser, stats=None, force=False):
+        """
+        내용이 바뀌었고 최소 간격이 지났으면 새 스냅샷 게시
+        :param force: 간격 제한 무시 (스캔 시작/종료 시)
+        :return: 게시했으면 True
+        """
+        now = time.monotonic()
+        if not force and now - self._last_time < self.min_interval:
+            return False
+
+        # 변경 여부 판단용 간이 서명 (전체 비교 없이 O(프로그램 수))
+        sig = (parser.packet_count, len(parser.pid_counts), len(parser.pid_map),
+               tuple((num, p['pmt_pid'], len(p.get('pids', {}))) for num, p in list(parser.programs.items())))
+        if sig == self._last_sig and self.latest is not None:
+            self._last_time = now
+            return False
+
+        self._version += 1
+        self.latest = build_snapshot(self._version, parser, stats)
+        self._last_sig = sig
+        self._last_time = now
+        return True
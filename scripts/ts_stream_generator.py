@@ -0,0 +1,423 @@
+"""
+[파일 개요]
+합성 TS 스트림 생성기 (TSStreamGenerator) - 테스트 / 벤치마크용 MPEG2-TS 파일을 벡터화 방식으로 생성
+
+[목적 및 필요성]
+저장소에는 테스트 데이터 생성기가 없어 모든 검증을 mama_uhd2.ts 같은 실제 녹화 파일로 손으로 해 왔습니다.
+이 모듈은 패킷 묶음(Chunk)을 (N, 188) NumPy 배열로 한 번에 조립하여 수 GB 파일도 몇 초 안에 만듭니다.
+    - 프로그램 / PID 구성 (Video / Audio 등, 스트림별 패킷 점유율), 남는 대역은 Null 패킷
+    - PAT / PMT / SDT 반복 주기, PCR 주기, PES(PTS/DTS) 프레임 주기
+    - CBR (일정 Mux Rate) / VBR (Mux Rate를 정현파로 변조)
+    - 오류 주입: PCR Jitter(ns), CC 오류, TEI, 스크램블 PID, Sync Byte 손상(연속 구간)
+주입한 오류 수와 PID별 패킷 수는 stats에 기록되어(정답값) 스캐너 / ETR-290 / Jitter 결과 검증과 벤치마크에 사용합니다.
+(Sync Byte가 손상된 패킷은 CC 검사에서 빠지므로, 그 PID에는 주입한 수보다 CC 오류가 더 잡힐 수 있습니다.)
+
+[설정] (dict, 생략한 키는 DEFAULT_CONFIG 값)
+    bitrate          : Mux Rate (bps)
+    vbr, vbr_period  : VBR 변조 폭 (0이면 CBR, 0.3 = +/-30%) / 주기 (초)
+    programs         : [{'number', 'pmt_pid', 'pcr_pid', 'name', 'streams': [{'pid', 'type', 'share', 'frame'}]}]
+                       share = 전체 패킷 중 비율, frame = PES(PTS) 간격 (초)
+    pat_interval, pmt_interval, sdt_interval, pcr_interval : 반복 주기 (초, 0이면 전송 안 함)
+    pcr_jitter_ns    : PCR 값에 더할 정규분포 잡음의 표준편차 (ns)
+    cc_error_rate, tei_rate, sync_loss_rate : 패킷당 발생 확률 (sync_loss는 sync_loss_len 패킷 연속 손상)
+    scrambled_pids   : 스크램블 제어 비트(10b)를 설정하고 PES 헤더를 쓰지 않을 PID 목록
+    start_time, seed : 첫 PCR / PTS 시각 (초), 난수 시드
+
+[사용법]
+    python scripts/ts_stream_generator.py out.ts -s 2G --programs 2 --vbr 0.2 --pcr-jitter-ns 300 --cc-error-rate 1e-5
+
+    gen = TSStreamGenerator({'bitrate': 20e6, 'tei_rate': 1e-4})
+    gen.write("out.ts", 1_000_000)              # 패킷 수
+    print(gen.stats['tei'], gen.stats['pid_counts'][0x100])
+"""
+import argparse
+import json
+import os
+import struct
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from ts_columns import TS_PACKET_SIZE, NUM_PIDS, NULL_PID
+
+GENERATE_CHUNK_PACKETS = 65536     # 한 번에 조립할 패킷 수 (약 12MB)
+PCR_HZ = 27_000_000
+PTS_HZ = 90_000
+PCR_WRAP = (1 << 33) * 300
+PTS_WRAP = 1 << 33
+SDT_PID = 0x0011
+PSI_PHASE_PACKETS = 3               # 같은 시각에 몰리지 않도록 테이블마다 주는 위상 차이 (패킷 수)
+VIDEO_TYPES = (0x01, 0x02, 0x1B, 0x24)
+PRIVATE_TYPES = (0x06, 0x81)
+
+DEFAULT_CONFIG = {
+    'bitrate': 20_000_000,
+    'vbr': 0.0,
+    'vbr_period': 2.0,
+    'programs': None,               # None이면 default_programs(1)
+    'pat_interval': 0.1,
+    'pmt_interval': 0.1,
+    'sdt_interval': 0.5,
+    'pcr_interval': 0.03,
+    'pcr_jitter_ns': 0.0,
+    'cc_error_rate': 0.0,
+    'tei_rate': 0.0,
+    'sync_loss_rate': 0.0,
+    'sync_loss_len': 5,
+    'scrambled_pids': [],
+    'start_time': 10.0,
+    'seed': 1,
+}
+
+
+def default_programs(count=1, video_share=0.6, audio_share=0.05):
+    """프로그램 count개 (각각 H.264 Video 25fps + AAC Audio 48kHz), 점유율은 프로그램 수로 나눔"""
+    programs = []
+    for k in range(count):
+        base = 0x100 + 0x10 * k
+        programs.append({
+            'number': k + 1,
+            'pmt_pid': 0x1000 + k,
+            'pcr_pid': base,
+            'name': f"Synthetic {k + 1}",
+            'streams': [
+                {'pid': base, 'type': 0x1B, 'share': video_share / count, 'frame': 1 / 25},
+                {'pid': base + 1, 'type': 0x0F, 'share': audio_share / count, 'frame': 1024 / 48000},
+            ],
+        })
+    return programs
+
+
+def crc32_mpeg(data):
+    """MPEG-2 CRC32 (Poly 0x04C11DB7, 섹션 생성용 - 길이가 짧아 비트 단위 계산)"""
+    crc = 0xFFFFFFFF
+    for byte in data:
+        crc ^= byte << 24
+        for _ in range(8):
+            crc = ((crc << 1) ^ 0x04C11DB7) if crc & 0x80000000 else (crc << 1)
+            crc &= 0xFFFFFFFF
+    return crc
+
+
+def _section(table_id, table_id_ext, body, private_bits=0xB000):
+    """PSI 섹션 (헤더 + body + CRC32)"""
+    sec = bytes([table_id]) + struct.pack('>HHBBB', private_bits | (len(body) + 9), table_id_ext, 0xC1, 0, 0) + body
+    return sec + struct.pack('>I', crc32_mpeg(sec))
+
+
+def _psi_packet(pid, section):
+    """섹션 1개를 담은 188바이트 패킷 (PUSI, pointer_field 0, CC는 조립 시 설정)"""
+    pkt = struct.pack('>BHB', 0x47, 0x4000 | pid, 0x10) + b'\x00' + section
+    if len(pkt) > TS_PACKET_SIZE:
+        raise ValueError(f"PSI section on PID 0x{pid:X} does not fit in one packet")
+    return np.frombuffer(pkt.ljust(TS_PACKET_SIZE, b'\xff'), dtype=np.uint8)
+
+
+def _timestamp_bytes(prefix, values):
+    """33-bit PTS/DTS 배열 -> (N, 5) 바이트 (marker bit 포함)"""
+    v = values.astype(np.int64)
+    return np.column_stack((
+        (prefix << 4) | (((v >> 30) & 0x7) << 1) | 1,
+        (v >> 22) & 0xFF,
+        (((v >> 15) & 0x7F) << 1) | 1,
+        (v >> 7) & 0xFF,
+        ((v & 0x7F) << 1) | 1,
+    )).astype(np.uint8)
+
+
+def _bucket_starts(t, interval, phase, last_bucket):
+    """각 구간(interval)의 첫 패킷 mask (구간 번호는 Chunk 사이에 이어짐) -> (mask, 마지막 구간 번호)"""
+    b = np.floor((t - phase) / interval).astype(np.int64)
+    prev = np.empty_like(b)
+    prev[0] = last_bucket
+    prev[1:] = b[:-1]
+    return b != prev, int(b[-1])
+
+
+class TSStreamGenerator:
+    def __init__(self, config=None):
+        cfg = dict(DEFAULT_CONFIG)
+        cfg.update(config or {})
+        if cfg['programs'] is None:
+            cfg['programs'] = default_programs(1)
+        if not 0 <= cfg['vbr'] < 1:
+            raise ValueError(f"vbr must be in [0, 1), got {cfg['vbr']}")
+        self.config = cfg
+
+        # 스트림 PID별 설정 / 점유율 구간 (난수 -> PID)
+        self.streams = [dict(s, pcr=(s['pid'] == p['pcr_pid'])) for p in cfg['programs'] for s in p['streams']]
+        shares = np.array([s['share'] for s in self.streams], dtype=np.float64)
+        if shares.sum() > 1.0:
+            raise ValueError(f"stream shares sum to {shares.sum():.3f} (> 1)")
+        self._share_edges = np.cumsum(shares)
+        self._stream_pids = np.array([s['pid'] for s in self.streams] + [NULL_PID], dtype=np.uint16)
+        self._scrambled = np.zeros(NUM_PIDS, dtype=bool)
+        self._scrambled[list(cfg['scrambled_pids'])] = True
+
+        # PSI 템플릿 [(PID, 188바이트 패킷, 주기)]
+        self.psi = []
+        if cfg['pat_interval'] > 0:
+            body = b''.join(struct.pack('>HH', p['number'], 0xE000 | p['pmt_pid']) for p in cfg['programs'])
+            self.psi.append((0, _psi_packet(0, _section(0x00, 1, body)), cfg['pat_interval']))
+        if cfg['pmt_interval'] > 0:
+            for p in cfg['programs']:
+                es = b''.join(bytes([s['type']]) + struct.pack('>HH', 0xE000 | s['pid'], 0xF000) for s in p['streams'])
+                body = struct.pack('>HH', 0xE000 | p['pcr_pid'], 0xF000) + es
+                self.psi.append((p['pmt_pid'], _psi_packet(p['pmt_pid'], _section(0x02, p['number'], body)), cfg['pmt_interval']))
+        if cfg['sdt_interval'] > 0:
+            services = b''
+            for p in cfg['programs']:
+                name = p.get('name', '').encode('latin-1')
+                desc = bytes([0x01, 0]) + bytes([len(name)]) + name      # service_type 0x01, provider 없음
+                desc = bytes([0x48, len(desc)]) + desc
+                services += struct.pack('>HBH', p['number'], 0xFC, 0x8000 | len(desc)) + desc
+            body = struct.pack('>HB', 1, 0xFF) + services                 # original_network_id, reserved_future_use
+            self.psi.append((SDT_PID, _psi_packet(SDT_PID, _section(0x42, 1, body, 0xF000)), cfg['sdt_interval']))
+
+        self.stats = {}
+        self.reset()
+
+    def reset(self):
+        """생성 상태 / 통계 초기화 (같은 설정으로 처음부터 다시 생성)"""
+        self.rng = np.random.default_rng(self.config['seed'])
+        self._index = 0
+        self._time = 0.0                            # 다음 패킷의 Mux 시각 (초, start_time 제외)
+        self._cc = np.zeros(NUM_PIDS, dtype=np.int64)
+        self._buckets = {}                          # { 키: 마지막 구간 번호 }
+        self._sync_left = 0                         # 이전 Chunk에서 이어지는 Sync 손상 패킷 수
+        self.stats = {
+            'packets': 0,
+            'pid_counts': {},
+            'psi': 0, 'pcr': 0, 'pes': 0,
+            'cc_errors': 0, 'tei': 0, 'scrambled': 0,
+            'sync_loss_events': 0, 'sync_errors': 0,
+            'duration_s': 0.0,
+        }
+
+    def _packet_times(self, n):
+        """패킷별 Mux 시각 (CBR: 등간격, VBR: 순간 Rate를 정현파로 변조)"""
+        cfg = self.config
+        base = TS_PACKET_SIZE * 8 / cfg['bitrate']
+        if cfg['vbr'] > 0:
+            idx = np.arange(self._index, self._index + n, dtype=np.float64)
+            period = cfg['vbr_period'] * cfg['bitrate'] / (TS_PACKET_SIZE * 8)
+            dt = base / (1.0 + cfg['vbr'] * np.sin(2 * np.pi * idx / period))
+        else:
+            dt = np.full(n, base)
+        t = self._time + np.concatenate(([0.0], np.cumsum(dt[:-1])))
+        self._time = float(t[-1] + dt[-1])
+        return t
+
+    def _first_per_bucket(self, key, mask, t, interval, phase=0.0):
+        """mask된 패킷 중 각 주기 구간의 첫 패킷 인덱스"""
+        rows = np.nonzero(mask)[0]
+        if len(rows) == 0:
+            return rows
+        hit, self._buckets[key] = _bucket_starts(t[rows], interval, phase, self._buckets.get(key, -1))
+        return rows[hit]
+
+    def generate(self, n):
+        """다음 n개 패킷 -> (n, 188) uint8 배열"""
+        cfg, rng, st = self.config, self.rng, self.stats
+        t = self._packet_times(n)
+        out = np.full((n, TS_PACKET_SIZE), 0xFF, dtype=np.uint8)
+
+        # --- PID 배정: 점유율에 따라 난수로 배정, PSI는 주기마다 첫 패킷을 차지 ---
+        pid = self._stream_pids[np.searchsorted(self._share_edges, rng.random(n), side='right')]
+        slot_taken = np.zeros(n, dtype=bool)
+        pkt_time = TS_PACKET_SIZE * 8 / cfg['bitrate']
+        for k, (psi_pid, tmpl, interval) in enumerate(self.psi):
+            rows = self._first_per_bucket(('psi', k), np.ones(n, dtype=bool), t, interval, k * PSI_PHASE_PACKETS * pkt_time)
+            rows = rows[~slot_taken[rows]]
+            slot_taken[rows] = True
+            pid[rows] = psi_pid
+            out[rows] = tmpl
+            st['psi'] += len(rows)
+
+        is_null = pid == NULL_PID
+        pusi = slot_taken.copy()                    # PSI 패킷은 섹션 시작 (pointer_field 0)
+        payload_off = np.full(n, 4, dtype=np.int64)
+        adapt = np.ones(n, dtype=np.uint8)
+        abs_t = t + cfg['start_time']
+
+        for s in self.streams:
+            mask = (pid == s['pid']) & ~slot_taken
+            pcr_rows = np.zeros(0, dtype=np.int64)
+            # PCR (Adaptation Field 8바이트: length 7 + flags + PCR 6)
+            if s['pcr'] and cfg['pcr_interval'] > 0:
+                pcr_rows = rows = self._first_per_bucket(('pcr', s['pid']), mask, t, cfg['pcr_interval'])
+                if len(rows):
+                    pcr = np.round(abs_t[rows] * PCR_HZ)
+                    if cfg['pcr_jitter_ns'] > 0:
+                        pcr += np.round(rng.normal(0.0, cfg['pcr_jitter_ns'] * PCR_HZ / 1e9, len(rows)))
+                    pcr = pcr.astype(np.int64) % PCR_WRAP
+                    base, ext = pcr // 300, pcr % 300
+                    out[rows, 4] = 7
+                    out[rows, 5] = 0x10
+                    out[rows, 6] = (base >> 25) & 0xFF
+                    out[rows, 7] = (base >> 17) & 0xFF
+                    out[rows, 8] = (base >> 9) & 0xFF
+                    out[rows, 9] = (base >> 1) & 0xFF
+                    out[rows, 10] = ((base & 0x1) << 7) | 0x7E | (ext >> 8)
+                    out[rows, 11] = ext & 0xFF
+                    adapt[rows] = 3
+                    payload_off[rows] = 12
+                    st['pcr'] += len(rows)
+
+            # PES 시작 (PUSI, 스크램블 PID는 PES 헤더가 암호화되어 있다고 보고 PUSI만 설정)
+            rows = self._first_per_bucket(('pes', s['pid']), mask, t, s['frame'])
+            if len(rows) == 0: continue
+            pusi[rows] = True
+            st['pes'] += len(rows)
+            if self._scrambled[s['pid']]: continue
+            is_video = s['type'] in VIDEO_TYPES
+            sid = 0xE0 if is_video else (0xBD if s['type'] in PRIVATE_TYPES else 0xC0)
+            pts = np.round((abs_t[rows] + 2 * s['frame']) * PTS_HZ).astype(np.int64) % PTS_WRAP
+            if is_video:
+                dts = (pts - int(round(s['frame'] * PTS_HZ))) % PTS_WRAP
+                hdr = np.hstack((np.tile(np.array([0, 0, 1, sid, 0, 0, 0x80, 0xC0, 10], dtype=np.uint8), (len(rows), 1)),
+                                 _timestamp_bytes(3, pts), _timestamp_bytes(1, dts)))
+            else:
+                hdr = np.hstack((np.tile(np.array([0, 0, 1, sid, 0, 0, 0x80, 0x80, 5], dtype=np.uint8), (len(rows), 1)),
+                                 _timestamp_bytes(2, pts)))
+            po = payload_off[rows]
+            for off in np.unique(po).tolist():
+                sel = po == off
+                out[rows[sel], off:off + hdr.shape[1]] = hdr[sel]
+            if is_video and len(pcr_rows):
+                # PCR과 같은 패킷에서 시작하는 Video PES는 Random Access 표시
+                out[np.intersect1d(rows, pcr_rows), 5] |= 0x40
+
+        # --- CC: PID별 연속 번호 (+ 오류 주입: 1~14 건너뛰기) ---
+        cc = np.zeros(n, dtype=np.int64)
+        jump = np.zeros(n, dtype=np.int64)
+        if cfg['cc_error_rate'] > 0:
+            err = (rng.random(n) < cfg['cc_error_rate']) & ~is_null
+            jump[err] = rng.integers(1, 15, int(np.count_nonzero(err)))
+            st['cc_errors'] += int(np.count_nonzero(err))
+        for q in np.unique(pid[~is_null]).tolist():
+            rows = np.nonzero(pid == q)[0]
+            if self._cc[q] == 0 and jump[rows[0]]:
+                # PID의 첫 패킷은 비교 대상이 없어 오류가 되지 않으므로 주입하지 않음
+                jump[rows[0]] = 0
+                st['cc_errors'] -= 1
+            seq = self._cc[q] + np.arange(len(rows)) + np.cumsum(jump[rows])
+            cc[rows] = seq % 16
+            self._cc[q] = seq[-1] + 1
+
+        # --- 헤더 조립 ---
+        scram = self._scrambled[pid] & ~is_null
+        st['scrambled'] += int(np.count_nonzero(scram))
+        tei = np.zeros(n, dtype=bool)
+        if cfg['tei_rate'] > 0:
+            tei = rng.random(n) < cfg['tei_rate']
+            st['tei'] += int(np.count_nonzero(tei))
+        out[:, 0] = 0x47
+        out[:, 1] = (tei.astype(np.uint8) << 7) | (pusi.astype(np.uint8) << 6) | (pid >> 8).astype(np.uint8)
+        out[:, 2] = (pid & 0xFF).astype(np.uint8)
+        out[:, 3] = (scram.astype(np.uint8) << 7) | (adapt << 4) | cc.astype(np.uint8)
+
+        # --- Sync Byte 손상 (sync_loss_len 패킷 연속) ---
+        bad = np.zeros(n, dtype=bool)
+        bad[:self._sync_left] = True
+        length = cfg['sync_loss_len']
+        if cfg['sync_loss_rate'] > 0:
+            starts = np.nonzero(rng.random(n) < cfg['sync_loss_rate'])[0]
+            st['sync_loss_events'] += len(starts)
+            for s0 in starts.tolist():
+                bad[s0:s0 + length] = True
+            self._sync_left = max([s0 + length - n for s0 in starts.tolist()] + [self._sync_left - n, 0])
+        else:
+            self._sync_left = max(self._sync_left - n, 0)
+        out[bad, 0] = 0x00
+        st['sync_errors'] += int(np.count_nonzero(bad))
+
+        counts = np.bincount(pid, minlength=NUM_PIDS)
+        pc = st['pid_counts']
+        for q in np.nonzero(counts)[0].tolist():
+            pc[q] = pc.get(q, 0) + int(counts[q])
+        self._index += n
+        st['packets'] += n
+        st['duration_s'] = self._time
+        return out
+
+    def chunks(self, total_packets, chunk_packets=GENERATE_CHUNK_PACKETS):
+        """total_packets개를 Chunk 단위 (n, 188) 배열로 순차 반환"""
+        left = total_packets
+        while left > 0:
+            n = min(chunk_packets, left)
+            yield self.generate(n)
+            left -= n
+
+    def write(self, path, total_packets, progress=None):
+        """
+        파일로 생성
+        :param progress: callback(생성 패킷 수, 전체 패킷 수)
+        :return: stats
+        """
+        with open(path, "wb") as f:
+            for arr in self.chunks(total_packets):
+                arr.tofile(f)
+                if progress: progress(self.stats['packets'], total_packets)
+        return self.stats
+
+
+def parse_size(text):
+    """'2G', '500M', '188000' -> 바이트 (1024 단위)"""
+    text = text.strip().upper().rstrip('B')
+    units = {'K': 1 << 10, 'M': 1 << 20, 'G': 1 << 30, 'T': 1 << 40}
+    if text and text[-1] in units:
+        return int(float(text[:-1]) * units[text[-1]])
+    return int(float(text))
+
+
+def _main(argv=None):
+    ap = argparse.ArgumentParser(description="Generate a synthetic MPEG2-TS file for tests and benchmarks")
+    ap.add_argument("output", help="output .ts file")
+    size = ap.add_mutually_exclusive_group()
+    size.add_argument("-s", "--size", default="100M", help="file size, e.g. 500M, 2G (default: 100M)")
+    size.add_argument("-n", "--packets", type=int, help="number of packets")
+    ap.add_argument("--config", help="JSON file with generator settings (see DEFAULT_CONFIG)")
+    ap.add_argument("--programs", type=int, help="number of programs (video + audio each)")
+    ap.add_argument("--bitrate", type=float, help="mux rate in bps (default 20e6)")
+    ap.add_argument("--vbr", type=float, help="VBR modulation depth, 0 = CBR (e.g. 0.3)")
+    for key in ('pat_interval', 'pmt_interval', 'sdt_interval', 'pcr_interval', 'pcr_jitter_ns',
+                'cc_error_rate', 'tei_rate', 'sync_loss_rate'):
+        ap.add_argument("--" + key.replace('_', '-'), dest=key, type=float)
+    ap.add_argument("--scramble", type=lambda s: int(s, 0), action="append", dest="scrambled_pids", metavar="PID",
+                    help="scramble this PID (repeatable)")
+    ap.add_argument("--seed", type=int)
+    ap.add_argument("--truth", help="write injected counts (ground truth) as JSON")
+    args = ap.parse_args(argv)
+
+    config = {}
+    if args.config:
+        with open(args.config, encoding="utf-8") as f:
+            config.update(json.load(f))
+    for key in DEFAULT_CONFIG:
+        value = getattr(args, key, None)
+        if value is not None and key != 'programs': config[key] = value
+    if args.programs:
+        config['programs'] = default_programs(args.programs)
+
+    total = args.packets if args.packets is not None else parse_size(args.size) // TS_PACKET_SIZE
+    gen = TSStreamGenerator(config)
+    t0 = time.perf_counter()
+    stats = gen.write(args.output, total)
+    sec = time.perf_counter() - t0
+    mb = total * TS_PACKET_SIZE / 1e6
+    print(f"[Generate] {total:,} packets, {mb:,.1f} MB, {stats['duration_s']:.1f}s of stream in {sec:.2f}s "
+          f"({mb / sec if sec > 0 else 0:,.0f} MB/s) -> {args.output}")
+    print(f"[Generate] PSI {stats['psi']:,}  PCR {stats['pcr']:,}  PES {stats['pes']:,}  CC errors {stats['cc_errors']:,}  "
+          f"TEI {stats['tei']:,}  scrambled {stats['scrambled']:,}  sync errors {stats['sync_errors']:,}")
+    if args.truth:
+        with open(args.truth, "w", encoding="utf-8") as f:
+            json.dump(dict(stats, pid_counts={f"0x{k:04X}": v for k, v in sorted(stats['pid_counts'].items())},
+                           config=gen.config), f, indent=1)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(_main())
@@ -0,0 +1,135 @@
+"""
+[파일 개요]
+OpenCV 텍스트 렌더링 캐시 (text_size / GlyphAtlas)
+
+[목적 및 필요성]
+GUI의 Draw 함수들은 프레임마다 cv2.getTextSize / cv2.putText를 수백 번 호출합니다.
+(_draw_hex는 12줄의 Offset/Hex/ASCII 문자열, _draw_detail/_draw_pes_view는 Hover 영역 계산을 위해 모든 필드의 크기를 측정)
+이 모듈은
+    - text_size(): (text, font, scale, thickness) 단위로 getTextSize 결과를 기억 (cv2.getTextSize와 동일한 인자/반환값)
+    - GlyphAtlas : 고정폭 Hex View용 글자 칸(Cell)을 한 번만 putText로 그려 마스크로 보관하고,
+                   (줄, 칸) 코드 배열 -> 마스크 배열 인덱싱(NumPy) -> cv2.copyTo 1회로 여러 줄을 한 번에 찍어 넣음
+을 제공합니다. Cell은 문자 1개(ASCII 열) 또는 문자열(Hex 열의 "XX " 등, 바이트 값 -> 칸)이며,
+모든 문자는 같은 폭(advance) 칸의 가운데에 놓이므로 열이 정확히 정렬되고 하이라이트 박스 좌표도 column * 칸 폭으로 바로 계산됩니다.
+
+[사용법]
+    (tw, th), base = text_size("PID 0x100", cv2.FONT_HERSHEY_SIMPLEX, 0.5, 1)
+    atlas = get_atlas(0.45, 12)                                 # 문자 Atlas (코드 = 문자 코드)
+    atlas.draw(img, ["G..@", "ABCD"], (x, y), (100, 255, 100))  # y: 첫 줄 Baseline
+    hex_atlas = get_atlas(0.45, 9, cells=HEX_CELLS)             # 바이트 값 -> "XX " 칸
+    hex_atlas.draw_codes(img, byte_rows, (x, y), (200, 200, 200))
+"""
+from functools import lru_cache
+
+import cv2
+import numpy as np
+
+TEXT_SIZE_CACHE = 4096          # 기억할 getTextSize 결과 수 (LRU)
+LINE_PITCH = 24                 # GlyphAtlas 줄 간격 (Hex View 줄 간격과 동일)
+BASELINE = 18                   # 칸 위쪽에서 Baseline까지 거리 (Hex View 하이라이트 박스: y-18 ~ y+6)
+FIRST_CHAR, LAST_CHAR = 32, 126
+
+CHAR_CELLS = tuple(chr(c) if FIRST_CHAR <= c <= LAST_CHAR else "" for c in range(256))
+HEX_CELLS = tuple(f"{b:02X} " for b in range(256))
+
+
+@lru_cache(maxsize=TEXT_SIZE_CACHE)
+def text_size(text, font, scale, thickness):
+    """cv2.getTextSize 메모이제이션 ((w, h), baseline)"""
+    return cv2.getTextSize(text, font, scale, thickness)
+
+
+class GlyphAtlas:
+    """
+    고정폭 Cell 마스크 묶음 (코드 -> pitch x cell_w uint8 마스크)
+    - 코드 len(cells)는 빈 칸 (줄 길이가 다를 때 채움용)
+    """
+    def __init__(self, scale, advance, thickness=1, cells=CHAR_CELLS, font=cv2.FONT_HERSHEY_SIMPLEX,
+                 pitch=LINE_PITCH, baseline=BASELINE):
+        self.scale = scale
+        self.advance = advance
+        self.thickness = thickness
+        self.font = font
+        self.pitch = pitch
+        self.baseline = baseline
+        self.cell_w = advance * max(1, max(len(s) for s in cells))
+        self.blank = len(cells)
+        self._char_lut = None
+        self._fills = {}                # { (h, w, color): 단색 이미지 } - copyTo 원본
+
+        glyphs = {}
+        self.masks = np.zeros((len(cells) + 1, pitch, self.cell_w), dtype=np.uint8)
+        for code, s in enumerate(cells):
+            for k, ch in enumerate(s):
+                if ch not in glyphs: glyphs[ch] = self._render(ch)
+                self.masks[code, :, k * advance:(k + 1) * advance] = glyphs[ch]
+
+    def _render(self, ch):
+        """문자 1개를 advance 폭 칸 가운데에 그린 마스크 (advance보다 넓은 글자는 양쪽이 잘림)"""
+        adv = self.advance
+        out = np.zeros((self.pitch, adv), dtype=np.uint8)
+        canvas = np.zeros((self.pitch, adv * 4), dtype=np.uint8)
+        cv2.putText(canvas, ch, (adv, self.baseline), self.font, self.scale, 255, self.thickness)
+        cols = np.flatnonzero(canvas.any(axis=0))
+        if not len(cols): return out    # 공백
+        gw = cols[-1] - cols[0] + 1
+        src = cols[0] + max(0, (gw - adv) // 2)
+        dst = max(0, (adv - gw) // 2)
+        n = min(gw, adv)
+        out[:, dst:dst + n] = canvas[:, src:src + n] > 0
+        return out
+
+    # --- 코드 변환 ---
+    def encode(self, lines):
+        """문자열 목록 -> (줄 수, 최대 길이) 코드 배열 (문자 Atlas 전용, 짧은 줄은 빈 칸)"""
+        cols = max((len(s) for s in lines), default=0)
+        raw = "".join(s.ljust(cols, "\0") for s in lines).encode('latin-1', 'replace')
+        codes = np.frombuffer(raw, dtype=np.uint8).reshape(len(lines), cols)
+        if self._char_lut is None:
+            self._char_lut = np.arange(256, dtype=np.uint16)
+            self._char_lut[0] = self.blank
+        return self._char_lut[codes]
+
+    def mask(self, codes):
+        """(rows, cols) 코드 배열 -> (rows * pitch, cols * cell_w) 마스크"""
+        rows, cols = codes.shape
+        m = self.masks[codes]                   # (rows, cols, pitch, cell_w)
+        return m.transpose(0, 2, 1, 3).reshape(rows * self.pitch, cols * self.cell_w)
+
+    # --- 그리기 ---
+    def draw(self, img, lines, org, color):
+        """lines(문자열 목록)를 org (x, 첫 줄 Baseline y)부터 pitch 간격으로 그림 (putText 대체)"""
+        if isinstance(lines, str): lines = [lines]
+        return self.draw_codes(img, self.encode(lines), org, color)
+
+    def draw_codes(self, img, codes, org, color):
+        """
+        코드 배열을 org (x, 첫 줄 Baseline y)부터 그림
+        :return: 그린 영역 (x1, y1, x2, y2)
+        """
+        mask = self.mask(codes)
+        x, y = org[0], org[1] - self.baseline
+        h, w = mask.shape
+        # 이미지 경계 Clipping
+        x1, y1 = max(0, x), max(0, y)
+        x2, y2 = min(img.shape[1], x + w), min(img.shape[0], y + h)
+        if x2 > x1 and y2 > y1:
+            roi = img[y1:y2, x1:x2]
+            cv2.copyTo(self._fill(y2 - y1, x2 - x1, color, img.dtype), mask[y1 - y:y2 - y, x1 - x:x2 - x], roi)
+        return x, y, x + w, y + h
+
+    def _fill(self, h, w, color, dtype):
+        key = (h, w, tuple(color), dtype)
+        src = self._fills.get(key)
+        if src is None:
+            if len(self._fills) > 32: self._fills.clear()
+            src = np.empty((h, w, len(color)), dtype=dtype)
+            src[:] = color
+            self._fills[key] = src
+        return src
+
+
+@lru_cache(maxsize=16)
+def get_atlas(scale, advance, thickness=1, cells=CHAR_CELLS):
+    """(scale, advance, thickness, cells)별 GlyphAtlas (최초 1회 생성)"""
+    return GlyphAtlas(scale, advance, thickness, cells)
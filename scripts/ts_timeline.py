@@ -0,0 +1,217 @@
+"""
+[파일 개요]
+파일 전체 타임라인 (TSTimeline) - PID별 패킷 밀도 / 에러 / Keyframe / PCR Gap 구간 요약
+
+[목적 및 필요성]
+GUI는 현재 패킷 주변만 보여주기 때문에 파일의 어느 구간에 어떤 PID가 몰려 있는지, 에러나 PCR 공백이 어디서 생겼는지
+한눈에 알 수 없었습니다. 이 모듈은 백그라운드 스레드에서 파일을 Chunk 단위로 한 번 읽어
+패킷 인덱스를 고정 크기 구간(bin)으로 나눈 뒤 np.bincount로 누적합니다.
+    - density  : (PID 행, bin) 패킷 수 (Null 패킷 제외)
+    - errors   : TEI + CC 에러 수 (ts_cc_checker 규칙)
+    - keyframes: random_access_indicator 패킷 수
+    - pcr_gaps : 같은 PID의 연속 PCR 간격이 PCR_GAP_MS를 넘거나 역행한 횟수 (discontinuity 제외)
+render()는 결과를 툴바 아래 타임라인 스트립 이미지로 그리고, 입력(version, 크기, 선택 PID)이 같으면 캐시된 이미지를 반환합니다.
+
+[사용법]
+    tl = TSTimeline("a.ts")
+    tl.start()                                          # 백그라운드 구축
+    strip = tl.render(1400, 40, pid_map, programs, selected_pid)
+    idx = tl.packet_at(x, 1400)                         # 스트립 x좌표 -> 패킷 인덱스 (클릭 이동)
+"""
+import os
+import threading
+import time
+
+import numpy as np
+
+from ts_columns import TS_PACKET_SIZE, NUM_PIDS, NULL_PID, decode_columns, read_chunks
+from ts_cc_checker import ContinuityChecker
+from ts_filter_expr import VIDEO_TYPES, AUDIO_TYPES
+
+TIMELINE_BINS = 1400            # 구간 수 (스트립 폭 1px = 1 bin)
+TIMELINE_CHUNK_PACKETS = 16384
+PCR_GAP_MS = 40                 # ETR 290 2.3a PCR repetition (40ms)
+PCR_GAP_TICKS = PCR_GAP_MS * 27000
+
+# 스트립 구성 (위에서부터): Keyframe 띠 / PID 밀도 / PCR Gap 띠 / 에러 띠
+KEY_BAND, MARK_BAND = 4, 3
+COLOR_EMPTY = (40, 40, 40)          # 아직 읽지 않은 구간
+COLOR_KEY = (0, 255, 255)
+COLOR_PCR_GAP = (255, 0, 255)
+COLOR_ERROR = (0, 0, 255)
+COLOR_VIDEO = (0, 165, 255)
+COLOR_AUDIO = (100, 255, 100)
+COLOR_PSI = (255, 255, 0)
+COLOR_OTHER = (170, 170, 170)
+COLOR_SELECTED = (255, 255, 255)
+
+
+class TSTimeline:
+    """파일 전체를 고정 bin으로 요약한 PID 밀도 / 이벤트 타임라인"""
+    def __init__(self, file_path, bins=TIMELINE_BINS, chunk_packets=TIMELINE_CHUNK_PACKETS):
+        self.file_path = file_path
+        self.chunk_packets = chunk_packets
+        self.total_pkts = os.path.getsize(file_path) // TS_PACKET_SIZE if file_path and os.path.exists(file_path) else 0
+        self.bin_size = max(1, -(-self.total_pkts // bins))         # ceil
+        self.nbins = max(1, -(-self.total_pkts // self.bin_size))
+
+        self.pids = []                                  # 행 번호 -> PID (등장 순)
+        self._row = np.full(NUM_PIDS, -1, dtype=np.int32)
+        self.density = np.zeros((0, self.nbins), dtype=np.int32)
+        self.errors = np.zeros(self.nbins, dtype=np.int32)
+        self.keyframes = np.zeros(self.nbins, dtype=np.int32)
+        self.pcr_gaps = np.zeros(self.nbins, dtype=np.int32)
+        self._cc = ContinuityChecker(max_events=0)
+        self._last_pcr = np.full(NUM_PIDS, -1, dtype=np.int64)
+
+        self.built_upto = 0             # [0, built_upto) 패킷이 반영됨
+        self.version = 0                # 누적 결과가 바뀔 때마다 증가 (렌더 캐시 key)
+        self.complete = False
+        self.running = False
+        self._thread = None
+        self._render_cache = None       # (key, image)
+
+    # --- Build ---
+    def start(self):
+        if self.running or self.complete or not self.total_pkts: return
+        self.running = True
+        self._thread = threading.Thread(target=self._build_loop)
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self):
+        self.running = False
+        if self._thread and self._thread.is_alive():
+            self._thread.join(timeout=1.0)
+        self._thread = None
+
+    @property
+    def progress(self):
+        return (self.built_upto / self.total_pkts) if self.total_pkts else 1.0
+
+    def _build_loop(self):
+        try:
+            for start_idx, buf in read_chunks(self.file_path, self.built_upto, self.chunk_packets,
+                                              lambda: not self.running):
+                self.accumulate(decode_columns(buf, start_idx))
+                self.built_upto = start_idx + len(buf) // TS_PACKET_SIZE
+                self.version += 1
+                time.sleep(0)   # GUI 스레드에 GIL 양보
+            else:
+                self.complete = self.running
+                self.version += 1
+        except Exception as e:
+            print(f"[Error] Timeline build failed: {e}")
+        finally:
+            self.running = False
+
+    def accumulate(self, cols):
+        """decode_columns() 묶음 1개를 bin에 누적"""
+        nb = self.nbins
+        b = np.minimum(cols['index'] // self.bin_size, nb - 1)
+        pid = cols['pid'].astype(np.int64)
+
+        # PID 밀도 (새 PID는 행 추가 - 배열 교체는 대입 1회)
+        valid = cols['sync'] & (pid != NULL_PID)
+        new = np.unique(pid[valid & (self._row[pid] < 0)])
+        if len(new):
+            self._row[new] = np.arange(len(self.pids), len(self.pids) + len(new))
+            self.pids.extend(new.tolist())
+            grown = np.zeros((len(self.pids), nb), dtype=np.int32)
+            grown[:len(self.density)] = self.density
+            self.density = grown
+        rows = len(self.pids)
+        if rows:
+            key = self._row[pid[valid]].astype(np.int64) * nb + b[valid]
+            self.density += np.bincount(key, minlength=rows * nb).reshape(rows, nb).astype(np.int32)
+
+        # 에러: TEI + CC
+        err = np.bincount(b[cols['tei']], minlength=nb)
+        _, err_off = self._cc.check(cols)
+        if len(err_off):
+            err_b = np.minimum((err_off // TS_PACKET_SIZE) // self.bin_size, nb - 1)
+            err += np.bincount(err_b, minlength=nb)
+        self.errors += err.astype(np.int32)
+
+        # Keyframe (random_access_indicator)
+        self.keyframes += np.bincount(b[cols['random_access']], minlength=nb).astype(np.int32)
+
+        # PCR Gap: PID별 파일 순서로 이전 PCR과 비교 (이전 Chunk의 마지막 PCR 이어받음)
+        sel = np.nonzero(cols['pcr'] >= 0)[0]
+        if len(sel):
+            order = sel[np.argsort(pid[sel], kind='stable')]
+            p = pid[order]
+            pcr = cols['pcr'][order].astype(np.int64)
+            first = np.ones(len(p), dtype=bool)
+            first[1:] = p[1:] != p[:-1]
+            prev = np.empty_like(pcr)
+            prev[1:] = pcr[:-1]
+            prev[first] = self._last_pcr[p[first]]
+            diff = pcr - prev
+            gap = (prev >= 0) & ~cols['discontinuity'][order] & ((diff > PCR_GAP_TICKS) | (diff < 0))
+            if gap.any():
+                self.pcr_gaps += np.bincount(b[order[gap]], minlength=nb).astype(np.int32)
+            tail = np.ones(len(p), dtype=bool)
+            tail[:-1] = first[1:]
+            self._last_pcr[p[tail]] = pcr[tail]
+
+    # --- Query ---
+    def packet_at(self, x, width):
+        """스트립 x좌표 -> 해당 구간의 첫 패킷 인덱스"""
+        b = int(min(max(x, 0), width - 1) * self.nbins // width)
+        return min(b * self.bin_size, max(0, self.total_pkts - 1))
+
+    def x_of(self, idx, width):
+        """패킷 인덱스 -> 스트립 x좌표"""
+        return int(min(idx // self.bin_size, self.nbins - 1) * width // self.nbins)
+
+    # --- Render ---
+    def render(self, width, height, pid_map=None, programs=None, selected_pid=None, type_version=None):
+        """
+        타임라인 스트립 이미지 (height x width x 3, 입력이 같으면 캐시 반환)
+        - PID 행 색: Video/Audio/PSI/기타 (pid_map, programs 기준), 선택 PID는 흰색
+        - 밝기: 행(PID)별 최대 대비 log 스케일 밀도
+        :param type_version: pid_map/programs 변경 감지용 값 (ScanSnapshot.version 등)
+        """
+        key = (self.version, width, height, selected_pid, type_version)
+        if self._render_cache is not None and self._render_cache[0] == key:
+            return self._render_cache[1]
+
+        nb = self.nbins
+        strip = np.zeros((height, nb, 3), dtype=np.uint8)
+        band_y1, band_y2 = KEY_BAND, height - 2 * MARK_BAND
+        density = self.density
+        pids = self.pids[:len(density)]
+
+        if len(pids) and band_y2 > band_y1:
+            order = np.argsort(pids)
+            dens = density[order].astype(np.float32)
+            peak = dens.max(axis=1, keepdims=True)
+            level = np.log1p(dens) / np.log1p(np.maximum(peak, 1))
+            colors = np.array([self._pid_color(pids[k], pid_map, programs, selected_pid) for k in order], dtype=np.float32)
+            # 밴드 높이를 PID 행에 고르게 분배 (PID가 밴드 높이보다 많으면 여러 PID가 한 줄을 나눠 씀 - 최대값)
+            band_h = band_y2 - band_y1
+            row_of_y = np.arange(band_h) * len(pids) // band_h
+            strip[band_y1:band_y2] = (level[row_of_y][:, :, None] * colors[row_of_y][:, None, :]).astype(np.uint8)
+
+        strip[:KEY_BAND][:, self.keyframes > 0] = COLOR_KEY
+        strip[height - 2 * MARK_BAND:height - MARK_BAND][:, self.pcr_gaps > 0] = COLOR_PCR_GAP
+        strip[height - MARK_BAND:][:, self.errors > 0] = COLOR_ERROR
+
+        # 아직 읽지 않은 구간
+        done = min(nb, -(-self.built_upto // self.bin_size)) if not self.complete else nb
+        strip[:, done:] = COLOR_EMPTY
+
+        import cv2  # 렌더링 시에만 필요 (타임라인 집계는 cv2 없이 동작)
+        img = cv2.resize(strip, (width, height), interpolation=cv2.INTER_NEAREST) if nb != width else strip
+        self._render_cache = (key, img)
+        return img
+
+    @staticmethod
+    def _pid_color(pid, pid_map, programs, selected_pid):
+        if pid == selected_pid: return COLOR_SELECTED
+        if pid == 0 or (programs and any(p.get('pmt_pid') == pid for p in programs.values())): return COLOR_PSI
+        ptype = (pid_map or {}).get(pid, {}).get('type', 0)
+        if ptype in VIDEO_TYPES: return COLOR_VIDEO
+        if ptype in AUDIO_TYPES: return COLOR_AUDIO
+        return COLOR_OTHER
@@ -3,9 +3,8 @@ import os
 import json
 import sys
 import time
-import tkinter as tk
-from tkinter import filedialog
 import numpy as np
+from ts_text_cache import text_size
 
 class UIManager:
     def __init__(self, gui_context):
@@ -16,6 +15,8 @@ class UIManager:
         self.menu_open = False
         self.hover_btn = None
         self.clicked_btn_info = None # {'name': str, 'time': float}
+        self.mouse_x = 0            # 화면 좌표 (GUI의 mouse_x/y는 패널 좌표계 - 타임라인 스트립 높이만큼 보정됨)
+        self.mouse_y = 0
         self.recent_files = []
         self._load_recents()
         self.menu_items_rects = []
@@ -141,7 +142,7 @@ class UIManager:
             cv2.rectangle(img, (x1, y1), (x2, y2), color, -1)
             cv2.rectangle(img, (x1, y1), (x2, y2), border_color, thickness)
             
-            ts = cv2.getTextSize(label, cv2.FONT_HERSHEY_SIMPLEX, 0.6, 1)[0]
+            ts = text_size(label, cv2.FONT_HERSHEY_SIMPLEX, 0.6, 1)[0]
             tx = x1 + (x2-x1-ts[0])//2
             ty = y1 + (y2-y1+ts[1])//2
             cv2.putText(img, label, (tx, ty), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255,255,255), 1)
@@ -151,8 +152,11 @@ class UIManager:
         if self.gui.scanner.running:
             status_text = "SCANNING..."
             status_color = (0, 255, 0)
+        elif getattr(self.gui, 'filter_search_mode', False):
+            status_text = "SEARCHING..."
+            status_color = (0, 255, 255)
         elif self.gui.playing:
-            status_text = f"PLAYING (x{self.gui.speed})"
+            status_text = f"PLAYING (x{self.gui.speed:g})"
             status_color = (0, 255, 255)
         elif self.gui.current_pkt_idx > 0:
             status_text = "PAUSED"
@@ -178,6 +182,13 @@ class UIManager:
             line2_text = '(' + status_text.split('(')[1]
             cv2.putText(img, line2_text, (status_x, 58), cv2.FONT_HERSHEY_SIMPLEX, 0.5, status_color, 1)
         
+        # 필터 표현식이 설정되어 있으면 필터 버튼 아래에 표시 (토글 필터 대신 사용됨)
+        expr = getattr(self.gui, 'filter_expr', None)
+        if expr is not None:
+            text = f"Expr: {expr.text}"
+            if len(text) > 70: text = text[:67] + "..."
+            cv2.putText(img, text, (920, 58), cv2.FONT_HERSHEY_SIMPLEX, 0.4, (0, 255, 255), 1)
+
         if self.menu_open:
             self.draw_menu(img)
 
@@ -206,7 +217,7 @@ class UIManager:
         for label, action in items:
             # Hover Check
             color = (200, 200, 200)
-            if mx <= self.gui.mouse_x <= mx+menu_w and cy-20 <= self.gui.mouse_y <= cy+5:
+            if mx <= self.mouse_x <= mx+menu_w and cy-20 <= self.mouse_y <= cy+5:
                 color = (0, 255, 255)
                 cv2.rectangle(img, (mx+2, cy-20), (mx+menu_w-2, cy+5), (60, 60, 80), -1)
             
@@ -232,7 +243,7 @@ class UIManager:
             x = mx
             w = menu_w
             
-            if mx <= self.gui.mouse_x <= mx+w and cy-20 <= self.gui.mouse_y <= cy+5:
+            if mx <= self.mouse_x <= mx+w and cy-20 <= self.mouse_y <= cy+5:
                 color = (0, 255, 255)
                 cv2.rectangle(img, (x+2, cy-20), (x+w-2, cy+5), (60, 60, 80), -1)
                 
@@ -242,8 +253,8 @@ class UIManager:
             cy += 30
 
     def handle_mouse_move(self, x, y):
-        self.gui.mouse_x = x
-        self.gui.mouse_y = y
+        self.mouse_x = x
+        self.mouse_y = y
         self.hover_btn = None
         
         if not self.menu_open:
@@ -1,4 +1,3 @@
-import cv2
 import numpy as np
 import collections
 
@@ -127,6 +126,8 @@ class TSJitterAnalyzer:
         """
         MTS-430 스타일로 그래프를 그립니다.
         """
+        import cv2  # 렌더링 시에만 필요 (스캐너 / 배치 CLI는 cv2 없이 분석만 사용)
+
         img = np.zeros((height, width, 3), dtype=np.uint8)
         img[:] = COLOR_BG
         
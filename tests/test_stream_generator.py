@@ -0,0 +1,105 @@
+"""
+[파일 개요]
+합성 TS 스트림(ts_stream_generator) 기반 정합성 테스트
+
+[목적 및 필요성]
+CC 검사 / PID 통계 / ETR-290 / 컬럼 저장소는 모두 벡터화 구현으로 바뀌었는데, 검증은 실제 녹화 파일로 손으로만 해 왔습니다.
+이 테스트는 TSStreamGenerator로 수 MB 파일을 만들고, 생성기가 기록한 정답값(stats)과
+    - TSScanner의 PID별 패킷 수 / TEI / Sync Byte 오류 / 스크램블 / CC 오류 합계
+    - ColumnStore 재생(scan_store) 리포트 모델과 직접 스캔 리포트 모델
+을 비교합니다.
+
+[사용법]
+    python -m pytest -q tests
+"""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts"))
+from ts_stream_generator import TSStreamGenerator, default_programs
+from ts_parser_core import TSParser
+from ts_scanner import TSScanner
+from ts_column_store import ColumnStore, export_columns, scan_store
+
+PACKETS = 20000                 # 약 3.8MB
+ERROR_CONFIG = {'cc_error_rate': 1e-3, 'tei_rate': 1e-3, 'scrambled_pids': [0x111], 'seed': 3}
+
+
+def _generate(path, **config):
+    gen = TSStreamGenerator(dict(config, programs=default_programs(2)))
+    return gen.write(str(path), PACKETS)
+
+
+def _scan(path):
+    scanner = TSScanner(TSParser(str(path)))
+    scanner.yield_cpu = False
+    scanner.save_report = False
+    scanner.running = True
+    scanner._scan_loop()
+    return scanner
+
+
+def _comparable(model):
+    """실행마다 달라지는 값(작성 시각, 단계별 계측) 제외"""
+    model = dict(model)
+    model['summary'] = {k: v for k, v in model['summary'].items() if k != 'date'}
+    model.pop('scan_profile', None)
+    return model
+
+
+def _markdown_body(lines):
+    """Markdown에서 작성 시각 줄과 7. Scan Profile 구간 제외"""
+    lines = [l for l in lines if not l.startswith("- **Date**")]
+    return lines[:lines.index("## 7. Scan Profile")] if "## 7. Scan Profile" in lines else lines
+
+
+@pytest.fixture(scope="module")
+def errors_stream(tmp_path_factory):
+    path = tmp_path_factory.mktemp("gen") / "errors.ts"
+    truth = _generate(path, **ERROR_CONFIG)
+    return path, truth, _scan(path)
+
+
+def test_pid_counts_match_truth(errors_stream):
+    path, truth, scanner = errors_stream
+    assert scanner.parser.packet_count == truth['packets'] == PACKETS
+    assert dict(scanner.parser.pid_counts) == dict(truth['pid_counts'])
+    assert scanner.stats.pid_counts() == dict(truth['pid_counts'])
+
+
+def test_error_totals_match_truth(errors_stream):
+    path, truth, scanner = errors_stream
+    etr = scanner.report_model['etr290']
+    assert truth['cc_errors'] > 0 and truth['tei'] > 0
+    assert sum(r['cc_errors'] for r in scanner.report_model['pids']) == truth['cc_errors']
+    assert etr['priority1']['Continuity_count_error'] == truth['cc_errors']
+    assert etr['priority2']['Transport_error'] == truth['tei']
+    assert etr['priority1']['Sync_byte_error'] == truth['sync_errors'] == 0
+    assert int(scanner.stats.scrambled.sum()) == truth['scrambled'] > 0
+    assert scanner.profile.counters['psi'] == truth['psi']
+
+
+def test_sync_loss_counts(tmp_path):
+    path = tmp_path / "sync.ts"
+    truth = _generate(path, sync_loss_rate=1e-4, cc_error_rate=1e-3, seed=3)
+    scanner = _scan(path)
+    etr = scanner.report_model['etr290']
+    assert truth['sync_errors'] > 0
+    assert etr['priority1']['Sync_byte_error'] == truth['sync_errors']
+    assert dict(scanner.parser.pid_counts) == dict(truth['pid_counts'])
+    # Sync Byte가 손상된 패킷은 CC 검사에서 빠지므로 손상 패킷 수만큼 CC 오류가 더 잡힐 수 있음
+    cc = sum(r['cc_errors'] for r in scanner.report_model['pids'])
+    assert truth['cc_errors'] <= cc <= truth['cc_errors'] + truth['sync_errors']
+
+
+def test_column_store_replay_matches_scan(errors_stream, tmp_path):
+    path, truth, scanner = errors_stream
+    out = tmp_path / "cols"
+    export_columns(str(path), str(out))
+    replay = scan_store(ColumnStore(str(out)))
+    assert _comparable(replay.report_model) == _comparable(scanner.report_model)
+    assert _markdown_body(replay.report) == _markdown_body(scanner.report)
+    # 단계별 계측 카운터도 같은 기준 (Chunk 크기만 다름)
+    assert replay.profile.counters == dict(scanner.profile.counters, chunks=replay.profile.counters['chunks'])